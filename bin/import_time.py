@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+
+# Import-time benchmark for the `omada` package.
+#
+# Every run imports `omada` in a fresh interpreter, so the numbers are cold-start
+# costs as seen by short-lived scripts (cron jobs and the like).
+#
+# Usage:
+#   import_time.py [--runs N] [--budget-ms MS]
+#
+# Exits with a non-zero code if the median import time is over the budget or if
+# `import omada` pulled in any of the heavy dependencies eagerly.
+
+import argparse
+import json
+import os
+import pathlib
+import statistics
+import subprocess
+import sys
+import typing
+
+PROJECT_ROOT = pathlib.Path(__file__).parent.parent.resolve()
+
+# Modules that must only be imported on first use
+HEAVY_MODULES = (
+    "requests",
+    "yarl",
+    "pydantic",
+    "omada.omada",
+    "omada.api_bindings",
+    "omada.function_interface_bindings",
+)
+
+DEFAULT_BUDGET_MS = 50.0
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import omada
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "elapsed_ms": elapsed * 1000,
+    "loaded": [name for name in %r if name in sys.modules],
+}))
+"""
+
+
+def measure_once() -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(PROJECT_ROOT), env.get("PYTHONPATH")])
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE % (HEAVY_MODULES,)],
+        check=True,
+        stdout=subprocess.PIPE,
+        env=env,
+        cwd=str(PROJECT_ROOT),
+    )
+    return json.loads(out.stdout)
+
+
+def measure(runs: int = 5) -> dict:
+    """Return median import time (ms) and eagerly loaded heavy modules."""
+    results = [measure_once() for _ in range(runs)]
+    return {
+        "median_ms": statistics.median(res["elapsed_ms"] for res in results),
+        "loaded": sorted({name for res in results for name in res["loaded"]}),
+    }
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Measure `import omada` cold-start time"
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    args = parser.parse_args(argv)
+
+    result = measure(args.runs)
+    sys.stdout.write(
+        f"import omada: {result['median_ms']:.1f}ms median over {args.runs} runs"
+        f" (budget {args.budget_ms:.1f}ms)\n"
+    )
+    if result["loaded"]:
+        sys.stdout.write(f"eagerly imported: {', '.join(result['loaded'])}\n")
+        return 1
+    if result["median_ms"] > args.budget_ms:
+        sys.stdout.write("import time budget exceeded\n")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
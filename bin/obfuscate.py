@@ -1,12 +1,24 @@
 #!/usr/bin/env python
 
 # I am using this script to obfuscate test API responses (doing it manually is too much work)
-
+#
+# Usage:
+#   obfuscate.py [--jobs N] <file_or_dir>
+#
+# `*.json` files are loaded whole, `*.jsonl` captures are streamed line by line
+# (so they can be larger than memory). Directories are processed by a pool of
+# worker processes, a single large JSONL file is split into line batches instead.
+
+import argparse
+import concurrent.futures
+import functools
 import hashlib
+import itertools
 import json
+import multiprocessing
+import multiprocessing.pool
 import pathlib
 import re
-import sys
 import typing
 
 BIN_DIR = pathlib.Path(__file__).parent.resolve()
@@ -15,9 +27,18 @@ BIN_DIR = pathlib.Path(__file__).parent.resolve()
 FAKE_UUID_PREFIX = "0bf4"
 FAKE_MAC_PREFIX = "0B-F4"
 
+UUID_RE = re.compile(r"^[0-9a-f]{12,}$", re.I)
+MAC_RE = re.compile(r"^([0-9a-f]{2}-?){6}$", re.I)
+
+# Every distinct (key, value) pair is obfuscated once per process
+MEMO_SIZE = 2**20
+# Lines handed to a worker at a time when streaming a single JSONL file
+LINE_BATCH_SIZE = 1000
+
 WORDS = json.load((BIN_DIR / "obfuscate-data.json").open())
 
 
+@functools.lru_cache(maxsize=MEMO_SIZE)
 def hexdigest(input_str: str):
     return hashlib.sha1(input_str.encode("utf8")).hexdigest()
 
@@ -36,9 +57,10 @@ def generate_obfuscated_words(input_str: str, sep: str = " "):
     return f"{OBF_PREFIX}{adjective}{sep}{noun}"
 
 
+@functools.lru_cache(maxsize=MEMO_SIZE)
 def obfuscate_str(name: typing.Optional[str], value: str):
     str_name = name if name else "UNKNOWN"
-    if re.match(r"^[0-9a-f]{12,}$", value, re.I):
+    if UUID_RE.match(value):
         # must be a fake uuid
         if value.startswith(FAKE_UUID_PREFIX):
             # already obfuscated
@@ -48,7 +70,7 @@ def obfuscate_str(name: typing.Optional[str], value: str):
             tail = hexdigest(value)[-(expected_len - len(FAKE_UUID_PREFIX)) :]
             out = f"{FAKE_UUID_PREFIX}{tail}"
             assert len(out) == expected_len
-    elif re.match(r"^([0-9a-f]{2}-?){6}$", value, re.I) or str_name.lower() in {
+    elif MAC_RE.match(value) or str_name.lower() in {
         "clientnames",
         "devicenames",
     }:
@@ -85,7 +107,7 @@ def obfuscate(data: typing.Union[dict, list]):
             new_value = obfuscate(value)
         elif isinstance(value, str):
             new_value = obfuscate_str(key, value)
-        elif isinstance(value, (int, float, None)):
+        elif value is None or isinstance(value, (int, float)):
             new_value = value
         else:
             raise NotImplementedError(value)
@@ -102,21 +124,107 @@ def obfuscate(data: typing.Union[dict, list]):
     return out
 
 
-def main(file_or_dir: str):
+def obfuscate_line(line: str) -> str:
+    """Obfuscate a single JSONL record (blank lines and bare scalars are passed through)."""
+    if not line.strip():
+        return line
+    record = json.loads(line)
+    if not isinstance(record, (dict, list)):
+        return line
+    return json.dumps(obfuscate(record), sort_keys=True) + "\n"
+
+
+def _batches(lines: typing.Iterable[str], size: int):
+    iterator = iter(lines)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def obfuscate_json_file(file: pathlib.Path):
+    with file.open() as fin:
+        input_data = json.load(fin)
+    obfuscated_data = obfuscate(input_data)
+    with file.open("w") as fout:
+        json.dump(obfuscated_data, fout, indent=4, sort_keys=True)
+
+
+def obfuscate_jsonl_file(
+    file: pathlib.Path,
+    pool: typing.Optional[multiprocessing.pool.Pool] = None,
+    jobs: int = 1,
+):
+    """Stream `file` into a temporary sibling and swap it in when done."""
+    tmp_file = file.with_name(f".{file.name}.obfuscating")
+    try:
+        with file.open() as fin, tmp_file.open("w") as fout:
+            if pool is None:
+                for line in fin:
+                    fout.write(obfuscate_line(line))
+            else:
+                # Bounded read-ahead: never more than one batch per worker in flight
+                batch_size = LINE_BATCH_SIZE * jobs
+                for batch in _batches(fin, batch_size):
+                    fout.writelines(
+                        pool.imap(obfuscate_line, batch, chunksize=LINE_BATCH_SIZE)
+                    )
+    except BaseException:
+        # Do not leave a half-written hidden file next to the capture
+        tmp_file.unlink(missing_ok=True)
+        raise
+    tmp_file.replace(file)
+
+
+def obfuscate_file(file: pathlib.Path):
+    if file.suffix == ".jsonl":
+        obfuscate_jsonl_file(file)
+    else:
+        obfuscate_json_file(file)
+    return file
+
+
+def main(file_or_dir: str, jobs: int = 1):
     root = pathlib.Path(file_or_dir)
     if not root.is_dir():
-        files = [root]
+        if jobs > 1 and root.suffix == ".jsonl":
+            with multiprocessing.Pool(jobs) as pool:
+                obfuscate_jsonl_file(root, pool, jobs)
+        else:
+            obfuscate_file(root)
+        return
+
+    files = sorted(
+        file
+        for pattern in ("**/*.json", "**/*.jsonl")
+        for file in root.glob(pattern)
+        if file.is_file()
+    )
+    if jobs > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+            for _ in executor.map(obfuscate_file, files):
+                pass
     else:
-        assert root.is_dir()
-        files = list(pathlib.Path(file_or_dir).glob("**/*.json"))
+        for file in files:
+            obfuscate_file(file)
+
 
-    for file in files:
-        with file.open() as fin:
-            input_data = json.load(fin)
-        obfuscated_data = obfuscate(input_data)
-        with file.open("w") as fout:
-            json.dump(obfuscated_data, fout, indent=4, sort_keys=True)
+def parse_args(argv: typing.Optional[typing.Sequence[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Obfuscate captured Omada API responses"
+    )
+    parser.add_argument("file_or_dir")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes (default: 1)",
+    )
+    return parser.parse_args(argv)
 
 
 if __name__ == "__main__":
-    main(sys.argv[1])
+    args = parse_args()
+    main(args.file_or_dir, jobs=max(1, args.jobs))
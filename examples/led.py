@@ -1,8 +1,15 @@
 #!/usr/bin/env python3
 
+# Connection settings are read from the same environment variables as the
+# `omada` command line tool: OMADA_URL, OMADA_CONTROLLER_ID (optional),
+# OMADA_USERNAME, OMADA_PASSWORD and OMADA_SITE.
+
+import os
 import sys
 
-from omada import Omada
+import yarl
+
+from omada import Omada, OmadaConfig
 
 
 def main():
@@ -10,19 +17,26 @@ def main():
         print(f"usage: {sys.argv[0]} [on|off]")
         return
 
-    omada = Omada()
-    omada.login()
-
-    settings = omada.getSiteSettings()
-
-    if len(sys.argv) > 1:
-        settings["led"]["enable"] = sys.argv[1] == "on"
-        omada.setSiteSettings(settings)
-        settings = omada.getSiteSettings()
-
-    print("led: on" if settings["led"]["enable"] else "led: off")
-
-    omada.logout()
+    env = os.environ
+    omada = Omada(
+        OmadaConfig(
+            base_url=yarl.URL(env["OMADA_URL"]),
+            site=env.get("OMADA_SITE", "Default"),
+            omada_controller_id=env.get("OMADA_CONTROLLER_ID"),
+        )
+    )
+    omada.login(env["OMADA_USERNAME"], env["OMADA_PASSWORD"])
+    try:
+        settings = omada.get_site_settings()
+
+        if len(sys.argv) > 1:
+            settings["led"]["enable"] = sys.argv[1] == "on"
+            omada.set_site_settings(settings=settings)
+            settings = omada.get_site_settings()
+
+        print("led: on" if settings["led"]["enable"] else "led: off")
+    finally:
+        omada.logout()
 
 
 if __name__ == "__main__":
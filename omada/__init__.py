@@ -1,2 +1,48 @@
-from . import api_bindings, function_interface_bindings
-from .omada import Omada, OmadaConfig, OmadaError
+import importlib
+import typing
+
+if typing.TYPE_CHECKING:
+    from . import api_bindings, function_interface_bindings
+    from .collector import ProcessCollector
+    from .event_renderer import EventRenderer
+    from .inventory import Inventory
+    from .omada import Omada, OmadaConfig, OmadaError
+    from .pagination import ScanCursor
+    from .topology import Topology
+    from .validation import ValidationMode
+    from .watch import WatchScheduler
+
+# `import omada` must stay cheap: submodules (and their requests/yarl/pydantic
+# dependencies) are only imported when one of these names is first accessed.
+_LAZY_ATTRS = {
+    # name: (module, attribute or None for the module itself)
+    "api_bindings": (".api_bindings", None),
+    "function_interface_bindings": (".function_interface_bindings", None),
+    "Omada": (".omada", "Omada"),
+    "OmadaConfig": (".omada", "OmadaConfig"),
+    "OmadaError": (".omada", "OmadaError"),
+    "EventRenderer": (".event_renderer", "EventRenderer"),
+    "ValidationMode": (".validation", "ValidationMode"),
+    "ScanCursor": (".pagination", "ScanCursor"),
+    "Inventory": (".inventory", "Inventory"),
+    "Topology": (".topology", "Topology"),
+    "ProcessCollector": (".collector", "ProcessCollector"),
+    "WatchScheduler": (".watch", "WatchScheduler"),
+}
+
+__all__ = sorted(_LAZY_ATTRS)
+
+
+def __getattr__(name: str):
+    try:
+        module_name, attr_name = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    module = importlib.import_module(module_name, __name__)
+    value = module if attr_name is None else getattr(module, attr_name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
@@ -0,0 +1,213 @@
+"""Streaming traffic/activity aggregation over client listings.
+
+`ClientAggregator` consumes client rows in batches (e.g. `Listing.pages()`).
+Rows are not kept, their metric values are: every batch is turned into one
+typed `array("d")` column per metric (8 bytes per value), which is then split
+by group and appended to the columns of every dimension the rows belong to
+(so a value is stored once per dimension). Exact percentiles need all the
+values of a group.
+
+Grouping and the statistics (sums, means, percentiles) are vectorised with
+NumPy when it is installed (`pip install omada-api[numpy]`, zero-copy views
+of the arrays) and done in pure Python otherwise (same results).
+
+>>> agg = ClientAggregator()
+>>> agg.add_pages(omada.get_site_clients().pages(), site="Office")
+>>> agg.summary("ap")["Lobby AP"]["trafficDown"].percentiles[95]
+"""
+import array
+import dataclasses
+import math
+import typing
+
+METRICS = ("trafficUp", "trafficDown", "activity")
+# Row field grouped on by the "site" dimension when `site=` is not given
+SITE_FIELD = "siteName"
+
+
+def _site_key(row: dict, site: typing.Optional[str]):
+    if site is not None:
+        return site
+    # Rows of multi-site listings (e.g. the `omada` CLI) carry their site
+    return row.get(SITE_FIELD)
+
+
+def _field_key(field: str):
+    def _key_impl(row: dict, site: typing.Optional[str]):
+        return row.get(field)
+
+    return _key_impl
+
+
+def _switch_port_key(row: dict, site: typing.Optional[str]):
+    if row.get("switchName") is None:
+        return None
+    return (row["switchName"], row.get("port"))
+
+
+# Dimension -> group key of a row (rows with a `None` key are not grouped)
+DIMENSIONS: typing.Dict[
+    str, typing.Callable[[dict, typing.Optional[str]], typing.Hashable]
+] = {
+    "ssid": _field_key("ssid"),
+    "ap": _field_key("apName"),
+    "switch_port": _switch_port_key,
+    "site": _site_key,
+}
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def percentile(sorted_values: typing.Sequence[float], pct: float) -> float:
+    """Linear interpolation between closest ranks (NumPy's default method)."""
+    if not sorted_values:
+        return math.nan
+    rank = (len(sorted_values) - 1) * pct / 100
+    low = math.floor(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (
+        rank - low
+    )
+
+
+@dataclasses.dataclass(frozen=True)
+class Stats:
+    count: int
+    sum: float
+    mean: float
+    # percentile -> value
+    percentiles: typing.Dict[float, float]
+
+
+def column_stats(
+    values: array.array, percentiles: typing.Sequence[float] = (50, 95, 99)
+) -> Stats:
+    numpy = _numpy()
+    count = len(values)
+    if count == 0:
+        return Stats(0, 0.0, math.nan, {float(pct): math.nan for pct in percentiles})
+    if numpy is not None:
+        column = numpy.frombuffer(values, dtype=numpy.float64)
+        total = float(column.sum())
+        points = numpy.percentile(column, percentiles).tolist()
+    else:
+        total = math.fsum(values)
+        ordered = sorted(values)
+        points = [percentile(ordered, pct) for pct in percentiles]
+    return Stats(
+        count,
+        total,
+        total / count,
+        {float(pct): value for pct, value in zip(percentiles, points)},
+    )
+
+
+def _extend_grouped(
+    targets: typing.List[typing.Tuple[array.array, ...]],
+    codes: typing.List[int],
+    columns: typing.List[array.array],
+):
+    """Append `columns[m][i]` to `targets[codes[i]][m]`."""
+    indices: typing.List[typing.List[int]] = [[] for _ in targets]
+    for idx, code in enumerate(codes):
+        if code >= 0:
+            indices[code].append(idx)
+    for target, group_indices in zip(targets, indices):
+        for out, column in zip(target, columns):
+            out.extend([column[idx] for idx in group_indices])
+
+
+def _extend_grouped_numpy(
+    numpy,
+    targets: typing.List[typing.Tuple[array.array, ...]],
+    codes: typing.List[int],
+    columns: typing.List[array.array],
+):
+    """`_extend_grouped()` with one stable sort instead of per-value appends."""
+    codes = numpy.asarray(codes, dtype=numpy.int64)
+    order = numpy.argsort(codes, kind="stable")
+    # Group `code` is `order[bounds[code]:bounds[code + 1]]` (rows of -1 first)
+    bounds = numpy.searchsorted(codes[order], numpy.arange(len(targets) + 1))
+    for metric_idx, column in enumerate(columns):
+        ordered = numpy.frombuffer(column, dtype=numpy.float64)[order]
+        for code, target in enumerate(targets):
+            target[metric_idx].frombytes(
+                ordered[bounds[code] : bounds[code + 1]].tobytes()
+            )
+
+
+class ClientAggregator:
+    def __init__(
+        self,
+        dimensions: typing.Iterable[str] = tuple(DIMENSIONS),
+        metrics: typing.Sequence[str] = METRICS,
+    ):
+        self.dimensions = {name: DIMENSIONS[name] for name in dimensions}
+        self.metrics = tuple(metrics)
+        # dimension -> group key -> metric columns
+        self.groups: typing.Dict[
+            str, typing.Dict[typing.Hashable, typing.Tuple[array.array, ...]]
+        ] = {name: {} for name in self.dimensions}
+        self.rows = 0
+
+    def _columns(self, dimension: str, key: typing.Hashable):
+        groups = self.groups[dimension]
+        try:
+            return groups[key]
+        except KeyError:
+            out = groups[key] = tuple(array.array("d") for _ in self.metrics)
+            return out
+
+    def add(self, rows: typing.Iterable[dict], site: typing.Optional[str] = None):
+        """Accumulate a batch of `rows` (missing metric values count as 0).
+
+        The "site" dimension groups on `site`, or on the `siteName` field of
+        the rows when it is not given (rows without either are not grouped).
+        """
+        if not isinstance(rows, list):
+            rows = list(rows)
+        if not rows:
+            return
+        self.rows += len(rows)
+        numpy = _numpy()
+        columns = [
+            array.array("d", [float(row.get(metric) or 0) for row in rows])
+            for metric in self.metrics
+        ]
+        for dimension, key_fn in self.dimensions.items():
+            # Group key -> group number, `codes[i]` - group of `rows[i]` (-1: none)
+            groups: typing.Dict[typing.Hashable, int] = {}
+            codes = [
+                -1 if key is None else groups.setdefault(key, len(groups))
+                for key in (key_fn(row, site) for row in rows)
+            ]
+            if not groups:
+                continue
+            targets = [self._columns(dimension, key) for key in groups]
+            if numpy is None:
+                _extend_grouped(targets, codes, columns)
+            else:
+                _extend_grouped_numpy(numpy, targets, codes, columns)
+
+    def add_pages(self, pages: typing.Iterable, site: typing.Optional[str] = None):
+        """Accumulate `pagination.Page` batches (e.g. `listing.pages()`)."""
+        for page in pages:
+            self.add(page.rows, site=site)
+
+    def summary(
+        self, dimension: str, percentiles: typing.Sequence[float] = (50, 95, 99)
+    ) -> typing.Dict[typing.Hashable, typing.Dict[str, Stats]]:
+        """Group key -> metric -> `Stats` for `dimension`."""
+        return {
+            key: {
+                metric: column_stats(column, percentiles)
+                for metric, column in zip(self.metrics, columns)
+            }
+            for key, columns in self.groups[dimension].items()
+        }
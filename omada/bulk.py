@@ -0,0 +1,77 @@
+"""Batched, concurrent bulk operations on alerts.
+
+Alert ids are sent to the controller `batch_size` at a time, at most
+`max_workers` batches concurrently. A failed batch does not stop the others:
+every batch is reported with its own `BatchResult`.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import dataclasses
+import functools
+import itertools
+import typing
+
+from . import timeouts
+
+if typing.TYPE_CHECKING:
+    from .omada import Omada
+
+ALERT_ACTIONS = ("archive", "delete")
+
+
+@dataclasses.dataclass
+class BatchResult:
+    ids: typing.List[str]
+    error: typing.Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def batched(
+    iterable: typing.Iterable[str], size: int
+) -> typing.Iterator[typing.List[str]]:
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class BulkAlertOperation:
+    """Apply `action` ("archive" or "delete") to alerts of one site."""
+
+    def __init__(
+        self,
+        omada: Omada,
+        site_id: str,
+        action: str,
+        batch_size: int = 100,
+        max_workers: int = 4,
+    ):
+        if action not in ALERT_ACTIONS:
+            raise ValueError(
+                f"Unknown action {action!r}, expected one of {ALERT_ACTIONS}"
+            )
+        self.omada = omada
+        self.path = f"sites/{site_id}/cmd/alerts/{action}"
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+
+    def send_batch(self, ids: typing.List[str]) -> BatchResult:
+        try:
+            self.omada._post(self.path, json={"alertIds": ids})
+        except Exception as err:
+            return BatchResult(ids, error=err)
+        return BatchResult(ids)
+
+    def run(self, ids: typing.Iterable[str]) -> typing.List[BatchResult]:
+        """Send `ids` in batches, returns the results in batch order."""
+        send = functools.partial(
+            timeouts.call_within, self.omada._call_deadline(), self.send_batch
+        )
+        with concurrent.futures.ThreadPoolExecutor(self.max_workers) as executor:
+            return list(executor.map(send, batched(ids, self.batch_size)))
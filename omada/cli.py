@@ -0,0 +1,326 @@
+"""`omada` command line tool.
+
+Streams listings from the controller as NDJSON (default) or CSV, e.g.::
+
+    omada --url https://controller:8043 --controller-id 0123abcd --username api \\
+        --site Default clients --fields mac,ip,apName --limit 100
+
+Site configuration snapshots are written with ``omada --site Default snapshot
+--output backups/`` and compared with ``omada diff OLD.json.gz NEW.json.gz``
+(which does not talk to the controller).
+
+Connection settings can also be provided through the `OMADA_URL`,
+`OMADA_CONTROLLER_ID`, `OMADA_USERNAME`, `OMADA_PASSWORD` and `OMADA_SITE`
+environment variables.
+"""
+import argparse
+import csv
+import getpass
+import io
+import itertools
+import json
+import os
+import sys
+import typing
+
+import yarl
+
+import omada
+
+OUTPUT_BUFFER_SIZE = 64 * 1024
+
+# Extra column added to every row to tell sites apart
+SITE_FIELD = "siteName"
+
+
+def _clients(api: "omada.Omada", site: str, args: argparse.Namespace):
+    return api.get_site_clients(site, active=None if args.all else True)
+
+
+def _devices(api: "omada.Omada", site: str, args: argparse.Namespace):
+    return api.get_site_devices(site)
+
+
+def _events(api: "omada.Omada", site: str, args: argparse.Namespace):
+    return api.get_site_events(
+        site=site,
+        time_start=args.time_start,
+        time_end=args.time_end,
+        module=args.module,
+    )
+
+
+def _alerts(api: "omada.Omada", site: str, args: argparse.Namespace):
+    return api.get_site_alerts(site, archived=args.archived)
+
+
+def _snapshot(api: "omada.Omada", site: str, args: argparse.Namespace):
+    from . import snapshot
+
+    path = snapshot.write(snapshot.take(api, site), args.output)
+    return [{"path": str(path)}]
+
+
+def _diff(args: argparse.Namespace) -> typing.Iterator[dict]:
+    from . import snapshot
+
+    for change in snapshot.diff(snapshot.load(args.old), snapshot.load(args.new)):
+        yield change._asdict()
+
+
+def _rendered(fetch_fn):
+    """Expand [client:MAC]/[device:MAC] placeholders of the fetched rows when --render is set."""
+
+    def _fetch_impl(api: "omada.Omada", site: str, args: argparse.Namespace):
+        rows = fetch_fn(api, site, args)
+        if args.render:
+            rows = args.renderer.render_events(rows)
+        return rows
+
+    return _fetch_impl
+
+
+def _output_options(**defaults) -> argparse.ArgumentParser:
+    """Parent parser of the output options, unset ones are left out unless in `defaults`."""
+    parser = argparse.ArgumentParser(add_help=False, argument_default=argparse.SUPPRESS)
+    parser.add_argument("--format", choices=("ndjson", "csv"))
+    parser.add_argument(
+        "--fields",
+        type=lambda value: [el.strip() for el in value.split(",") if el.strip()],
+        help="Comma-separated list of fields to output",
+    )
+    parser.add_argument(
+        "--limit", type=int, help="Stop after this many rows (across all sites)"
+    )
+    parser.set_defaults(**defaults)
+    return parser
+
+
+def parse_args(argv: typing.Optional[typing.Sequence[str]] = None):
+    env = os.environ
+    parser = argparse.ArgumentParser(
+        prog="omada",
+        description="Stream Omada controller data as NDJSON or CSV.",
+        parents=[_output_options(format="ndjson", fields=None, limit=None)],
+    )
+    parser.add_argument("--url", default=env.get("OMADA_URL"), help="Controller URL")
+    parser.add_argument(
+        "--controller-id",
+        default=env.get("OMADA_CONTROLLER_ID"),
+        help="Discovered from the controller when not set",
+    )
+    parser.add_argument("--username", default=env.get("OMADA_USERNAME"))
+    parser.add_argument(
+        "--password",
+        default=env.get("OMADA_PASSWORD"),
+        help="Prompted for when not set",
+    )
+    parser.add_argument(
+        "--no-verify",
+        dest="ssl_verify",
+        action="store_false",
+        help="Do not verify the controller SSL certificate",
+    )
+    parser.add_argument(
+        "--site",
+        dest="sites",
+        action="append",
+        help="Site name (can be repeated, defaults to $OMADA_SITE)",
+    )
+    parser.add_argument(
+        "--all-sites",
+        action="store_true",
+        help="Query every site the current user has access to",
+    )
+    # Sub-commands accept the output options too (without resetting them to defaults)
+    output = _output_options()
+
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    commands.required = True
+
+    clients = commands.add_parser("clients", help="Site clients", parents=[output])
+    clients.add_argument(
+        "--all", action="store_true", help="Include inactive clients as well"
+    )
+    clients.set_defaults(fetch_fn=_clients)
+
+    devices = commands.add_parser("devices", help="Site devices", parents=[output])
+    devices.set_defaults(fetch_fn=_devices)
+
+    events = commands.add_parser("events", help="Site events", parents=[output])
+    events.add_argument("--time-start", type=int, help="Timestamp (ms)")
+    events.add_argument("--time-end", type=int, help="Timestamp (ms)")
+    events.add_argument(
+        "--module",
+        choices=[
+            module.value for module in omada.function_interface_bindings.ModuleFilter
+        ],
+    )
+    events.set_defaults(fetch_fn=_rendered(_events))
+
+    alerts = commands.add_parser("alerts", help="Site alerts", parents=[output])
+    alerts.add_argument("--archived", action="store_true")
+    alerts.set_defaults(fetch_fn=_rendered(_alerts))
+
+    snapshot = commands.add_parser(
+        "snapshot",
+        help="Write a configuration snapshot archive per site",
+        parents=[output],
+    )
+    snapshot.add_argument("--output", required=True, help="Archive directory")
+    snapshot.set_defaults(fetch_fn=_snapshot)
+
+    diff = commands.add_parser(
+        "diff", help="Compare two snapshot archives (offline)", parents=[output]
+    )
+    diff.add_argument("old")
+    diff.add_argument("new")
+    diff.set_defaults(rows_fn=_diff)
+
+    for sub_parser in (events, alerts):
+        sub_parser.add_argument(
+            "--render",
+            action="store_true",
+            help="Replace [client:MAC]/[device:MAC] in `content` with names",
+        )
+
+    args = parser.parse_args(argv)
+    # One renderer (and template cache) shared by all sites
+    args.renderer = omada.EventRenderer()
+    if getattr(args, "rows_fn", None) is not None:
+        # Offline command
+        return args
+    if not args.url:
+        parser.error("--url (or $OMADA_URL) is required")
+    if not args.username:
+        parser.error("--username (or $OMADA_USERNAME) is required")
+    if not args.sites and env.get("OMADA_SITE"):
+        args.sites = [env["OMADA_SITE"]]
+    if not (args.sites or args.all_sites):
+        parser.error("--site (or $OMADA_SITE) or --all-sites is required")
+    return args
+
+
+def iter_rows(api: "omada.Omada", args: argparse.Namespace) -> typing.Iterator[dict]:
+    """Lazily chain rows of all requested sites (no page is fetched before it is needed)."""
+    if args.all_sites:
+        sites = [site.name for site in api.current_user.privilege.sites]
+    else:
+        sites = args.sites
+
+    for site in sites:
+        for row in args.fetch_fn(api, site, args):
+            row[SITE_FIELD] = site
+            yield row
+
+
+def _csv_value(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"))
+    return value
+
+
+def write_ndjson(
+    rows: typing.Iterable[dict],
+    out: typing.TextIO,
+    fields: typing.Optional[typing.Sequence[str]] = None,
+):
+    dumps = json.JSONEncoder(separators=(",", ":")).encode
+    for row in rows:
+        if fields:
+            row = {name: row.get(name) for name in fields}
+        out.write(dumps(row))
+        out.write("\n")
+
+
+def write_csv(
+    rows: typing.Iterable[dict],
+    out: typing.TextIO,
+    fields: typing.Optional[typing.Sequence[str]] = None,
+):
+    rows = iter(rows)
+    first_row = next(rows, None)
+    if first_row is None:
+        return
+    if not fields:
+        # Columns are fixed by the first row
+        fields = list(first_row)
+    writer = csv.writer(out)
+    writer.writerow(fields)
+    for row in itertools.chain([first_row], rows):
+        writer.writerow([_csv_value(row.get(name)) for name in fields])
+
+
+WRITERS = {
+    "ndjson": write_ndjson,
+    "csv": write_csv,
+}
+
+
+def write_rows(
+    rows: typing.Iterable[dict], args: argparse.Namespace, out: typing.TextIO
+):
+    if args.limit is not None:
+        rows = itertools.islice(rows, max(args.limit, 0))
+    WRITERS[args.format](rows, out, args.fields)
+
+
+def run(api: "omada.Omada", args: argparse.Namespace, out: typing.TextIO):
+    write_rows(iter_rows(api, args), args, out)
+
+
+def _discard_output(out: typing.TextIO):
+    """Point `out` to /dev/null, so releasing its unwritten buffer does not fail again."""
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    try:
+        os.dup2(devnull, out.fileno())
+    finally:
+        os.close(devnull)
+
+
+def main(
+    argv: typing.Optional[typing.Sequence[str]] = None,
+    out: typing.Optional[typing.TextIO] = None,
+) -> int:
+    args = parse_args(argv)
+    if out is None:
+        out = io.TextIOWrapper(
+            io.BufferedWriter(
+                io.FileIO(sys.stdout.fileno(), "w", closefd=False),
+                buffer_size=OUTPUT_BUFFER_SIZE,
+            ),
+            encoding="utf8",
+            newline="",
+        )
+
+    api = None
+    if getattr(args, "rows_fn", None) is None:
+        password = args.password or getpass.getpass(f"Password for {args.username}: ")
+        api = omada.Omada(
+            omada.OmadaConfig(
+                base_url=yarl.URL(args.url),
+                site=(args.sites or [None])[0],
+                omada_controller_id=args.controller_id,
+                ssl_verify=args.ssl_verify,
+            )
+        )
+        api.login(args.username, password)
+    try:
+        if api is None:
+            # Offline command
+            write_rows(args.rows_fn(args), args, out)
+        else:
+            run(api, args, out)
+        out.flush()
+    except BrokenPipeError:
+        # Downstream consumer (e.g. `head`) went away
+        _discard_output(out)
+        return 0
+    finally:
+        if api is not None:
+            api.logout()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""Controller ID discovery through the (unauthenticated) `/api/info` endpoint.
+
+Discovered IDs are cached per `base_url` for the lifetime of the process and,
+optionally, in a JSON file shared between processes (`{base_url: id}`).
+Concurrent lookups of one controller share a single `/api/info` request; a
+slow controller never holds up the discovery of others.
+"""
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import tempfile
+import threading
+import typing
+
+if typing.TYPE_CHECKING:
+    from .omada import Omada
+
+_cache: typing.Dict[str, str] = {}
+# Guards `_cache` and `_url_locks`, never held during a request
+_cache_lock = threading.Lock()
+# base_url -> lock held while discovering its ID
+_url_locks: typing.Dict[str, threading.Lock] = {}
+# Serialises read-modify-write updates of the cache file
+_file_lock = threading.Lock()
+
+
+def _read_cache_file(path: pathlib.Path) -> typing.Dict[str, str]:
+    try:
+        with path.open() as fin:
+            out = json.load(fin)
+    except (OSError, ValueError):
+        return {}
+    return out if isinstance(out, dict) else {}
+
+
+def _write_cache_file(path: pathlib.Path, base_url: str, controller_id: str):
+    with _file_lock:
+        _write_cache_file_locked(path, base_url, controller_id)
+
+
+def _write_cache_file_locked(path: pathlib.Path, base_url: str, controller_id: str):
+    cached = _read_cache_file(path)
+    cached[base_url] = controller_id
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Atomic replace: concurrent readers never see a partial file
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    tmp_path = pathlib.Path(tmp_name)
+    try:
+        with os.fdopen(fd, "w") as fout:
+            json.dump(cached, fout, indent=2, sort_keys=True)
+        tmp_path.replace(path)
+    except BaseException:
+        tmp_path.unlink()
+        raise
+
+
+def fetch_controller_id(omada: Omada) -> str:
+    """Ask the controller at `omada.config.base_url` for its ID."""
+    from .omada import CustomErrorCodes, OmadaError
+
+    url = omada.config.base_url / "api" / "info"
+
+    def _info_impl(timeout):
+        response = omada.transport.request("GET", url, timeout=timeout)
+        return omada.get_json_response(response)
+
+    result = omada._with_retry(_info_impl, omada.config.read_retry) or {}
+    try:
+        return result["omadacId"]
+    except (KeyError, TypeError):
+        raise OmadaError(
+            {
+                "errorCode": CustomErrorCodes.UnknownError,
+                "msg": f"No controller ID (omadacId) in the response of {url}",
+            }
+        ) from None
+
+
+def controller_id(omada: Omada) -> str:
+    """Controller ID of `omada.config.base_url`: from the caches or `/api/info`."""
+    base_url = str(omada.config.base_url)
+    cache_file = omada.config.controller_id_cache
+    with _cache_lock:
+        out = _cache.get(base_url)
+        if out is not None:
+            return out
+        url_lock = _url_locks.setdefault(base_url, threading.Lock())
+    with url_lock:
+        with _cache_lock:
+            # Discovered by another thread while waiting for the lock
+            out = _cache.get(base_url)
+        if out is None and cache_file is not None:
+            out = _read_cache_file(pathlib.Path(cache_file)).get(base_url)
+        if out is None:
+            out = fetch_controller_id(omada)
+            if cache_file is not None:
+                _write_cache_file(pathlib.Path(cache_file), base_url, out)
+        with _cache_lock:
+            _cache[base_url] = out
+    return out
+
+
+def clear_cache():
+    """Forget the IDs discovered in this process (the cache file is kept)."""
+    with _cache_lock:
+        _cache.clear()
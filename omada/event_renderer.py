@@ -0,0 +1,93 @@
+"""Expansion of `[client:MAC]` / `[device:MAC]` placeholders in event and alert content."""
+import functools
+import re
+import typing
+
+# Placeholders look like `[client:AA-BB-CC-DD-EE-FF]`, `[ap:...]`, `[osg:...]`, ...
+PLACEHOLDER_RE = re.compile(r"\[([a-z]+):([0-9A-Fa-f\-]+)\]")
+
+# Placeholder tag -> name of the event field holding the MAC -> name mapping.
+# Every tag except `client` is some kind of device (ap, switch, osg, ...).
+CLIENT_TAG = "client"
+CLIENT_NAMES_FIELD = "clientNames"
+DEVICE_NAMES_FIELD = "deviceNames"
+
+# Parsed template: literal text parts interleaved with (names field, MAC) pairs
+Template = typing.Tuple[typing.Union[str, typing.Tuple[str, str]], ...]
+
+
+def parse_template(content: str) -> Template:
+    """Split `content` into literal strings and (names field, MAC) placeholders."""
+    out = []
+    pos = 0
+    for match in PLACEHOLDER_RE.finditer(content):
+        if match.start() > pos:
+            out.append(content[pos : match.start()])
+        tag, mac = match.groups()
+        names_field = CLIENT_NAMES_FIELD if tag == CLIENT_TAG else DEVICE_NAMES_FIELD
+        out.append((names_field, mac))
+        pos = match.end()
+    if pos < len(content):
+        out.append(content[pos:])
+    return tuple(out)
+
+
+class EventRenderer:
+    """Render event/alert `content` strings with client and device names.
+
+    Parsed templates are cached (events repeat the same content a lot), so every
+    content string is scanned once; rendering is a single join afterwards.
+    MACs missing from `clientNames`/`deviceNames` are rendered as-is.
+    """
+
+    def __init__(self, cache_size: int = 16 * 1024, content_field: str = "content"):
+        self.content_field = content_field
+        self._parse = functools.lru_cache(maxsize=cache_size)(parse_template)
+
+    def render(self, event: dict) -> str:
+        content = event.get(self.content_field) or ""
+        template = self._parse(content)
+        if len(template) == 1 and isinstance(template[0], str):
+            # Nothing to expand
+            return content
+
+        names = {
+            CLIENT_NAMES_FIELD: event.get(CLIENT_NAMES_FIELD) or {},
+            DEVICE_NAMES_FIELD: event.get(DEVICE_NAMES_FIELD) or {},
+        }
+        parts = []
+        for part in template:
+            if isinstance(part, str):
+                parts.append(part)
+            else:
+                names_field, mac = part
+                parts.append(f"[{names[names_field].get(mac, mac)}]")
+        return "".join(parts)
+
+    def render_page(self, events: typing.Iterable[dict]) -> typing.List[str]:
+        """Render the content of a whole batch (e.g. a page) of events."""
+        render = self.render
+        return [render(event) for event in events]
+
+    def render_events(
+        self, events: typing.Iterable[dict]
+    ) -> typing.Generator[dict, None, None]:
+        """Lazily yield events with their content field replaced by the rendered text."""
+        content_field = self.content_field
+        render = self.render
+        for event in events:
+            event[content_field] = render(event)
+            yield event
+
+    def cache_info(self):
+        return self._parse.cache_info()
+
+
+@functools.lru_cache(maxsize=None)
+def _default_renderer() -> EventRenderer:
+    return EventRenderer()
+
+
+def render_content(event: dict) -> str:
+    """Render the `content` of a single event with the shared default renderer."""
+    return _default_renderer().render(event)
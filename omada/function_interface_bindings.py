@@ -3,6 +3,8 @@ import typing
 
 import pydantic
 
+from .omada import LevelFilter
+
 
 @enum.unique
 class ModuleFilter(str, enum.Enum):
@@ -14,10 +16,90 @@ class ModuleFilter(str, enum.Enum):
     Client = "Client"
 
 
-class SiteEventsInterface(pydantic.BaseModel):
-    """Site/events filter"""
+@enum.unique
+class SortOrder(str, enum.Enum):
+    """Listing sort order"""
+
+    Ascending = "asc"
+    Descending = "desc"
+
+
+def _bool_param(value: typing.Optional[bool]) -> typing.Optional[str]:
+    if value is None:
+        return None
+    return "true" if value else "false"
+
+
+class ListingInterface(pydantic.BaseModel):
+    """Search and sort of a paginated listing, done by the controller"""
 
     site: typing.Optional[str] = None
+    search_key: typing.Optional[str] = None
+    # Row field to sort on (e.g. "name", "time", "trafficDown")
+    sort_by: typing.Optional[str] = None
+    sort_order: SortOrder = SortOrder.Ascending
+
+    class Config:
+        # A mistyped filter must not fall back to fetching the whole listing
+        extra = pydantic.Extra.forbid
+
+    def _all_params(self) -> typing.Dict[str, typing.Any]:
+        out = {"searchKey": self.search_key}
+        if self.sort_by is not None:
+            out[f"sorts.{self.sort_by}"] = self.sort_order.value
+        return out
+
+    def params(self) -> typing.Dict[str, typing.Any]:
+        """Query parameters of the listing request (unset filters are omitted)."""
+        return {
+            key: value for key, value in self._all_params().items() if value is not None
+        }
+
+
+class SiteEventsInterface(ListingInterface):
+    """Site/events filter"""
+
     time_start: typing.Optional[int] = None
     time_end: typing.Optional[int] = None
     module: typing.Optional[ModuleFilter] = None
+    level: typing.Optional[LevelFilter] = None
+
+    def _all_params(self) -> typing.Dict[str, typing.Any]:
+        return {
+            "filters.timeStart": self.time_start,
+            "filters.timeEnd": self.time_end,
+            "filters.module": None if self.module is None else self.module.value,
+            "filters.level": None if self.level is None else self.level.value,
+            **super()._all_params(),
+        }
+
+
+class SiteAlertsInterface(SiteEventsInterface):
+    """Site/alerts filter"""
+
+    archived: bool = False
+
+    def _all_params(self) -> typing.Dict[str, typing.Any]:
+        return {
+            "filters.archived": _bool_param(self.archived),
+            **super()._all_params(),
+        }
+
+
+class SiteClientsInterface(ListingInterface):
+    """Site/clients filter"""
+
+    # `None` - both active and inactive clients
+    active: typing.Optional[bool] = True
+    ssid: typing.Optional[str] = None
+    ap_mac: typing.Optional[str] = None
+    radio_id: typing.Optional[int] = None
+
+    def _all_params(self) -> typing.Dict[str, typing.Any]:
+        return {
+            "filters.active": _bool_param(self.active),
+            "filters.ssid": self.ssid,
+            "filters.apMac": self.ap_mac,
+            "filters.radioId": self.radio_id,
+            **super()._all_params(),
+        }
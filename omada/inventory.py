@@ -0,0 +1,210 @@
+"""In-memory, indexed inventory of clients and devices.
+
+Rows are stored by MAC address and hash indexes map IP, hostname, AP/switch
+name, SSID and site to the matching MACs, so lookups never scan the full
+client list. `Inventory.refresh()` applies the difference with the previous
+pull of the same site: only added, changed and removed rows are (re)indexed.
+
+>>> inventory = Inventory()
+>>> inventory.refresh(omada)
+>>> inventory.ap_of("AA-BB-CC-DD-EE-FF")
+'Lobby AP'
+"""
+from __future__ import annotations
+
+import collections
+import dataclasses
+import threading
+import typing
+
+if typing.TYPE_CHECKING:
+    from .omada import Omada
+
+Normalizer = typing.Callable[[typing.Any], typing.Hashable]
+
+
+def normalize_mac(value: str) -> str:
+    """Omada MAC notation (`AA-BB-CC-DD-EE-FF`)."""
+    return value.upper().replace(":", "-")
+
+
+def _casefold(value: str) -> str:
+    return value.casefold()
+
+
+def _identity(value):
+    return value
+
+
+@dataclasses.dataclass(frozen=True)
+class IndexSpec:
+    """Index on `field` of the rows, values looked up after `normalize`."""
+
+    field: str
+    normalize: Normalizer = _identity
+
+
+CLIENT_INDEXES: typing.Dict[str, IndexSpec] = {
+    "ip": IndexSpec("ip"),
+    "hostname": IndexSpec("hostName", _casefold),
+    "name": IndexSpec("name", _casefold),
+    "ap": IndexSpec("apName"),
+    "ap_mac": IndexSpec("apMac", normalize_mac),
+    "switch": IndexSpec("switchName"),
+    "switch_mac": IndexSpec("switchMac", normalize_mac),
+    "ssid": IndexSpec("ssid"),
+}
+
+DEVICE_INDEXES: typing.Dict[str, IndexSpec] = {
+    "ip": IndexSpec("ip"),
+    "name": IndexSpec("name", _casefold),
+    "type": IndexSpec("type"),
+}
+
+
+@dataclasses.dataclass
+class Changes:
+    """MACs affected by an update."""
+
+    added: typing.Set[str] = dataclasses.field(default_factory=set)
+    changed: typing.Set[str] = dataclasses.field(default_factory=set)
+    removed: typing.Set[str] = dataclasses.field(default_factory=set)
+
+    def __bool__(self):
+        return bool(self.added or self.changed or self.removed)
+
+
+class IndexedTable:
+    """Rows keyed by MAC with a hash index per `IndexSpec` (plus `site`)."""
+
+    def __init__(self, indexes: typing.Dict[str, IndexSpec]):
+        self.specs = indexes
+        self.rows: typing.Dict[str, dict] = {}
+        self.site_of: typing.Dict[str, str] = {}
+        self.indexes: typing.Dict[
+            str, typing.DefaultDict[typing.Hashable, typing.Set[str]]
+        ] = {name: collections.defaultdict(set) for name in [*indexes, "site"]}
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _keys(self, row: dict, site: str):
+        for name, spec in self.specs.items():
+            value = row.get(spec.field)
+            if value is not None:
+                yield name, spec.normalize(value)
+        yield "site", site
+
+    def _index(self, mac: str, row: dict, site: str):
+        self.rows[mac] = row
+        self.site_of[mac] = site
+        for name, key in self._keys(row, site):
+            self.indexes[name][key].add(mac)
+
+    def _unindex(self, mac: str):
+        row = self.rows.pop(mac)
+        site = self.site_of.pop(mac)
+        for name, key in self._keys(row, site):
+            index = self.indexes[name]
+            index[key].discard(mac)
+            if not index[key]:
+                del index[key]
+
+    def update(self, site: str, rows: typing.Iterable[dict]) -> Changes:
+        """Replace the rows of `site` with `rows`, re-indexing only the differences."""
+        out = Changes()
+        seen = set()
+        for row in rows:
+            mac = normalize_mac(row["mac"])
+            seen.add(mac)
+            old = self.rows.get(mac)
+            if old is None:
+                out.added.add(mac)
+            elif old == row and self.site_of[mac] == site:
+                continue
+            else:
+                out.changed.add(mac)
+                self._unindex(mac)
+            self._index(mac, row, site)
+        for mac in self.indexes["site"].get(site, set()) - seen:
+            out.removed.add(mac)
+            self._unindex(mac)
+        return out
+
+    def get(self, mac: str) -> typing.Optional[dict]:
+        return self.rows.get(normalize_mac(mac))
+
+    def find(self, **criteria) -> typing.List[dict]:
+        """Rows matching all `criteria` (index name -> value)."""
+        if not criteria:
+            return list(self.rows.values())
+        matches = []
+        for name, value in criteria.items():
+            try:
+                index = self.indexes[name]
+            except KeyError:
+                raise ValueError(
+                    f"Unknown index {name!r}, expected one of {sorted(self.indexes)}"
+                ) from None
+            if name != "site":
+                value = self.specs[name].normalize(value)
+            matches.append(index.get(value, set()))
+        macs = set.intersection(*sorted(matches, key=len))
+        return [self.rows[mac] for mac in macs]
+
+
+class Inventory:
+    """Clients and devices of one or more sites, indexed for fast lookups.
+
+    Client indexes: `CLIENT_INDEXES` keys, device indexes: `DEVICE_INDEXES`
+    keys; both are also indexed by `site`. Safe to query while another thread
+    refreshes it.
+    """
+
+    def __init__(self):
+        self.clients = IndexedTable(CLIENT_INDEXES)
+        self.devices = IndexedTable(DEVICE_INDEXES)
+        self._lock = threading.RLock()
+
+    def refresh(
+        self, omada: Omada, site: typing.Optional[str] = None
+    ) -> typing.Tuple[Changes, Changes]:
+        """Pull active clients and devices of `site`, returns (client, device) changes."""
+        if site is None:
+            site = omada.config.site
+        clients = list(omada.get_site_clients(site=site))
+        devices = list(omada.get_site_devices(site=site))
+        return self.update_clients(site, clients), self.update_devices(site, devices)
+
+    def update_clients(self, site: str, rows: typing.Iterable[dict]) -> Changes:
+        with self._lock:
+            return self.clients.update(site, rows)
+
+    def update_devices(self, site: str, rows: typing.Iterable[dict]) -> Changes:
+        with self._lock:
+            return self.devices.update(site, rows)
+
+    def client(self, mac: str) -> typing.Optional[dict]:
+        with self._lock:
+            return self.clients.get(mac)
+
+    def device(self, mac: str) -> typing.Optional[dict]:
+        with self._lock:
+            return self.devices.get(mac)
+
+    def find_clients(self, **criteria) -> typing.List[dict]:
+        """E.g. `find_clients(ssid="Guests", site="Office")`."""
+        with self._lock:
+            return self.clients.find(**criteria)
+
+    def find_devices(self, **criteria) -> typing.List[dict]:
+        """E.g. `find_devices(type="ap")`."""
+        with self._lock:
+            return self.devices.find(**criteria)
+
+    def ap_of(self, mac: str) -> typing.Optional[str]:
+        """Name of the AP the client `mac` is connected to (if wireless)."""
+        client = self.client(mac)
+        if client is None:
+            return None
+        return client.get("apName")
@@ -1,18 +1,31 @@
+from __future__ import annotations
+
+import contextlib
 import dataclasses
 import enum
 import functools
 import logging
+import threading
+import time
 import typing
 from datetime import datetime
 
-import requests
-import yarl
-from requests.cookies import RequestsCookieJar
+from . import retry, timeouts, validation, wire_log
+
+if typing.TYPE_CHECKING:
+    import yarl
+
+    from . import api_bindings, bulk, pagination
+    from . import transport as transport_mod
 
-from . import api_bindings, function_interface_bindings
+# `requests`, pydantic models (`api_bindings`, `function_interface_bindings`)
+# are imported on first use to keep `import omada` cheap.
 
 logger = logging.getLogger(__name__)
 
+# Rows requested per page by paginated listings
+DEFAULT_PAGE_SIZE = 100
+
 
 def timestamp() -> int:
     """Omada API calls expects timestamp in milliseconds."""
@@ -25,6 +38,8 @@ class CustomErrorCodes(int, enum.Enum):
 
     ImpossibleError = -1  # You should never see this error code
     UnknownSite = 99_001
+    CircuitOpen = 99_002
+    DeadlineExceeded = 99_003
     UnknownError = 99_999
 
 
@@ -72,32 +87,114 @@ class OmadaConfig:
     site: str
     omada_controller_id: typing.Optional[str] = None
     ssl_verify: bool = True
+    # How responses are parsed into `api_bindings` models (see `validation`)
+    validation_mode: validation.ValidationMode = validation.ValidationMode.Full
+    validation_sample_every: int = 100
+    # Retries of idempotent reads (GET) and of writes (PATCH/POST), see `retry`
+    read_retry: retry.RetryPolicy = retry.NO_RETRY
+    write_retry: retry.RetryPolicy = retry.NO_RETRY
+    # Share one breaker between all clients of a controller (`retry.circuit_breaker_for()`)
+    circuit_breaker: typing.Optional[retry.CircuitBreaker] = None
+    # Per-request timeouts (seconds, `None` - wait forever)
+    connect_timeout: typing.Optional[float] = 10.0
+    read_timeout: typing.Optional[float] = 60.0
+    # Default time budget (seconds) of a call, shared by all its pages and retries
+    call_deadline: typing.Optional[float] = None
+    # JSON file caching discovered controller IDs across processes (see `discovery`)
+    controller_id_cache: typing.Optional[str] = None
+    # One `requests.Session` per thread (sharing cookies and headers), `False` - one
+    # session for all threads (only safe if the instance is not used concurrently)
+    session_per_thread: bool = True
+    # Truncation, sampling and redaction of the `omada.wire` debug log
+    wire_logging: wire_log.WireLogConfig = wire_log.DEFAULT
+
+
+class _locked_cached_property:  # noqa: N801
+    """`functools.cached_property` computed at most once, even by concurrent threads.
+
+    Uses the per-instance `_lock` (reentrant: properties may depend on each other).
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.__doc__ = func.__doc__
+
+    def __set_name__(self, owner, name):
+        self.attrname = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        cache = instance.__dict__
+        try:
+            return cache[self.attrname]
+        except KeyError:
+            pass
+        with instance._lock:
+            try:
+                return cache[self.attrname]
+            except KeyError:
+                out = cache[self.attrname] = self.func(instance)
+                return out
 
 
 class Omada:
-    """The main Omada API class."""
+    """The main Omada API class.
 
-    def __init__(self, config: OmadaConfig):
+    An instance can be shared between threads: login/logout and lazily
+    computed properties are guarded by a lock, and (unless
+    `OmadaConfig.session_per_thread` is off) every thread gets its own HTTP
+    session (all sharing the one login).
+    """
+
+    def __init__(
+        self,
+        config: OmadaConfig,
+        transport: typing.Optional[transport_mod.Transport] = None,
+        clock: typing.Callable[[], float] = time.monotonic,
+    ):
+        """`transport` defaults to a `requests` session (see `omada.transport`).
+
+        `clock` (seconds) ages the cached counts (see `_count()`).
+        """
         self.config = config
+        self.clock = clock
+        self._lock = threading.RLock()
+        self.wire_logger = wire_log.WireLogger(config.wire_logging)
+        # (path, params) -> (`clock()` time, row count), see `_count()`
+        self._counts: typing.Dict[tuple, typing.Tuple[float, int]] = {}
+        self.validator = validation.ModelValidator(
+            config.validation_mode, config.validation_sample_every
+        )
+
+        if transport is None:
+            from .transport import RequestsTransport
 
-        # set up requests session and cookies
-        self.session = requests.Session()
-        self.session.verify = self.config.ssl_verify
-        self.session.cookies = RequestsCookieJar()
+            transport = RequestsTransport(
+                verify=self.config.ssl_verify,
+                session_per_thread=self.config.session_per_thread,
+            )
+        self.transport = transport
+
+    @property
+    def session(self):
+        """The `requests.Session` (of the current thread) of the default transport."""
+        return self.transport.session
 
-    @functools.cached_property
+    @_locked_cached_property
     def omada_controller_id(self) -> str:
+        """The configured controller ID, or the one discovered through `/api/info`."""
         if self.config.omada_controller_id:
-            out = self.config.omada_controller_id
-        else:
-            raise NotImplementedError(
-                "TODO: implement fetch from self.baseurl + '/api/info' when talking to the controller locally"
-            )
-        return out
+            return self.config.omada_controller_id
+        from . import discovery
+
+        return discovery.controller_id(self)
 
-    @functools.cached_property
+    @_locked_cached_property
     def current_user(self) -> api_bindings.CurrentUser:
-        return api_bindings.CurrentUser(**self.get_current_user())
+        from . import api_bindings
+
+        return self.validator(api_bindings.CurrentUser, self.get_current_user())
 
     @property
     def api_root(self) -> yarl.URL:
@@ -108,7 +205,7 @@ class Omada:
 
     def get_json_response(self, response) -> dict:
         """Post-processing of a generic omada api request"""
-        logger.debug(f"Received API response: {response=} {response.text=!r}")
+        self.wire_logger.log_response(response)
         response.raise_for_status()
         try:
             json = response.json()
@@ -145,12 +242,53 @@ class Omada:
             }
         )
 
+    @contextlib.contextmanager
+    def deadline(self, seconds: float):
+        """Limit everything called within the block to `seconds` in total.
+
+        >>> with omada.deadline(30):
+        ...     clients = list(omada.get_site_clients())
+        """
+        with timeouts.activate(timeouts.Deadline(seconds)) as out:
+            yield out
+
+    def _call_deadline(self) -> typing.Optional[timeouts.Deadline]:
+        """Deadline of the call being started: the active one or a fresh default."""
+        out = timeouts.current()
+        if out is None and self.config.call_deadline is not None:
+            out = timeouts.Deadline(self.config.call_deadline)
+        return out
+
+    def _with_retry(
+        self,
+        fn: typing.Callable[[timeouts.Timeout], typing.Any],
+        policy: retry.RetryPolicy,
+    ):
+        """Call `fn(timeout)` according to the retry `policy`, circuit breaker and deadline."""
+        deadline = self._call_deadline()
+        timeout = (self.config.connect_timeout, self.config.read_timeout)
+
+        def _attempt():
+            if deadline is None:
+                return fn(timeout)
+            deadline.check()
+            return fn(deadline.clip(timeout))
+
+        return retry.call(_attempt, policy, self.config.circuit_breaker, deadline)
+
     def _get(self, path, params: typing.Optional[dict] = None):
         """Perform a GET request and return the result."""
         if not params:
             params = {}
-        response = self.session.get(self.api_root / path, params=params)
-        return self.get_json_response(response)
+        url = self.api_root / path
+
+        def _get_impl(timeout: timeouts.Timeout):
+            response = self.transport.request(
+                "GET", url, params=params, timeout=timeout
+            )
+            return self.get_json_response(response)
+
+        return self._with_retry(_get_impl, self.config.read_retry)
 
     def _patch(
         self,
@@ -167,39 +305,126 @@ class Omada:
 
         params.update({"_": timestamp(), "token": self.login_result.token})
 
-        response = self.session.patch(
-            self.api_root / path, params=params, data=data, json=json
-        )
-        return self.get_json_response(response)
+        url = self.api_root / path
 
-    def _geterator(
-        self, path: str, params: typing.Optional[typing.Dict[str, typing.Any]] = None
+        def _patch_impl(timeout: timeouts.Timeout):
+            response = self.transport.request(
+                "PATCH", url, params=params, data=data, json=json, timeout=timeout
+            )
+            return self.get_json_response(response)
+
+        return self._with_retry(_patch_impl, self.config.write_retry)
+
+    def _post(
+        self,
+        path: str,
+        params: typing.Optional[dict] = None,
+        data: typing.Optional[dict] = None,
+        json: typing.Optional[dict] = None,
     ):
-        """Perform a GET request and yield the results."""
-        total_rows = 1  # will be updated by the first get call
-        last_row_data = [42]  # will be updated by the first get call
-        yielded_rows = 0
+        """Perform a POST request and return the result."""
 
-        if params:
-            active_params = params.copy()
-        else:
-            active_params = {}
+        if not params:
+            params = {}
+        params = params.copy()
+
+        params.update({"_": timestamp(), "token": self.login_result.token})
 
+        url = self.api_root / path
+
+        def _post_impl(timeout: timeouts.Timeout):
+            response = self.transport.request(
+                "POST", url, params=params, data=data, json=json, timeout=timeout
+            )
+            return self.get_json_response(response)
+
+        return self._with_retry(_post_impl, self.config.write_retry)
+
+    def _get_page(
+        self,
+        path: str,
+        params: typing.Optional[typing.Dict[str, typing.Any]] = None,
+        page: int = 1,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> dict:
+        """Fetch a single page of a paginated listing.
+
+        Returns the raw result (`data`, `totalRows`, `currentPage`, ...).
+        """
+        active_params = dict(params) if params else {}
         active_params.update(
             {
                 "_": timestamp(),
                 "token": self.login_result.token,
-                "currentPage": 1,
-                "currentPageSize": 100,
+                "currentPage": page,
+                "currentPageSize": page_size,
             }
         )
-        while last_row_data and yielded_rows < total_rows:
-            resp = self._get(path, active_params)
-            last_row_data = resp.get("data", [])
-            yield from last_row_data
-            yielded_rows += len(last_row_data)
-            total_rows = int(resp["totalRows"])
-            active_params["currentPage"] += 1
+        return self._get(path, active_params)
+
+    def _geterator(
+        self, path: str, params: typing.Optional[typing.Dict[str, typing.Any]] = None
+    ) -> pagination.Listing:
+        """Perform paginated GET requests and lazily yield the rows.
+
+        The returned listing exposes its resumable position as `.cursor`.
+        """
+        from . import pagination
+
+        cursor = pagination.ScanCursor(
+            path=path,
+            params=dict(params) if params else {},
+            page_size=DEFAULT_PAGE_SIZE,
+        )
+        return pagination.Listing(self, cursor)
+
+    def _count(
+        self,
+        path: str,
+        params: typing.Optional[typing.Dict[str, typing.Any]] = None,
+        max_age: typing.Optional[float] = None,
+    ) -> int:
+        """Number of rows of a paginated listing, read from a single one-row page.
+
+        With `max_age` (seconds), a count fetched less than `max_age` ago for
+        the same path and filters is returned without a request. Counts are
+        only cached when `max_age` is given, and dropped once older than it.
+        """
+        params = dict(params) if params else {}
+        if max_age is None:
+            return self._count_rows(path, params)
+        key = (
+            path,
+            tuple(sorted((name, str(value)) for name, value in params.items())),
+        )
+        with self._lock:
+            cached = self._counts.get(key)
+        if cached is not None and self.clock() - cached[0] < max_age:
+            return cached[1]
+        out = self._count_rows(path, params)
+        now = self.clock()
+        with self._lock:
+            # Moving filters (e.g. `time_start`) would grow the cache forever
+            self._counts = {
+                cached_key: entry
+                for cached_key, entry in self._counts.items()
+                if now - entry[0] < max_age
+            }
+            self._counts[key] = (now, out)
+        return out
+
+    def _count_rows(self, path: str, params: typing.Dict[str, typing.Any]) -> int:
+        return int(self._get_page(path, params, page=1, page_size=1)["totalRows"])
+
+    def resume(self, cursor: pagination.ScanCursor) -> pagination.Listing:
+        """Continue a paginated scan after the last page completed by `cursor`.
+
+        The cursor may come from a different `Omada` instance (see `ScanCursor.load()`)
+        and is updated in place as the scan progresses.
+        """
+        from . import pagination
+
+        return pagination.Listing(self, cursor)
 
     login_result: typing.Optional[api_bindings.LoginResult] = None
 
@@ -207,42 +432,59 @@ class Omada:
         """Log in with the provided credentials and return the result."""
         assert username, "Username must be provided"
         assert password, "Password must be provided"
-        # Only try to log in if we're not already logged in.
-        if self.login_result is None:
-            # Perform the login request manually.
-            response = self.session.post(
+        with self._lock:
+            # Only try to log in if we're not already logged in (by another thread).
+            if self.login_result is None:
+                self._login_locked(username, password)
+            return self.login_result
+
+    def _login_locked(self, username: str, password: str):
+        # Perform the login request manually.
+        def _login_impl(timeout: timeouts.Timeout):
+            response = self.transport.request(
+                "POST",
                 self.api_root / "login",
                 json={"username": username, "password": password},
+                timeout=timeout,
             )
             response.raise_for_status()
+            return response.json()
 
-            # Get the login response.
-            json = response.json()
-            if json["errorCode"] != 0:
-                raise OmadaError(json)
+        # Get the login response.
+        json = self._with_retry(_login_impl, self.config.write_retry)
+        if json["errorCode"] != 0:
+            raise OmadaError(json)
+
+        from . import api_bindings
 
-            # Store the login result.
-            self.login_result = api_bindings.LoginResult(**json["result"])
+        login_result = self.validator(api_bindings.LoginResult, json["result"])
 
-            # Store CSRF token header.
-            self.session.headers.update({"Csrf-Token": self.login_result.token})
+        # Store CSRF token header (before other threads can see the login).
+        self.transport.set_header("Csrf-Token", login_result.token)
 
-        return self.login_result
+        # Store the login result.
+        self.login_result = login_result
 
     def logout(self):
         """Log out of the current session. Return value is always None."""
-        # Only try to log out if we're already logged in.
-        if self.login_result is not None:
-            # Send the logout request.
-            resp = self.session.post(
-                self.api_root / "logout", params=self._default_request_params()
-            )
-            self.get_json_response(resp)
-            # Clear the stored result.
-            self.login_result = None
-            return True
+        with self._lock:
+            # Only try to log out if we're already logged in.
+            if self.login_result is not None:
+                # Send the logout request.
+                params = self._default_request_params()
+
+                def _logout_impl(timeout: timeouts.Timeout):
+                    resp = self.transport.request(
+                        "POST", self.api_root / "logout", params=params, timeout=timeout
+                    )
+                    return self.get_json_response(resp)
+
+                self._with_retry(_logout_impl, self.config.write_retry)
+                # Clear the stored result.
+                self.login_result = None
+                return True
 
-        return False
+            return False
 
     def get_login_status(self) -> bool:
         """Returns the current login status."""
@@ -274,10 +516,14 @@ class Omada:
         """Returns the list of scenarios."""
         return self._get("scenarios")
 
-    def get_sites(self) -> typing.Generator[dict, None, None]:
+    def get_sites(self) -> typing.Iterator[dict]:
         """Returns the list of all sites."""
         return self._geterator("sites")
 
+    def count_sites(self, max_age: typing.Optional[float] = None) -> int:
+        """Returns the number of sites (see `_count()` for `max_age`)."""
+        return self.get_sites().count(max_age=max_age)
+
     def get_site_devices(
         self, site: typing.Optional[str] = None
     ) -> typing.Iterable[dict]:
@@ -285,43 +531,252 @@ class Omada:
         return self._get(f"sites/{self._find_site(site)}/devices")
 
     def get_site_clients(
-        self, site: typing.Optional[str] = None, active: typing.Optional[bool] = True
+        self,
+        site: typing.Optional[str] = None,
+        active: typing.Optional[bool] = True,
+        **kwargs,
     ) -> typing.Iterable[dict]:
-        """Returns the list of active clients for given site."""
-        params = {}
-        if active in (True, False):
-            params["filters.active"] = "true" if active else "false"
+        """Returns the list of active clients for given site.
+
+        `kwargs` are filtered, searched and sorted on by the controller
+        (see `function_interface_bindings.SiteClientsInterface`).
+        """
+        from . import function_interface_bindings
+
+        settings = function_interface_bindings.SiteClientsInterface(
+            site=site, active=active, **kwargs
+        )
         return self._geterator(
-            f"sites/{self._find_site(site)}/clients",
-            params=params,
+            f"sites/{self._find_site(settings.site)}/clients",
+            params=settings.params(),
+        )
+
+    def count_site_clients(
+        self,
+        site: typing.Optional[str] = None,
+        active: typing.Optional[bool] = True,
+        max_age: typing.Optional[float] = None,
+        **kwargs,
+    ) -> int:
+        """Returns the number of (active) clients of given site."""
+        return self.get_site_clients(site, active=active, **kwargs).count(
+            max_age=max_age
         )
 
     def get_site_alerts(
-        self, site: typing.Optional[str] = None, archived: bool = False
+        self,
+        site: typing.Optional[str] = None,
+        archived: bool = False,
+        time_start: typing.Optional[int] = None,
+        time_end: typing.Optional[int] = None,
+        **kwargs,
     ) -> typing.Iterable[dict]:
-        """Returns the list of alerts for given site."""
-        params = {"filters.archived": "true" if archived else "false"}
+        """Returns the list of alerts for given site.
+
+        `kwargs` are filtered, searched and sorted on by the controller
+        (see `function_interface_bindings.SiteAlertsInterface`).
+        """
+        from . import function_interface_bindings
+
+        settings = function_interface_bindings.SiteAlertsInterface(
+            site=site,
+            archived=archived,
+            time_start=time_start,
+            time_end=time_end,
+            **kwargs,
+        )
+        return self._geterator(
+            f"sites/{self._find_site(settings.site)}/alerts", params=settings.params()
+        )
+
+    def count_site_alerts(
+        self,
+        site: typing.Optional[str] = None,
+        archived: bool = False,
+        time_start: typing.Optional[int] = None,
+        time_end: typing.Optional[int] = None,
+        max_age: typing.Optional[float] = None,
+        **kwargs,
+    ) -> int:
+        """Returns the number of alerts of given site."""
+        return self.get_site_alerts(
+            site,
+            archived=archived,
+            time_start=time_start,
+            time_end=time_end,
+            **kwargs,
+        ).count(max_age=max_age)
+
+    def backfill_site_alerts(
+        self,
+        time_start: int,
+        time_end: int,
+        site: typing.Optional[str] = None,
+        archived: bool = False,
+        ordered: bool = True,
+        shard_count: typing.Optional[int] = None,
+        **backfill_kwargs,
+    ) -> typing.Iterable[dict]:
+        """Returns alerts between `time_start` and `time_end` (ms), fetched as concurrent time shards.
+
+        `backfill_kwargs` are passed to `backfill.ShardedBackfill`
+        (`max_workers`, `max_shard_rows`, ...).
+        """
+        from . import backfill, function_interface_bindings
+
+        settings = function_interface_bindings.SiteAlertsInterface(
+            site=site, archived=archived
+        )
+        return backfill.ShardedBackfill(
+            self,
+            f"sites/{self._find_site(settings.site)}/alerts",
+            settings.params(),
+            **backfill_kwargs,
+        ).run(time_start, time_end, shard_count=shard_count, ordered=ordered)
+
+    def _bulk_alert_action(
+        self,
+        action: str,
+        alert_ids: typing.Optional[typing.Iterable[str]],
+        site: typing.Optional[str],
+        archived: bool,
+        where: typing.Optional[typing.Callable[[dict], bool]],
+        time_start: typing.Optional[int],
+        time_end: typing.Optional[int],
+        batch_size: int,
+        max_workers: int,
+    ):
+        from . import bulk
+
+        if alert_ids is None:
+            # Collected upfront: the listing would shift under the running batches
+            alert_ids = [
+                row["id"]
+                for row in self.get_site_alerts(
+                    site, archived=archived, time_start=time_start, time_end=time_end
+                )
+                if where is None or where(row)
+            ]
+        return bulk.BulkAlertOperation(
+            self, self._find_site(site), action, batch_size, max_workers
+        ).run(alert_ids)
+
+    def archive_site_alerts(
+        self,
+        alert_ids: typing.Optional[typing.Iterable[str]] = None,
+        site: typing.Optional[str] = None,
+        where: typing.Optional[typing.Callable[[dict], bool]] = None,
+        time_start: typing.Optional[int] = None,
+        time_end: typing.Optional[int] = None,
+        batch_size: int = 100,
+        max_workers: int = 4,
+    ) -> typing.List[bulk.BatchResult]:
+        """Archive the given alerts, or the unarchived alerts matching the filter.
+
+        Without `alert_ids`, alerts from `get_site_alerts(site, time_start=, time_end=)`
+        accepted by `where(row)` (all if `None`) are archived.
+        Returns one `bulk.BatchResult` per batch of `batch_size` ids.
+        """
+        return self._bulk_alert_action(
+            "archive",
+            alert_ids,
+            site,
+            False,
+            where,
+            time_start,
+            time_end,
+            batch_size,
+            max_workers,
+        )
+
+    def delete_site_alerts(
+        self,
+        alert_ids: typing.Optional[typing.Iterable[str]] = None,
+        site: typing.Optional[str] = None,
+        archived: bool = True,
+        where: typing.Optional[typing.Callable[[dict], bool]] = None,
+        time_start: typing.Optional[int] = None,
+        time_end: typing.Optional[int] = None,
+        batch_size: int = 100,
+        max_workers: int = 4,
+    ) -> typing.List[bulk.BatchResult]:
+        """Delete the given alerts, or the (by default archived) alerts matching the filter.
+
+        See `archive_site_alerts()`.
+        """
+        return self._bulk_alert_action(
+            "delete",
+            alert_ids,
+            site,
+            archived,
+            where,
+            time_start,
+            time_end,
+            batch_size,
+            max_workers,
+        )
 
-        return self._geterator(f"sites/{self._find_site(site)}/alerts", params=params)
+    def archive_all_site_alerts(self, site: typing.Optional[str] = None) -> bool:
+        """Mark all alerts of the site as archived (single request).
+
+        (Returns `True` on success)
+        """
+        self._post(f"sites/{self._find_site(site)}/cmd/alerts/archiveAll", json={})
+        return True
+
+    def delete_all_site_alerts(self, site: typing.Optional[str] = None) -> bool:
+        """Delete all alerts of the site (single request).
+
+        (Returns `True` on success)
+        """
+        self._post(f"sites/{self._find_site(site)}/cmd/alerts/deleteAll", json={})
+        return True
 
     def get_site_events(self, **kwargs) -> typing.Iterable[dict]:
-        """Returns the list of events for given site."""
+        """Returns the list of events for given site.
+
+        `kwargs` are filtered, searched and sorted on by the controller
+        (see `function_interface_bindings.SiteEventsInterface`).
+        """
+        from . import function_interface_bindings
+
         settings = function_interface_bindings.SiteEventsInterface(**kwargs)
-        all_params = {
-            "filters.timeStart": settings.time_start,
-            "filters.timeEnd": settings.time_end,
-            "filters.module": settings.module,
-        }
-        # Remove empty filters
-        params = {}
-        for key, value in all_params.items():
-            if value is None:
-                continue
-            else:
-                params[key] = value
         return self._geterator(
-            f"sites/{self._find_site(settings.site)}/events", params=params
+            f"sites/{self._find_site(settings.site)}/events", params=settings.params()
+        )
+
+    def count_site_events(
+        self, max_age: typing.Optional[float] = None, **kwargs
+    ) -> int:
+        """Returns the number of events matching the `get_site_events` filters."""
+        return self.get_site_events(**kwargs).count(max_age=max_age)
+
+    def backfill_site_events(
+        self,
+        time_start: int,
+        time_end: int,
+        site: typing.Optional[str] = None,
+        module: typing.Optional[str] = None,
+        ordered: bool = True,
+        shard_count: typing.Optional[int] = None,
+        **backfill_kwargs,
+    ) -> typing.Iterable[dict]:
+        """Returns events between `time_start` and `time_end` (ms), fetched as concurrent time shards.
+
+        `backfill_kwargs` are passed to `backfill.ShardedBackfill`
+        (`max_workers`, `max_shard_rows`, ...).
+        """
+        from . import backfill, function_interface_bindings
+
+        settings = function_interface_bindings.SiteEventsInterface(
+            site=site, module=module
         )
+        return backfill.ShardedBackfill(
+            self,
+            f"sites/{self._find_site(settings.site)}/events",
+            settings.params(),
+            **backfill_kwargs,
+        ).run(time_start, time_end, shard_count=shard_count, ordered=ordered)
 
     def get_site_notifications(
         self, site: typing.Optional[str] = None
@@ -368,7 +823,43 @@ class Omada:
         This is the main SSID list on Settings > Wireless Networks.
         """
         if group_id is None:
-            raise NotImplementedError("Please provide group ID")
+            raise NotImplementedError(
+                "Please provide group ID (or use get_all_wireless_networks())"
+            )
         return self._geterator(
             f"sites/{self._find_site(site)}/setting/wlans/{group_id}/ssids"
         )
+
+    def get_all_wireless_networks(
+        self,
+        site: typing.Optional[str] = None,
+        groups: typing.Optional[typing.Iterable[dict]] = None,
+        max_workers: int = 4,
+    ) -> typing.Iterator[dict]:
+        """Returns the wireless networks of all WLAN groups, fetched concurrently.
+
+        Every SSID is tagged with its `wlanGroupId` and `wlanGroupName`.
+        `groups` defaults to `get_wireless_groups(site)`.
+        """
+        import concurrent.futures
+
+        if groups is None:
+            groups = self.get_wireless_groups(site)
+        groups = list(groups)
+        if not groups:
+            return
+
+        def _group_ssids(group: dict) -> typing.List[dict]:
+            out = list(self.get_wireless_networks(site, group["id"]))
+            for ssid in out:
+                ssid["wlanGroupId"] = group["id"]
+                ssid["wlanGroupName"] = group.get("name")
+            return out
+
+        deadline = self._call_deadline()
+        with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+            for ssids in executor.map(
+                functools.partial(timeouts.call_within, deadline, _group_ssids),
+                groups,
+            ):
+                yield from ssids
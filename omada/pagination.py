@@ -0,0 +1,147 @@
+"""Paginated listings and resumable scan cursors."""
+from __future__ import annotations
+
+import dataclasses
+import json
+import pathlib
+import time
+import typing
+
+from . import timeouts
+
+if typing.TYPE_CHECKING:
+    from .omada import Omada
+
+
+@dataclasses.dataclass
+class ScanCursor:
+    """Position of a paginated scan.
+
+    The cursor records the endpoint and filters (but never the session token),
+    so it can be saved as JSON and handed to another `Omada` instance
+    (`Omada.resume()`) to continue after the last completed page.
+
+    Rows of a page that was interrupted mid-way are yielded again on resume.
+    """
+
+    path: str
+    params: typing.Dict[str, typing.Any] = dataclasses.field(default_factory=dict)
+    page_size: int = 100
+    last_completed_page: int = 0
+    total_rows: typing.Optional[int] = None
+    yielded_rows: int = 0
+    exhausted: bool = False
+
+    @property
+    def next_page(self) -> int:
+        return self.last_completed_page + 1
+
+    def advance(self, page_rows: int, total_rows: int):
+        """Mark the next page as completed."""
+        self.last_completed_page += 1
+        self.yielded_rows += page_rows
+        self.total_rows = total_rows
+        if page_rows == 0 or self.yielded_rows >= total_rows:
+            self.exhausted = True
+
+    def to_dict(self) -> dict:
+        return dataclasses.asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> ScanCursor:
+        return cls(**data)
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), sort_keys=True)
+
+    @classmethod
+    def from_json(cls, text: str) -> ScanCursor:
+        return cls.from_dict(json.loads(text))
+
+    def save(self, path: typing.Union[str, pathlib.Path]):
+        pathlib.Path(path).write_text(self.to_json())
+
+    @classmethod
+    def load(cls, path: typing.Union[str, pathlib.Path]) -> ScanCursor:
+        return cls.from_json(pathlib.Path(path).read_text())
+
+
+@dataclasses.dataclass
+class Page:
+    """A single page of a paginated listing."""
+
+    rows: typing.List[dict]
+    page: int
+    page_size: int
+    total_rows: int
+    # Seconds spent fetching (and decoding) this page
+    elapsed: float
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self) -> typing.Iterator[dict]:
+        return iter(self.rows)
+
+
+class Listing:
+    """Lazy iterator over the rows of a paginated endpoint.
+
+    Returned by the `Omada` listing methods; behaves like a generator of rows
+    while exposing the scan position as `cursor`. Use `pages()` instead to
+    consume whole pages (batches) at a time.
+    """
+
+    def __init__(self, omada: Omada, cursor: ScanCursor):
+        self.omada = omada
+        self.cursor = cursor
+        # All pages share the deadline active when the listing was created
+        self.deadline = omada._call_deadline()
+        self._rows: typing.Optional[typing.Iterator[dict]] = None
+
+    def __iter__(self):
+        return self
+
+    def count(self, max_age: typing.Optional[float] = None) -> int:
+        """Total number of rows of the listing, without fetching them.
+
+        Costs a single one-row page request (none when a count of the same
+        listing younger than `max_age` seconds is cached, see `Omada._count()`).
+        """
+        with timeouts.activate(self.deadline):
+            return self.omada._count(
+                self.cursor.path, self.cursor.params, max_age=max_age
+            )
+
+    def __next__(self) -> dict:
+        if self._rows is None:
+            self._rows = self._iter_rows()
+        return next(self._rows)
+
+    def pages(self) -> typing.Generator[Page, None, None]:
+        """Yield the remaining pages of the scan.
+
+        The cursor advances once the consumer asks for the next page.
+        """
+        cursor = self.cursor
+        deadline = self.deadline
+        while not cursor.exhausted:
+            page_no = cursor.next_page
+            started = time.perf_counter()
+            with timeouts.activate(deadline):
+                resp = self.omada._get_page(
+                    cursor.path, cursor.params, page_no, cursor.page_size
+                )
+            page = Page(
+                rows=resp.get("data", []),
+                page=page_no,
+                page_size=cursor.page_size,
+                total_rows=int(resp["totalRows"]),
+                elapsed=time.perf_counter() - started,
+            )
+            yield page
+            cursor.advance(len(page.rows), page.total_rows)
+
+    def _iter_rows(self) -> typing.Generator[dict, None, None]:
+        for page in self.pages():
+            yield from page.rows
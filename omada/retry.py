@@ -0,0 +1,262 @@
+"""Retry policies and a circuit breaker for controller requests.
+
+Reads (GET) are idempotent and can be retried on any transient failure.
+Writes (PATCH/POST) are only retried when the request provably did not reach
+the controller (connect errors) or was explicitly refused (429/503).
+"""
+import dataclasses
+import enum
+import random
+import threading
+import time
+import typing
+
+if typing.TYPE_CHECKING:
+    from .timeouts import Deadline
+
+TRANSIENT_STATUSES = frozenset({429, 502, 503, 504})
+REFUSED_STATUSES = frozenset({429, 503})
+
+
+def _status_code(err: BaseException) -> typing.Optional[int]:
+    response = getattr(err, "response", None)
+    return getattr(response, "status_code", None)
+
+
+def is_connect_error(err: BaseException) -> bool:
+    """The request never reached the controller."""
+    import requests
+    import urllib3
+
+    from . import transport
+
+    if isinstance(err, (requests.exceptions.ConnectTimeout, transport.ConnectError)):
+        return True
+    if not isinstance(err, requests.exceptions.ConnectionError) or not err.args:
+        return False
+    # requests wraps urllib3 `MaxRetryError(reason=NewConnectionError(...))`
+    reason = getattr(err.args[0], "reason", err.args[0])
+    return isinstance(
+        reason,
+        (urllib3.exceptions.NewConnectionError, urllib3.exceptions.ConnectTimeoutError),
+    )
+
+
+def is_transport_error(err: BaseException) -> bool:
+    """Connection reset, timeout, ... (the controller might have seen the request)."""
+    import requests
+
+    from . import transport
+
+    if isinstance(err, transport.HTTPStatusError):
+        return False
+    return isinstance(
+        err,
+        (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+            transport.TransportError,
+        ),
+    )
+
+
+def is_controller_failure(err: BaseException) -> bool:
+    """Failures that say something about controller health (for the circuit breaker)."""
+    status = _status_code(err)
+    if status is not None:
+        return status >= 500
+    return is_transport_error(err)
+
+
+def is_controller_response(err: BaseException) -> bool:
+    """The controller answered (an API error or a status below 500): it is up."""
+    status = _status_code(err)
+    if status is not None:
+        return status < 500
+    from .omada import CustomErrorCodes, OmadaError
+
+    return isinstance(err, OmadaError) and err.code not in {
+        code.value for code in CustomErrorCodes
+    }
+
+
+@dataclasses.dataclass(frozen=True)
+class RetryPolicy:
+    """When and how often to retry a failed request.
+
+    Delays grow exponentially from `backoff` up to `backoff_max` seconds;
+    `jitter` is the randomised fraction of every delay (0 - none, 1 - "full jitter").
+    """
+
+    max_attempts: int = 1
+    backoff: float = 0.5
+    backoff_max: float = 30.0
+    jitter: float = 0.5
+    retry_statuses: typing.FrozenSet[int] = TRANSIENT_STATUSES
+    # Retry connection resets and read timeouts (only safe for idempotent calls)
+    retry_transport_errors: bool = True
+    # Omada `errorCode` values worth retrying (e.g. "controller busy")
+    retry_error_codes: typing.FrozenSet[int] = frozenset()
+
+    def delay(self, attempt: int, rng: typing.Callable[[], float] = random.random):
+        """Seconds to sleep after the `attempt`-th (1-based) failed attempt."""
+        base = min(self.backoff_max, self.backoff * (2 ** (attempt - 1)))
+        return base * (1 - self.jitter * rng())
+
+    def is_retryable(self, err: BaseException) -> bool:
+        status = _status_code(err)
+        if status is not None:
+            return status in self.retry_statuses
+        error_code = getattr(err, "code", None)
+        if error_code is not None and error_code in self.retry_error_codes:
+            return True
+        if is_connect_error(err):
+            return True
+        return self.retry_transport_errors and is_transport_error(err)
+
+
+# Single attempt (the default, same behaviour as without a policy)
+NO_RETRY = RetryPolicy()
+# Suggested policies for reads and writes
+IDEMPOTENT = RetryPolicy(max_attempts=4)
+NON_IDEMPOTENT = RetryPolicy(
+    max_attempts=3, retry_statuses=REFUSED_STATUSES, retry_transport_errors=False
+)
+
+
+@enum.unique
+class CircuitState(str, enum.Enum):
+    Closed = "closed"
+    Open = "open"
+    HalfOpen = "half-open"
+
+
+class CircuitBreaker:
+    """Fail fast while a controller is down.
+
+    After `failure_threshold` consecutive controller failures the circuit opens
+    and every call fails immediately for `reset_timeout` seconds. Then a single
+    trial call is let through: any controller response closes the circuit, a
+    controller failure re-opens it. A trial that fails without reaching a
+    verdict (e.g. its deadline expired) lets the next call be the trial.
+
+    Share one instance between all `Omada` objects talking to the same
+    controller (see `circuit_breaker_for()`).
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: typing.Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = CircuitState.Closed
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """Raise `OmadaError` if the circuit is open."""
+        with self._lock:
+            if self.state is CircuitState.Closed:
+                return
+            if (
+                self.state is CircuitState.Open
+                and self.clock() - self.opened_at >= self.reset_timeout
+            ):
+                self.state = CircuitState.HalfOpen
+                return
+            retry_in = max(0.0, self.opened_at + self.reset_timeout - self.clock())
+
+        from .omada import CustomErrorCodes, OmadaError
+
+        raise OmadaError(
+            {
+                "errorCode": CustomErrorCodes.CircuitOpen,
+                "msg": f"Controller circuit breaker is open, retry in {retry_in:.1f}s",
+            }
+        )
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.state = CircuitState.Closed
+
+    def record_error(self, err: BaseException):
+        """Record a call that raised `err`."""
+        if is_controller_failure(err):
+            self.record_failure()
+        elif is_controller_response(err):
+            self.record_success()
+        else:
+            self.record_abandoned()
+
+    def record_abandoned(self):
+        """The call failed without telling anything about the controller."""
+        with self._lock:
+            if self.state is CircuitState.HalfOpen:
+                # `opened_at` is past the reset timeout: the next call is the trial
+                self.state = CircuitState.Open
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if (
+                self.state is CircuitState.HalfOpen
+                or self.failures >= self.failure_threshold
+            ):
+                self.state = CircuitState.Open
+                self.opened_at = self.clock()
+
+
+_breakers: typing.Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def circuit_breaker_for(controller: str, **kwargs) -> CircuitBreaker:
+    """Process-wide circuit breaker for `controller` (e.g. the base URL)."""
+    with _breakers_lock:
+        try:
+            return _breakers[controller]
+        except KeyError:
+            out = _breakers[controller] = CircuitBreaker(**kwargs)
+            return out
+
+
+ResultT = typing.TypeVar("ResultT")
+
+
+def call(
+    fn: typing.Callable[[], ResultT],
+    policy: RetryPolicy = NO_RETRY,
+    breaker: typing.Optional[CircuitBreaker] = None,
+    deadline: typing.Optional["Deadline"] = None,
+    sleep: typing.Callable[[float], None] = time.sleep,
+) -> ResultT:
+    """Call `fn()` retrying according to `policy`, guarded by `breaker`.
+
+    No retry is attempted if its backoff delay would not fit into `deadline`.
+    """
+    attempt = 1
+    while True:
+        if breaker is not None:
+            breaker.before_call()
+        try:
+            out = fn()
+        except Exception as err:
+            if breaker is not None:
+                breaker.record_error(err)
+            if attempt >= policy.max_attempts or not policy.is_retryable(err):
+                raise
+            delay = policy.delay(attempt)
+            if deadline is not None and delay >= deadline.remaining():
+                raise
+            sleep(delay)
+            attempt += 1
+        else:
+            if breaker is not None:
+                breaker.record_success()
+            return out
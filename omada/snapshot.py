@@ -0,0 +1,163 @@
+"""Site configuration snapshots and their structural diff.
+
+`take()` fetches everything describing the configuration of a site
+concurrently. `write()` stores a snapshot as a gzip-compressed, canonical JSON
+archive named after the SHA-256 of its content: an unchanged configuration
+maps to the file already written. `diff()` compares two snapshots
+structurally; list items carrying an id (`id`, `groupId`, `key`) are matched
+by it, so reordering does not show up as a change.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import functools
+import gzip
+import hashlib
+import json
+import pathlib
+import tempfile
+import typing
+
+from . import timeouts
+
+if typing.TYPE_CHECKING:
+    from .omada import Omada
+
+SNAPSHOT_VERSION = 1
+SUFFIX = ".json.gz"
+# Fields identifying list items (first one present in every item wins)
+ID_FIELDS = ("id", "groupId", "key")
+
+# Snapshot section -> `Omada` method fetching it for a site
+SECTIONS = {
+    "settings": "get_site_settings",
+    "groups": "get_site_groups",
+    "time_ranges": "get_time_ranges",
+    "wireless_groups": "get_wireless_groups",
+    "portal_candidates": "get_portal_candidates",
+    "notifications": "get_site_notifications",
+}
+
+
+def _fetch(omada: Omada, method: str, site: str):
+    out = getattr(omada, method)(site)
+    if not isinstance(out, (dict, list)):
+        out = list(out)
+    return out
+
+
+def take(omada: Omada, site: typing.Optional[str] = None, max_workers: int = 8) -> dict:
+    """Fetch the configuration of `site`, all sections concurrently."""
+    if site is None:
+        site = omada.config.site
+    call = functools.partial(timeouts.call_within, omada._call_deadline(), _fetch)
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+        futures = {
+            section: executor.submit(call, omada, method, site)
+            for section, method in SECTIONS.items()
+        }
+        # SSID listings are per WLAN group: fetched once the groups are known
+        ssids = omada.get_all_wireless_networks(
+            site, groups=futures["wireless_groups"].result(), max_workers=max_workers
+        )
+        wireless_networks = {
+            group["id"]: [] for group in futures["wireless_groups"].result()
+        }
+        for ssid in ssids:
+            wireless_networks[ssid["wlanGroupId"]].append(ssid)
+        data = {section: future.result() for section, future in futures.items()}
+        data["wireless_networks"] = wireless_networks
+    return {"version": SNAPSHOT_VERSION, "site": site, "data": data}
+
+
+def _canonical(snapshot: dict) -> bytes:
+    return json.dumps(
+        snapshot, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    ).encode()
+
+
+def digest(snapshot: dict) -> str:
+    return hashlib.sha256(_canonical(snapshot)).hexdigest()
+
+
+def write(snapshot: dict, directory: typing.Union[str, pathlib.Path]) -> pathlib.Path:
+    """Store `snapshot` in `directory` as `<sha256>.json.gz`, returns the path.
+
+    Nothing is written if an identical snapshot is already there.
+    """
+    directory = pathlib.Path(directory)
+    encoded = _canonical(snapshot)
+    out = directory / f"{hashlib.sha256(encoded).hexdigest()}{SUFFIX}"
+    if out.exists():
+        return out
+    directory.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        dir=directory, suffix=".tmp", delete=False
+    ) as fout:
+        # mtime=0: identical snapshots give byte-identical archives
+        with gzip.GzipFile(fileobj=fout, mode="wb", mtime=0) as gz_out:
+            gz_out.write(encoded)
+    pathlib.Path(fout.name).replace(out)
+    return out
+
+
+def load(path: typing.Union[str, pathlib.Path]) -> dict:
+    with gzip.open(path, "rb") as fin:
+        return json.loads(fin.read())
+
+
+class Change(typing.NamedTuple):
+    path: str
+    change: str  # "added", "removed" or "changed"
+    old: typing.Any = None
+    new: typing.Any = None
+
+
+def _id_field(items: list) -> typing.Optional[str]:
+    if not items or not all(isinstance(item, dict) for item in items):
+        return None
+    for field in ID_FIELDS:
+        ids = [item.get(field) for item in items]
+        if None not in ids and len(set(map(str, ids))) == len(ids):
+            return field
+    return None
+
+
+def _list_items(
+    old: list, new: list
+) -> typing.Tuple[typing.Dict[str, typing.Any], typing.Dict[str, typing.Any]]:
+    """Key list items by their id field when both lists share one, by index otherwise."""
+    old_field, new_field = _id_field(old), _id_field(new)
+    field = old_field or new_field
+    if field is None or (old and new and old_field != new_field):
+        return (
+            {f"[{idx}]": item for idx, item in enumerate(old)},
+            {f"[{idx}]": item for idx, item in enumerate(new)},
+        )
+    return (
+        {f"[{field}={item[field]}]": item for item in old},
+        {f"[{field}={item[field]}]": item for item in new},
+    )
+
+
+def diff(old: typing.Any, new: typing.Any, path: str = "") -> typing.Iterator[Change]:
+    """Yield the differences between two snapshots (or any JSON values)."""
+    if isinstance(old, list) and isinstance(new, list):
+        old, new = _list_items(old, new)
+        sep = ""
+    elif isinstance(old, dict) and isinstance(new, dict):
+        sep = "." if path else ""
+    else:
+        if old != new:
+            yield Change(path, "changed", old, new)
+        return
+
+    for key, old_value in old.items():
+        sub_path = f"{path}{sep}{key}"
+        if key not in new:
+            yield Change(sub_path, "removed", old=old_value)
+        else:
+            yield from diff(old_value, new[key], sub_path)
+    for key, new_value in new.items():
+        if key not in old:
+            yield Change(f"{path}{sep}{key}", "added", new=new_value)
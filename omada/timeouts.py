@@ -0,0 +1,76 @@
+"""Request timeouts and deadline budgets.
+
+A `Deadline` is a time budget shared by every request made while it is active:
+all pages of a paginated scan and all retries of every request. Each request
+gets the configured connect/read timeouts, clipped to the remaining budget.
+"""
+import contextlib
+import threading
+import time
+import typing
+
+# (connect, read) in seconds, as understood by `requests`
+Timeout = typing.Tuple[typing.Optional[float], typing.Optional[float]]
+
+_local = threading.local()
+
+
+class Deadline:
+    def __init__(
+        self, seconds: float, clock: typing.Callable[[], float] = time.monotonic
+    ):
+        self.seconds = seconds
+        self.clock = clock
+        self.expires_at = clock() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - self.clock())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def check(self):
+        """Raise `OmadaError` if the budget is spent."""
+        if not self.expired:
+            return
+        from .omada import CustomErrorCodes, OmadaError
+
+        raise OmadaError(
+            {
+                "errorCode": CustomErrorCodes.DeadlineExceeded,
+                "msg": f"Call deadline of {self.seconds}s exceeded",
+            }
+        )
+
+    def clip(self, timeout: Timeout) -> Timeout:
+        """Clip both (connect, read) timeouts to the remaining budget."""
+        remaining = self.remaining()
+        return tuple(
+            remaining if value is None else min(value, remaining) for value in timeout
+        )
+
+
+def current() -> typing.Optional[Deadline]:
+    """Deadline active in the current thread (if any)."""
+    return getattr(_local, "deadline", None)
+
+
+@contextlib.contextmanager
+def activate(deadline: typing.Optional[Deadline]):
+    """Make `deadline` the active one for the current thread (`None` is a no-op)."""
+    if deadline is None:
+        yield None
+        return
+    previous = current()
+    _local.deadline = deadline
+    try:
+        yield deadline
+    finally:
+        _local.deadline = previous
+
+
+def call_within(deadline: typing.Optional[Deadline], fn, *args, **kwargs):
+    """Call `fn` with `deadline` active (worker threads do not inherit it)."""
+    with activate(deadline):
+        return fn(*args, **kwargs)
@@ -0,0 +1,261 @@
+"""Bounded-memory time series of client and device counters.
+
+Every (entity, metric) series is a `RingBuffer`: two `array("d")` columns
+(timestamps and values, 16 bytes per sample) that grow with the samples up
+to a fixed capacity, so a week of 1-minute samples takes at most ~160KiB per
+series no matter how long the sampler runs. `capacity` bounds the history of
+an entity that keeps being seen. `expire_after` drops the series of entities
+not seen for that long, so short-lived clients only take memory for the
+samples they actually have. Counters (`trafficDown`, `download`, ...) are turned
+into rates from consecutive deltas; a decreasing counter is taken as a reset
+(restart from zero). Long windows are downsampled into fixed-width buckets.
+
+>>> sampler = Sampler(omada, interval=60, capacity=7 * 24 * 60)
+>>> threading.Thread(target=sampler.run, daemon=True).start()
+>>> sampler.rates("client", "AA-BB-CC-DD-EE-FF", "trafficDown")[-1]
+"""
+from __future__ import annotations
+
+import array
+import collections
+import math
+import threading
+import time
+import typing
+
+if typing.TYPE_CHECKING:
+    from .omada import Omada
+
+Sample = typing.Tuple[float, float]
+
+# Metrics sampled per entity kind, and which of them are monotonic counters
+CLIENT_METRICS = ("trafficUp", "trafficDown", "activity", "uptime")
+# (device `uptime` is a display string such as "2day(s) 12h 11m 33s")
+DEVICE_METRICS = ("clientNum", "download", "upload", "cpuUtil", "memUtil", "uptimeLong")
+COUNTERS = frozenset(
+    {"trafficUp", "trafficDown", "uptime", "uptimeLong", "download", "upload"}
+)
+# Derived from the client listing: number of clients per AP
+AP_CLIENTS = "clients"
+
+
+class RingBuffer:
+    """The last `capacity` (timestamp, value) samples, oldest first.
+
+    Storage grows with the samples (like a list) until `capacity` is reached,
+    then the oldest sample is overwritten.
+    """
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError(f"Capacity must be positive, got {capacity}")
+        self.capacity = capacity
+        self.times = array.array("d")
+        self.values = array.array("d")
+        # Index of the oldest sample (0 until the buffer is full)
+        self.start = 0
+
+    def __len__(self):
+        return len(self.times)
+
+    def append(self, timestamp: float, value: float):
+        if len(self.times) < self.capacity:
+            self.times.append(timestamp)
+            self.values.append(value)
+            return
+        # Overwrite the oldest sample
+        idx = self.start
+        self.start = (self.start + 1) % self.capacity
+        self.times[idx] = timestamp
+        self.values[idx] = value
+
+    def __iter__(self) -> typing.Iterator[Sample]:
+        size = len(self.times)
+        for offset in range(size):
+            idx = (self.start + offset) % size
+            yield self.times[idx], self.values[idx]
+
+    def last(self) -> typing.Optional[Sample]:
+        if not self.times:
+            return None
+        idx = (self.start - 1) % len(self.times)
+        return self.times[idx], self.values[idx]
+
+    def since(self, timestamp: float) -> typing.List[Sample]:
+        return [sample for sample in self if sample[0] >= timestamp]
+
+
+def counter_rates(samples: typing.Iterable[Sample]) -> typing.List[Sample]:
+    """Per-second rates between consecutive counter samples.
+
+    A decreasing counter was reset: the increase since the reset is its new value.
+    """
+    out = []
+    previous = None
+    for timestamp, value in samples:
+        if previous is not None:
+            prev_time, prev_value = previous
+            elapsed = timestamp - prev_time
+            if elapsed > 0:
+                delta = value - prev_value if value >= prev_value else value
+                out.append((timestamp, delta / elapsed))
+        previous = (timestamp, value)
+    return out
+
+
+def downsample(
+    samples: typing.Iterable[Sample],
+    bucket: float,
+    reduce: typing.Optional[typing.Callable[[typing.List[float]], float]] = None,
+) -> typing.List[Sample]:
+    """Aggregate samples into `bucket`-second buckets (mean by default).
+
+    Returns (bucket start, reduced value) pairs of the non-empty buckets.
+    """
+    if reduce is None:
+        reduce = _mean
+    out = []
+    current = None
+    values: typing.List[float] = []
+    for timestamp, value in samples:
+        start = math.floor(timestamp / bucket) * bucket
+        if start != current:
+            if values:
+                out.append((current, reduce(values)))
+            current, values = start, []
+        values.append(value)
+    if values:
+        out.append((current, reduce(values)))
+    return out
+
+
+def _mean(values: typing.List[float]) -> float:
+    return math.fsum(values) / len(values)
+
+
+SeriesKey = typing.Tuple[str, str, str]  # (kind, mac, metric)
+
+
+class Sampler:
+    """Poll clients and devices of a site into per-entity ring buffers.
+
+    Series of entities not seen for `expire_after` seconds are dropped, so
+    client churn does not grow memory without bound. Every series keeps at
+    most `capacity` samples (storage is allocated as samples arrive).
+    """
+
+    def __init__(
+        self,
+        omada: Omada,
+        site: typing.Optional[str] = None,
+        interval: float = 60.0,
+        capacity: int = 7 * 24 * 60,
+        expire_after: typing.Optional[float] = 24 * 60 * 60,
+        clock: typing.Callable[[], float] = time.time,
+    ):
+        self.omada = omada
+        self.site = site
+        self.interval = interval
+        self.capacity = capacity
+        self.expire_after = expire_after
+        self.clock = clock
+        self.buffers: typing.Dict[SeriesKey, RingBuffer] = {}
+        self.last_seen: typing.Dict[typing.Tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+
+    def _record(self, kind: str, mac: str, metric: str, now: float, value):
+        key = (kind, mac, metric)
+        buffer = self.buffers.get(key)
+        if buffer is None:
+            buffer = self.buffers[key] = RingBuffer(self.capacity)
+        buffer.append(now, float(value))
+
+    def record(self, clients: typing.Iterable[dict], devices: typing.Iterable[dict]):
+        """Store one sample of every entity of the given listings."""
+        # Lazy listings fetch their pages here, not while holding the lock
+        clients, devices = list(clients), list(devices)
+        now = self.clock()
+        ap_clients = collections.Counter()
+        with self._lock:
+            for kind, rows, metrics in (
+                ("client", clients, CLIENT_METRICS),
+                ("device", devices, DEVICE_METRICS),
+            ):
+                for row in rows:
+                    mac = row["mac"]
+                    self.last_seen[(kind, mac)] = now
+                    for metric in metrics:
+                        value = row.get(metric)
+                        if value is not None:
+                            self._record(kind, mac, metric, now, value)
+                    if kind == "client" and row.get("apMac"):
+                        ap_clients[row["apMac"]] += 1
+            for ap_mac, count in ap_clients.items():
+                self.last_seen[("ap", ap_mac)] = now
+                self._record("ap", ap_mac, AP_CLIENTS, now, count)
+            self._expire(now)
+
+    def _expire(self, now: float):
+        if self.expire_after is None:
+            return
+        stale = {
+            entity
+            for entity, seen in self.last_seen.items()
+            if now - seen > self.expire_after
+        }
+        if not stale:
+            return
+        for entity in stale:
+            del self.last_seen[entity]
+        self.buffers = {
+            key: buffer for key, buffer in self.buffers.items() if key[:2] not in stale
+        }
+
+    def sample(self):
+        """Poll the controller once."""
+        clients = self.omada.get_site_clients(site=self.site)
+        devices = self.omada.get_site_devices(site=self.site)
+        self.record(clients, devices)
+
+    def run(self, stop: typing.Optional[threading.Event] = None):
+        """Sample every `interval` seconds until `stop` is set."""
+        if stop is None:
+            stop = threading.Event()
+        while not stop.is_set():
+            started = time.monotonic()
+            self.sample()
+            stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def series(
+        self,
+        kind: str,
+        mac: str,
+        metric: str,
+        since: typing.Optional[float] = None,
+        bucket: typing.Optional[float] = None,
+    ) -> typing.List[Sample]:
+        """Samples of a metric (from `since`), `downsample`d to `bucket` seconds."""
+        with self._lock:
+            buffer = self.buffers.get((kind, mac, metric))
+            if buffer is None:
+                return []
+            out = list(buffer) if since is None else buffer.since(since)
+        if bucket is not None:
+            out = downsample(out, bucket)
+        return out
+
+    def rates(
+        self,
+        kind: str,
+        mac: str,
+        metric: str,
+        since: typing.Optional[float] = None,
+        bucket: typing.Optional[float] = None,
+    ) -> typing.List[Sample]:
+        """Per-second rates of a counter metric, averaged over `bucket` seconds."""
+        if metric not in COUNTERS:
+            raise ValueError(f"{metric!r} is not a counter")
+        out = counter_rates(self.series(kind, mac, metric, since=since))
+        if bucket is not None:
+            out = downsample(out, bucket)
+        return out
@@ -0,0 +1,193 @@
+"""Network topology of a site: gateway -> switches (ports) -> APs -> clients.
+
+`Topology.build()` joins the device and client listings in a single pass
+each and precomputes the answers to the common queries (clients behind a
+device, clients on a switch port, per-AP load), so queries do not loop over
+the full lists.
+
+Clients are attached using `connectDevType` and the matching `apMac`/`apName`,
+`switchMac`/`switchName` (+ `port`) or `gatewayMac` fields. Devices are
+attached to their `uplinkDeviceMac` when the controller reports it and to the
+gateway otherwise.
+"""
+from __future__ import annotations
+
+import collections
+import dataclasses
+import typing
+
+from .inventory import normalize_mac
+
+if typing.TYPE_CHECKING:
+    from .omada import Omada
+
+GATEWAY = "gateway"
+SWITCH = "switch"
+AP = "ap"
+CLIENT = "client"
+
+
+@dataclasses.dataclass
+class ApLoad:
+    clients: int = 0
+    traffic_up: int = 0
+    traffic_down: int = 0
+
+
+@dataclasses.dataclass
+class Topology:
+    # mac -> device/client row
+    nodes: typing.Dict[str, dict] = dataclasses.field(default_factory=dict)
+    # mac -> GATEWAY/SWITCH/AP/CLIENT
+    kinds: typing.Dict[str, str] = dataclasses.field(default_factory=dict)
+    # mac -> uplink mac (None for the root)
+    parent: typing.Dict[str, typing.Optional[str]] = dataclasses.field(
+        default_factory=dict
+    )
+    children: typing.DefaultDict[str, typing.List[str]] = dataclasses.field(
+        default_factory=lambda: collections.defaultdict(list)
+    )
+    # client mac -> switch port it is plugged into
+    ports: typing.Dict[str, int] = dataclasses.field(default_factory=dict)
+    # (switch mac, port) -> client macs
+    port_clients: typing.DefaultDict[
+        typing.Tuple[str, int], typing.List[str]
+    ] = dataclasses.field(default_factory=lambda: collections.defaultdict(list))
+    # device mac -> macs of all clients in its subtree
+    clients_below: typing.Dict[str, typing.List[str]] = dataclasses.field(
+        default_factory=dict
+    )
+    ap_load: typing.Dict[str, ApLoad] = dataclasses.field(default_factory=dict)
+    gateway: typing.Optional[str] = None
+    _names: typing.Dict[str, str] = dataclasses.field(default_factory=dict)
+
+    @classmethod
+    def build(
+        cls, devices: typing.Iterable[dict], clients: typing.Iterable[dict]
+    ) -> Topology:
+        out = cls()
+        out._add_devices(list(devices))
+        for client in clients:
+            out._add_client(client)
+        out._collect_clients_below()
+        return out
+
+    def _add_devices(self, devices: typing.List[dict]):
+        for device in devices:
+            mac = normalize_mac(device["mac"])
+            self.nodes[mac] = device
+            self.kinds[mac] = device.get("type", SWITCH)
+            if device.get("name"):
+                self._names[device["name"]] = mac
+            if self.kinds[mac] == GATEWAY and self.gateway is None:
+                self.gateway = mac
+            if self.kinds[mac] == AP:
+                self.ap_load[mac] = ApLoad()
+
+        for device in devices:
+            mac = normalize_mac(device["mac"])
+            uplink = device.get("uplinkDeviceMac")
+            uplink = normalize_mac(uplink) if uplink else None
+            if uplink not in self.nodes:
+                uplink = None if mac == self.gateway else self.gateway
+            self._link(mac, uplink)
+
+    def _add_client(self, client: dict):
+        mac = normalize_mac(client["mac"])
+        self.nodes[mac] = client
+        self.kinds[mac] = CLIENT
+        uplink = self._client_uplink(client)
+        self._link(mac, uplink)
+        if uplink is None:
+            return
+        if self.kinds[uplink] == SWITCH and client.get("port") is not None:
+            self.ports[mac] = client["port"]
+            self.port_clients[(uplink, client["port"])].append(mac)
+        load = self.ap_load.get(uplink)
+        if load is not None:
+            load.clients += 1
+            load.traffic_up += client.get("trafficUp") or 0
+            load.traffic_down += client.get("trafficDown") or 0
+
+    @classmethod
+    def from_omada(cls, omada: Omada, site: typing.Optional[str] = None) -> Topology:
+        return cls.build(
+            omada.get_site_devices(site=site), omada.get_site_clients(site=site)
+        )
+
+    def _link(self, mac: str, uplink: typing.Optional[str]):
+        self.parent[mac] = uplink
+        if uplink is not None:
+            self.children[uplink].append(mac)
+
+    def _client_uplink(self, client: dict) -> typing.Optional[str]:
+        prefix = {GATEWAY: "gateway", SWITCH: "switch", AP: "ap"}.get(
+            client.get("connectDevType")
+        )
+        if prefix is None:
+            return None
+        for value in (client.get(f"{prefix}Mac"), client.get(f"{prefix}Name")):
+            if value:
+                mac = self.resolve(value)
+                if mac is not None and self.kinds[mac] != CLIENT:
+                    return mac
+        return None
+
+    def _collect_clients_below(self):
+        # Post-order walk from every root (tolerates uplink cycles)
+        visited = set()
+        for root in [mac for mac, up in self.parent.items() if up is None]:
+            stack = [(root, False)]
+            while stack:
+                mac, expanded = stack.pop()
+                if self.kinds[mac] == CLIENT:
+                    continue
+                if expanded:
+                    below = self.clients_below[mac] = []
+                    for child in self.children.get(mac, ()):
+                        if self.kinds[child] == CLIENT:
+                            below.append(child)
+                        else:
+                            below.extend(self.clients_below.get(child, ()))
+                elif mac not in visited:
+                    visited.add(mac)
+                    stack.append((mac, True))
+                    stack.extend((child, False) for child in self.children.get(mac, ()))
+
+    def resolve(self, name_or_mac: str) -> typing.Optional[str]:
+        """MAC of the node given its MAC (any notation) or device name."""
+        mac = self._names.get(name_or_mac)
+        if mac is not None:
+            return mac
+        mac = normalize_mac(name_or_mac)
+        return mac if mac in self.nodes else None
+
+    def _require(self, name_or_mac: str) -> str:
+        mac = self.resolve(name_or_mac)
+        if mac is None:
+            raise KeyError(f"Unknown device or client {name_or_mac!r}")
+        return mac
+
+    def clients_behind(self, device: str) -> typing.List[dict]:
+        """All clients connected (directly or not) through `device` (name or MAC)."""
+        return [
+            self.nodes[mac] for mac in self.clients_below.get(self._require(device), ())
+        ]
+
+    def clients_on_port(self, switch: str, port: int) -> typing.List[dict]:
+        return [
+            self.nodes[mac]
+            for mac in self.port_clients.get((self._require(switch), port), ())
+        ]
+
+    def uplink_path(self, node: str) -> typing.List[dict]:
+        """Rows from `node` (excluded) up to the gateway."""
+        out = []
+        mac = self._require(node)
+        seen = {mac}
+        mac = self.parent[mac]
+        while mac is not None and mac not in seen:
+            seen.add(mac)
+            out.append(self.nodes[mac])
+            mac = self.parent[mac]
+        return out
@@ -0,0 +1,275 @@
+"""HTTP transports used by `Omada`.
+
+* `RequestsTransport` - `requests.Session` based (the default).
+* `Http2Transport` - `httpx` client with HTTP/2 enabled: concurrent requests
+  (e.g. pages of a backfill) are multiplexed over a single connection.
+  Requires the `http2` extra (`pip install omada-api[http2]`).
+* `MemoryTransport` - serves canned responses from memory, for tests.
+
+Responses returned by `Transport.request()` provide `status_code`, `text`,
+`json()` and `raise_for_status()` (the subset of the `requests` API `Omada` uses).
+"""
+import abc
+import json as jsonlib
+import threading
+import typing
+import weakref
+
+import yarl
+
+from . import timeouts
+
+
+class TransportError(Exception):
+    """The request failed before a response was received."""
+
+
+class ConnectError(TransportError):
+    """The connection could not be established (the request was not sent)."""
+
+
+class HTTPStatusError(TransportError):
+    """Raised by `raise_for_status()` of non-requests responses."""
+
+    def __init__(self, msg: str, response):
+        super().__init__(msg)
+        self.response = response
+
+
+class Transport(abc.ABC):
+    """Interface of an HTTP transport."""
+
+    @abc.abstractmethod
+    def request(
+        self,
+        method: str,
+        url: typing.Union[str, yarl.URL],
+        params: typing.Optional[dict] = None,
+        json: typing.Any = None,
+        data: typing.Any = None,
+        timeout: typing.Optional[timeouts.Timeout] = None,
+    ):
+        """Send a request, returns the response."""
+
+    @abc.abstractmethod
+    def set_header(self, name: str, value: str):
+        """Set a header sent with every subsequent request."""
+
+    def close(self):  # noqa: B027 - optional, nothing to release by default
+        pass
+
+
+class RequestsTransport(Transport):
+    """`requests.Session` transport.
+
+    `requests.Session` is not thread-safe: with `session_per_thread` (the
+    default) every thread lazily gets its own session. All of them share the cookie jar and
+    the headers set through `set_header()`, i.e. one login.
+    """
+
+    def __init__(self, verify: bool = True, session_per_thread: bool = True):
+        from requests.cookies import RequestsCookieJar
+
+        self.verify = verify
+        self.session_per_thread = session_per_thread
+        # `http.cookiejar.CookieJar` is thread-safe
+        self.cookies = RequestsCookieJar()
+        self.headers: typing.Dict[str, str] = {}
+        # Sessions of finished threads are dropped with their thread-locals
+        self.sessions = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._shared_session = None if session_per_thread else self._new_session()
+
+    def _new_session(self):
+        import requests
+
+        out = requests.Session()
+        out.verify = self.verify
+        out.cookies = self.cookies
+        with self._lock:
+            out.headers.update(self.headers)
+            self.sessions.add(out)
+        return out
+
+    @property
+    def session(self):
+        """The session used by the current thread."""
+        if self._shared_session is not None:
+            return self._shared_session
+        out = getattr(self._local, "session", None)
+        if out is None:
+            out = self._local.session = self._new_session()
+        return out
+
+    def request(self, method, url, params=None, json=None, data=None, timeout=None):
+        return self.session.request(
+            method, str(url), params=params, json=json, data=data, timeout=timeout
+        )
+
+    def set_header(self, name: str, value: str):
+        with self._lock:
+            self.headers[name] = value
+            for session in self.sessions:
+                session.headers[name] = value
+
+    def close(self):
+        with self._lock:
+            sessions, self.sessions = list(self.sessions), weakref.WeakSet()
+        for session in sessions:
+            session.close()
+
+
+class Http2Transport(Transport):
+    def __init__(self, verify: bool = True, max_connections: int = 10):
+        try:
+            import httpx
+        except ImportError as err:
+            raise ImportError(
+                "Http2Transport requires httpx with HTTP/2 support: "
+                "pip install 'omada-api[http2]'"
+            ) from err
+
+        self._httpx = httpx
+        # httpx clients are thread-safe, concurrent requests share the connection
+        self.client = httpx.Client(
+            http2=True,
+            verify=verify,
+            limits=httpx.Limits(max_connections=max_connections),
+        )
+
+    def request(self, method, url, params=None, json=None, data=None, timeout=None):
+        httpx = self._httpx
+        if timeout is None:
+            timeout = (None, None)
+        connect_timeout, read_timeout = timeout
+        try:
+            response = self.client.request(
+                method,
+                str(url),
+                params=params,
+                json=json,
+                data=data,
+                timeout=httpx.Timeout(
+                    read_timeout, connect=connect_timeout, pool=connect_timeout
+                ),
+            )
+        except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as err:
+            raise ConnectError(str(err)) from err
+        except httpx.TransportError as err:
+            raise TransportError(str(err)) from err
+        return _Http2Response(response)
+
+    def set_header(self, name: str, value: str):
+        self.client.headers[name] = value
+
+    def close(self):
+        self.client.close()
+
+
+class _Http2Response:
+    def __init__(self, response):
+        self._response = response
+        self.status_code = response.status_code
+
+    @property
+    def text(self) -> str:
+        return self._response.text
+
+    def json(self):
+        return self._response.json()
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise HTTPStatusError(
+                f"{self.status_code} error for url: {self._response.url}", self
+            )
+
+    def __repr__(self):
+        return f"<Response [{self.status_code}]>"
+
+
+class MemoryRequest(typing.NamedTuple):
+    method: str
+    url: yarl.URL
+    params: dict
+    json: typing.Any
+    data: typing.Any
+    headers: dict
+    timeout: typing.Optional[timeouts.Timeout]
+
+
+class MemoryResponse:
+    def __init__(self, status_code: int = 200, text: str = ""):
+        self.status_code = status_code
+        self.text = text
+
+    @classmethod
+    def from_json(cls, payload: typing.Any, status_code: int = 200):
+        return cls(status_code, jsonlib.dumps(payload))
+
+    def json(self):
+        return jsonlib.loads(self.text)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise HTTPStatusError(f"{self.status_code} error", self)
+
+    def __repr__(self):
+        return f"<MemoryResponse [{self.status_code}]>"
+
+
+Handler = typing.Callable[[MemoryRequest], typing.Any]
+
+
+class MemoryTransport(Transport):
+    """Answer requests from registered routes without any network I/O.
+
+    Routes are keyed by method and URL path; a route is either a fixed
+    `MemoryResponse` / JSON payload or a callable receiving the `MemoryRequest`
+    and returning one. Unrouted requests fail with `ConnectError`.
+    """
+
+    def __init__(self):
+        self.routes: typing.Dict[typing.Tuple[str, str], Handler] = {}
+        self.headers: typing.Dict[str, str] = {}
+        self.requests: typing.List[MemoryRequest] = []
+        self._lock = threading.Lock()
+
+    def add(
+        self,
+        method: str,
+        path: typing.Union[str, yarl.URL],
+        response: typing.Union[MemoryResponse, Handler, typing.Any],
+    ):
+        path = yarl.URL(str(path)).path
+        if callable(response):
+            handler = response
+        else:
+            handler = lambda request: response  # noqa: E731
+        self.routes[(method.upper(), path)] = handler
+
+    def request(self, method, url, params=None, json=None, data=None, timeout=None):
+        url = yarl.URL(str(url))
+        request = MemoryRequest(
+            method=method.upper(),
+            url=url,
+            params=dict(params or {}),
+            json=json,
+            data=data,
+            headers=dict(self.headers),
+            timeout=timeout,
+        )
+        with self._lock:
+            self.requests.append(request)
+        try:
+            handler = self.routes[(request.method, url.path)]
+        except KeyError:
+            raise ConnectError(f"No route for {request.method} {url.path}") from None
+        out = handler(request)
+        if not isinstance(out, MemoryResponse):
+            out = MemoryResponse.from_json(out)
+        return out
+
+    def set_header(self, name: str, value: str):
+        self.headers[name] = value
@@ -0,0 +1,79 @@
+"""Control how API responses are turned into `api_bindings` models.
+
+* `ValidationMode.Full` - full pydantic validation of every object (the default).
+* `ValidationMode.Sampled` - validate the first and then every Nth object of each
+  model type, construct the rest without validation.
+* `ValidationMode.Off` - never validate, only construct (nested models included).
+"""
+import collections
+import enum
+import itertools
+import typing
+
+ModelT = typing.TypeVar("ModelT")
+
+
+@enum.unique
+class ValidationMode(str, enum.Enum):
+    Full = "full"
+    Sampled = "sampled"
+    Off = "off"
+
+
+def construct(model_cls: typing.Type[ModelT], data: dict) -> ModelT:
+    """Build `model_cls` from trusted `data` without validation.
+
+    Unlike `BaseModel.construct()` this recurses into nested models (and lists of
+    them), so attribute access works the same way as on a validated model.
+    """
+    from pydantic.fields import SHAPE_LIST, SHAPE_SEQUENCE, SHAPE_SINGLETON
+
+    values = dict(data)
+    for field in model_cls.__fields__.values():
+        sub_cls = field.type_
+        if field.alias not in values or not hasattr(sub_cls, "__fields__"):
+            continue
+        value = values.pop(field.alias)
+        if field.shape == SHAPE_SINGLETON and isinstance(value, dict):
+            value = construct(sub_cls, value)
+        elif field.shape in (SHAPE_LIST, SHAPE_SEQUENCE) and value is not None:
+            value = [
+                construct(sub_cls, el) if isinstance(el, dict) else el for el in value
+            ]
+        values[field.name] = value
+    return model_cls.construct(**values)
+
+
+class ModelValidator:
+    """Parse response dicts into models according to a `ValidationMode`."""
+
+    def __init__(
+        self,
+        mode: ValidationMode = ValidationMode.Full,
+        sample_every: int = 100,
+    ):
+        if sample_every < 1:
+            raise ValueError(f"sample_every must be positive, got {sample_every!r}")
+        self.mode = ValidationMode(mode)
+        self.sample_every = sample_every
+        # per-model call counters (`next()` on itertools.count is thread-safe)
+        self._counters = collections.defaultdict(itertools.count)
+
+    def should_validate(self, model_cls: type) -> bool:
+        if self.mode is ValidationMode.Full:
+            return True
+        elif self.mode is ValidationMode.Off:
+            return False
+        return next(self._counters[model_cls]) % self.sample_every == 0
+
+    def __call__(self, model_cls: typing.Type[ModelT], data: dict) -> ModelT:
+        if self.should_validate(model_cls):
+            return model_cls(**data)
+        return construct(model_cls, data)
+
+    def parse_rows(
+        self, model_cls: typing.Type[ModelT], rows: typing.Iterable[dict]
+    ) -> typing.Generator[ModelT, None, None]:
+        """Lazily parse listing rows (e.g. `_geterator` output) into models."""
+        for row in rows:
+            yield self(model_cls, row)
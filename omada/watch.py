@@ -0,0 +1,318 @@
+"""Watch resources for changes, one shared poll per (resource, site).
+
+Callers subscribe a callback to a resource of a site; overlapping
+subscriptions share a single poll. Every poll adapts its interval to how often
+the resource actually changes: it halves on every change and grows by
+`backoff` while the data stays the same, within `[min_interval, max_interval]`.
+
+Counters that move on every poll (traffic, uptime, signal, ...) are left out
+when comparing client and device listings, so only a real change (a client
+roaming, a device going offline) counts. Alerts and events are append-only
+and polled incrementally: the first poll reads the newest page, later ones
+only the rows since the newest one seen; subscribers get the new rows.
+
+>>> scheduler = WatchScheduler(omada)
+>>> scheduler.subscribe("clients", print, site="Office")
+>>> scheduler.run()
+"""
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import heapq
+import json
+import logging
+import threading
+import time
+import typing
+
+if typing.TYPE_CHECKING:
+    from .omada import Omada
+
+logger = logging.getLogger(__name__)
+
+# Resource name -> `Omada` method fetching it for a site
+RESOURCES = {
+    "clients": "get_site_clients",
+    "devices": "get_site_devices",
+    "alerts": "get_site_alerts",
+    "events": "get_site_events",
+    "settings": "get_site_settings",
+}
+
+# Append-only resources, polled for new rows only
+INCREMENTAL = frozenset({"alerts", "events"})
+
+# Fields changing on (nearly) every poll, ignored when looking for changes
+VOLATILE_FIELDS = {
+    "clients": frozenset(
+        {
+            "activity",
+            "downPacket",
+            "healthScore",
+            "lastSeen",
+            "rssi",
+            "rxRate",
+            "signalLevel",
+            "signalRank",
+            "trafficDown",
+            "trafficUp",
+            "txRate",
+            "upPacket",
+            "uptime",
+        }
+    ),
+    "devices": frozenset(
+        {
+            "cpuUtil",
+            "download",
+            "dueTimeLeft",
+            "lastSeen",
+            "memUtil",
+            "rxRate",
+            "txRate",
+            "upload",
+            "uptime",
+            "uptimeLong",
+            # Per-radio utilisation
+            "wp2g",
+            "wp5g",
+            "wp5g2",
+            "wp6g",
+        }
+    ),
+}
+
+# callback(resource, site, data)
+Callback = typing.Callable[[str, str, typing.Any], None]
+PollKey = typing.Tuple[str, str]
+
+
+def fingerprint(data: typing.Any) -> bytes:
+    """Digest of the JSON-able `data` (independent of dict key order)."""
+    encoded = json.dumps(data, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.blake2b(encoded, digest_size=16).digest()
+
+
+def projection(resource: str, data: typing.Any) -> typing.Any:
+    """`data` without the volatile fields of `resource` rows."""
+    volatile = VOLATILE_FIELDS.get(resource)
+    if not volatile or not isinstance(data, list):
+        return data
+    return [
+        {key: value for key, value in row.items() if key not in volatile}
+        if isinstance(row, dict)
+        else row
+        for row in data
+    ]
+
+
+@dataclasses.dataclass(eq=False)
+class Subscription:
+    scheduler: WatchScheduler
+    key: PollKey
+    callback: Callback
+
+    @property
+    def resource(self) -> str:
+        return self.key[0]
+
+    @property
+    def site(self) -> str:
+        return self.key[1]
+
+    def cancel(self):
+        self.scheduler.unsubscribe(self)
+
+
+@dataclasses.dataclass(eq=False)
+class _Poll:
+    key: PollKey
+    interval: float
+    due: float
+    subscribers: typing.List[Subscription] = dataclasses.field(default_factory=list)
+    fingerprint: typing.Optional[bytes] = None
+    data: typing.Any = None
+    polls: int = 0
+    changes: int = 0
+    # Incremental polls: time (ms) of the newest row seen and the ids of the
+    # rows seen at that time (the next poll starts from it, inclusive)
+    since: typing.Optional[int] = None
+    seen: typing.FrozenSet[str] = frozenset()
+
+
+class WatchScheduler:
+    def __init__(
+        self,
+        omada: Omada,
+        initial_interval: float = 30.0,
+        min_interval: float = 5.0,
+        max_interval: float = 300.0,
+        backoff: float = 1.5,
+        clock: typing.Callable[[], float] = time.monotonic,
+    ):
+        self.omada = omada
+        self.initial_interval = initial_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.clock = clock
+        self.polls: typing.Dict[PollKey, _Poll] = {}
+        self._heap: typing.List[typing.Tuple[float, int, PollKey]] = []
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+
+    def _schedule(self, poll: _Poll, due: float):
+        poll.due = due
+        self._seq += 1
+        heapq.heappush(self._heap, (due, self._seq, poll.key))
+
+    def subscribe(
+        self, resource: str, callback: Callback, site: typing.Optional[str] = None
+    ) -> Subscription:
+        """Call `callback(resource, site, data)` whenever the resource changes.
+
+        The first poll of a resource always calls back. A subscription joining
+        an existing poll is called back with the last data straight away.
+        """
+        if resource not in RESOURCES:
+            raise ValueError(
+                f"Unknown resource {resource!r}, expected one of {sorted(RESOURCES)}"
+            )
+        key = (resource, site or self.omada.config.site)
+        out = Subscription(self, key, callback)
+        with self._lock:
+            poll = self.polls.get(key)
+            if poll is None:
+                poll = self.polls[key] = _Poll(key, self.initial_interval, 0.0)
+                self._schedule(poll, self.clock())
+            poll.subscribers.append(out)
+            replay = poll.fingerprint is not None
+            data = poll.data
+        self._wakeup.set()
+        if replay:
+            callback(resource, key[1], data)
+        return out
+
+    def unsubscribe(self, subscription: Subscription):
+        """Stop the subscription (the poll stops with its last subscriber)."""
+        with self._lock:
+            poll = self.polls.get(subscription.key)
+            if poll is None or subscription not in poll.subscribers:
+                return
+            poll.subscribers.remove(subscription)
+            if not poll.subscribers:
+                # Its heap entries are skipped from now on
+                del self.polls[subscription.key]
+
+    def _fetch(self, poll: _Poll):
+        resource, site = poll.key
+        method = getattr(self.omada, RESOURCES[resource])
+        if resource in INCREMENTAL:
+            return self._fetch_new_rows(poll, method, site)
+        out = method(site=site)
+        if not isinstance(out, (dict, list)):
+            out = list(out)
+        return out
+
+    def _fetch_new_rows(self, poll: _Poll, method, site: str) -> typing.List[dict]:
+        """Rows added since the last poll (the newest page on the first one)."""
+        if poll.since is None:
+            listing = method(site=site, sort_by="time", sort_order="desc")
+            page = next(listing.pages(), None)
+            rows = page.rows if page is not None else []
+        else:
+            rows = [
+                row
+                for row in method(site=site, time_start=poll.since)
+                if row.get("id") not in poll.seen
+            ]
+        if rows:
+            newest = max(row["time"] for row in rows)
+            seen = poll.seen if newest == poll.since else frozenset()
+            poll.seen = seen | {row.get("id") for row in rows if row["time"] == newest}
+            poll.since = newest
+        return rows
+
+    def _pop_due(self, now: float) -> typing.Optional[_Poll]:
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                due, _, key = heapq.heappop(self._heap)
+                poll = self.polls.get(key)
+                if poll is not None and poll.due == due:
+                    return poll
+        return None
+
+    def poll(self, poll: _Poll):
+        """Fetch the resource, notify subscribers on change and reschedule."""
+        resource, site = poll.key
+        try:
+            data = self._fetch(poll)
+        except Exception:
+            logger.exception(f"Polling {resource} of {site!r} failed")
+            changed = False
+        else:
+            if resource in INCREMENTAL:
+                # Only new rows are fetched (the first poll always calls back)
+                digest = fingerprint(data)
+                changed = bool(data) or poll.fingerprint is None
+            else:
+                digest = fingerprint(projection(resource, data))
+                changed = digest != poll.fingerprint
+            poll.polls += 1
+            if changed:
+                poll.changes += 1
+                poll.fingerprint = digest
+                poll.data = data
+                with self._lock:
+                    subscribers = list(poll.subscribers)
+                for subscription in subscribers:
+                    try:
+                        subscription.callback(resource, site, data)
+                    except Exception:
+                        logger.exception(f"Watch callback for {resource} failed")
+
+        if changed:
+            poll.interval = max(self.min_interval, poll.interval / 2)
+        else:
+            poll.interval = min(self.max_interval, poll.interval * self.backoff)
+        with self._lock:
+            if self.polls.get(poll.key) is poll:
+                self._schedule(poll, self.clock() + poll.interval)
+
+    def run_pending(self) -> int:
+        """Run every poll that is due now, returns the number of polls run."""
+        out = 0
+        now = self.clock()
+        while True:
+            poll = self._pop_due(now)
+            if poll is None:
+                return out
+            self.poll(poll)
+            out += 1
+
+    def next_due(self) -> typing.Optional[float]:
+        """Clock time of the next poll (`None` without subscriptions)."""
+        with self._lock:
+            while self._heap:
+                due, _, key = self._heap[0]
+                poll = self.polls.get(key)
+                if poll is not None and poll.due == due:
+                    return due
+                heapq.heappop(self._heap)
+        return None
+
+    def run(self, stop: typing.Optional[threading.Event] = None):
+        """Poll until `stop` is set (sleeps between polls, wakes up on subscribe)."""
+        if stop is None:
+            stop = threading.Event()
+        while not stop.is_set():
+            self.run_pending()
+            if stop.is_set():
+                return
+            self._wakeup.clear()
+            due = self.next_due()
+            timeout = 1.0 if due is None else max(0.0, min(1.0, due - self.clock()))
+            # Checks `stop` at least every second, wakes up early on a new subscription
+            self._wakeup.wait(timeout)
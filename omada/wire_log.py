@@ -0,0 +1,90 @@
+"""Debug logging of controller responses ("wire log").
+
+Nothing is formatted unless the `omada.wire` logger is enabled for DEBUG.
+Logged bodies are truncated to `max_body` characters (only that prefix is
+decoded), 1 in `sample_every` responses is logged and the values of
+`redact_keys` (tokens, passwords) are masked in both the URL and the body.
+
+>>> logging.getLogger("omada.wire").setLevel(logging.DEBUG)
+"""
+import dataclasses
+import itertools
+import logging
+import re
+import typing
+
+logger = logging.getLogger("omada.wire")
+
+REDACTED = "***"
+
+
+@dataclasses.dataclass(frozen=True)
+class WireLogConfig:
+    max_body: int = 2048
+    sample_every: int = 1
+    redact_keys: typing.FrozenSet[str] = frozenset({"token", "password"})
+
+    def __post_init__(self):
+        if self.sample_every < 1:
+            raise ValueError(
+                f"sample_every must be positive, got {self.sample_every!r}"
+            )
+
+
+DEFAULT = WireLogConfig()
+
+
+def redaction_pattern(keys: typing.Iterable[str]) -> re.Pattern:
+    """Match `"key": "value"` (JSON) and `key=value` (query string) pairs."""
+    names = "|".join(re.escape(key) for key in sorted(keys))
+    return re.compile(
+        rf"""(?P<key>["']?\b(?:{names})\b["']?\s*[:=]\s*["']?)(?P<value>[^"'&,\s}}]+)""",
+        re.IGNORECASE,
+    )
+
+
+class WireLogger:
+    def __init__(
+        self,
+        config: WireLogConfig = DEFAULT,
+        log: logging.Logger = logger,
+    ):
+        self.config = config
+        self.log = log
+        self._redact_re = redaction_pattern(config.redact_keys)
+        # `next()` on itertools.count is thread-safe
+        self._counter = itertools.count()
+
+    def redact(self, text: str) -> str:
+        return self._redact_re.sub(rf"\g<key>{REDACTED}", text)
+
+    def _body_prefix(self, response) -> str:
+        max_body = self.config.max_body
+        content = getattr(response, "content", None)
+        if isinstance(content, bytes):
+            prefix = content[:max_body].decode("utf-8", errors="replace")
+            total = len(content)
+        else:
+            text = response.text
+            prefix = text[:max_body]
+            total = len(text)
+        if total > max_body:
+            prefix += f"... [{total} bytes]"
+        return prefix
+
+    def log_response(self, response):
+        """Log `response` if enabled and sampled (cheap no-op otherwise)."""
+        if not self.log.isEnabledFor(logging.DEBUG):
+            return
+        if next(self._counter) % self.config.sample_every:
+            return
+        request = getattr(response, "request", None)
+        method = getattr(request, "method", None) or "-"
+        url = str(getattr(response, "url", None) or "-")
+        self.log.debug(
+            "%s %s -> %s %s",
+            method,
+            self.redact(url),
+            response.status_code,
+            self.redact(self._body_prefix(response)),
+        )
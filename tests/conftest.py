@@ -8,6 +8,20 @@ import yarl
 import omada
 
 
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Manually advanced clock (`clock.now += seconds`)."""
+    return FakeClock()
+
+
 @pytest.fixture
 def resources_dir():
     return pathlib.Path(__file__).parent.resolve() / "resources"
@@ -0,0 +1,123 @@
+import array
+import json
+import math
+
+import pytest
+
+from omada import aggregate
+
+
+@pytest.fixture
+def client_pages(resources_dir):
+    with (resources_dir / "get_site_clients.json").open() as fin:
+        return [page["result"]["data"] for page in json.load(fin)]
+
+
+@pytest.fixture(params=["python", "numpy"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(aggregate, "_numpy", lambda: None)
+    return request.param
+
+
+@pytest.mark.parametrize(
+    "values, pct, expected",
+    [
+        ([1, 2, 3, 4], 50, 2.5),
+        ([1, 2, 3, 4], 100, 4),
+        ([1, 2, 3, 4], 0, 1),
+        ([10], 95, 10),
+        ([0, 10], 95, 9.5),
+    ],
+)
+def test_percentile(values, pct, expected):
+    assert aggregate.percentile(values, pct) == pytest.approx(expected)
+
+
+def test_column_stats(backend):
+    stats = aggregate.column_stats(
+        array.array("d", [4, 1, 3, 2]), percentiles=(50, 100)
+    )
+    assert stats.count == 4
+    assert stats.sum == 10
+    assert stats.mean == 2.5
+    assert stats.percentiles == {50.0: 2.5, 100.0: 4.0}
+    empty = aggregate.column_stats(array.array("d"))
+    assert empty.count == 0 and math.isnan(empty.mean)
+
+
+def test_streaming_aggregation(backend, client_pages):
+    rows = [row for page in client_pages for row in page]
+    agg = aggregate.ClientAggregator()
+    for page in client_pages:
+        agg.add(page, site="Office")
+    assert agg.rows == len(rows)
+
+    by_ap = agg.summary("ap", percentiles=(50, 100))
+    ap_names = {row["apName"] for row in rows if row.get("apName")}
+    assert set(by_ap) == ap_names
+    for ap_name in ap_names:
+        ap_rows = [row for row in rows if row.get("apName") == ap_name]
+        stats = by_ap[ap_name]["trafficDown"]
+        assert stats.count == len(ap_rows)
+        assert stats.sum == sum(row["trafficDown"] for row in ap_rows)
+        assert stats.percentiles[100] == max(row["trafficDown"] for row in ap_rows)
+
+    (site_stats,) = agg.summary("site").values()
+    assert site_stats["activity"].count == len(rows)
+    # Wired clients of the fixture are on the gateway, not on a switch port
+    assert agg.summary("switch_port") == {}
+
+
+def test_add_pages(
+    active_omada, configure_paginated_get, default_api_v2, resources_dir
+):
+    configure_paginated_get(
+        default_api_v2 / "sites" / "0bf476c155ea24942722c5a8b516adfe" / "clients",
+        resources_dir / "get_site_clients.json",
+    )
+    agg = aggregate.ClientAggregator(dimensions=["ssid"], metrics=["trafficUp"])
+    agg.add_pages(active_omada.get_site_clients().pages())
+    assert agg.rows == 32
+    assert sum(stats["trafficUp"].count for stats in agg.summary("ssid").values()) == 26
+
+
+def test_batch_grouping(backend):
+    rows = [
+        {"ssid": "A", "trafficDown": 1},
+        {"trafficDown": 2},
+        {"ssid": "B", "trafficDown": 3},
+        {"ssid": "A", "trafficDown": 4, "trafficUp": 5},
+    ]
+    agg = aggregate.ClientAggregator(dimensions=["ssid"])
+    agg.add(iter(rows))
+    agg.add([])
+    assert agg.rows == 4
+    # Rows without a key are not grouped, values keep the row order
+    columns = {
+        key: [list(column) for column in group]
+        for key, group in agg.groups["ssid"].items()
+    }
+    assert columns == {
+        "A": [[0.0, 5.0], [1.0, 4.0], [0.0, 0.0]],
+        "B": [[0.0], [3.0], [0.0]],
+    }
+
+
+def test_site_dimension_default(backend):
+    rows = [
+        {"siteName": "Office", "trafficDown": 1},
+        {"siteName": "Home", "trafficDown": 2},
+        {"trafficDown": 3},
+    ]
+    agg = aggregate.ClientAggregator(dimensions=["site"], metrics=["trafficDown"])
+    agg.add(rows)
+    assert {key: list(columns[0]) for key, columns in agg.groups["site"].items()} == {
+        "Office": [1.0],
+        "Home": [2.0],
+    }
+    # An explicit site wins over the rows' field
+    agg.add(rows, site="Lab")
+    assert agg.summary("site")["Lab"]["trafficDown"].count == 3
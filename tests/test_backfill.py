@@ -0,0 +1,131 @@
+import json
+
+import pytest
+
+from omada import backfill
+
+# One event every 10ms, listed newest first like the controller does
+EVENT_TIMES = list(range(0, 20_000, 10))
+
+
+def _get_events_cb(request, context):
+    time_start = int(request.qs["filters.timestart"][0])
+    time_end = int(request.qs["filters.timeend"][0])
+    page = int(request.qs["currentpage"][0])
+    page_size = int(request.qs["currentpagesize"][0])
+    rows = [
+        {"id": f"event-{ts}", "time": ts}
+        for ts in reversed(EVENT_TIMES)
+        if time_start <= ts <= time_end
+    ]
+    return json.dumps(
+        {
+            "errorCode": 0,
+            "result": {
+                "totalRows": len(rows),
+                "currentPage": page,
+                "data": rows[(page - 1) * page_size : page * page_size],
+            },
+        }
+    )
+
+
+@pytest.fixture
+def mock_events_api(requests_mock, default_api_v2):
+    return requests_mock.get(
+        str(default_api_v2 / "sites" / "0bf476c155ea24942722c5a8b516adfe" / "events"),
+        text=_get_events_cb,
+    )
+
+
+@pytest.mark.parametrize(
+    "shard, parts, exp_out",
+    [
+        ((0, 9), 2, [(5, 9), (0, 4)]),
+        ((0, 10), 3, [(8, 10), (4, 7), (0, 3)]),
+        ((5, 6), 10, [(6, 6), (5, 5)]),
+    ],
+)
+def test_time_shard_split(shard, parts, exp_out):
+    out = backfill.TimeShard(*shard).split(parts)
+    assert [(el.time_start, el.time_end) for el in out] == exp_out
+
+
+def test_ordered_backfill(mock_events_api, active_omada):
+    rv = list(
+        active_omada.backfill_site_events(0, 19_999, shard_count=7, max_workers=3)
+    )
+    assert [row["time"] for row in rv] == list(reversed(EVENT_TIMES))
+    time_filters = {
+        (req.qs["filters.timestart"][0], req.qs["filters.timeend"][0])
+        for req in mock_events_api.request_history
+    }
+    assert len(time_filters) == 7
+
+
+def test_unordered_backfill(mock_events_api, active_omada):
+    rv = list(
+        active_omada.backfill_site_events(
+            0, 19_999, shard_count=5, max_workers=4, ordered=False
+        )
+    )
+    assert sorted(row["time"] for row in rv) == EVENT_TIMES
+
+
+def test_shards_use_thread_sessions(mock_events_api, active_omada, monkeypatch):
+    transport = active_omada.transport
+    main_session = transport.session
+    # Keeps the sessions alive, so their ids are not reused
+    sessions = []
+    request = transport.request
+
+    def _request(method, url, *args, **kwargs):
+        if str(url).endswith("/events"):
+            sessions.append(transport.session)
+        return request(method, url, *args, **kwargs)
+
+    monkeypatch.setattr(transport, "request", _request)
+    list(active_omada.backfill_site_events(0, 19_999, shard_count=5, max_workers=4))
+    assert sessions
+    assert all(session is not main_session for session in sessions)
+
+
+def test_dense_shards_are_split(mock_events_api, active_omada):
+    rv = list(
+        active_omada.backfill_site_events(
+            0, 19_999, shard_count=2, max_shard_rows=150, min_shard_ms=100
+        )
+    )
+    assert [row["time"] for row in rv] == list(reversed(EVENT_TIMES))
+    shard_sizes = [
+        int(req.qs["filters.timeend"][0]) - int(req.qs["filters.timestart"][0]) + 1
+        for req in mock_events_api.request_history
+    ]
+    # Both initial 10s shards (1000 rows each) were split down to <150 row shards
+    assert max(shard_sizes) == 10_000
+    assert min(shard_sizes) == 625
+    # ... and no page beyond the first has been requested from a dense shard
+    assert all(
+        req.qs["currentpage"] == ["1"] for req in mock_events_api.request_history
+    )
+
+
+def test_empty_range(active_omada):
+    with pytest.raises(ValueError):
+        active_omada.backfill_site_events(100, 99)
+
+
+def test_alerts_backfill_filters(requests_mock, default_api_v2, active_omada):
+    mock_alerts_api = requests_mock.get(
+        str(default_api_v2 / "sites" / "0bf476c155ea24942722c5a8b516adfe" / "alerts"),
+        text=_get_events_cb,
+    )
+    rows = list(active_omada.backfill_site_alerts(0, 999, archived=True, shard_count=2))
+    assert len(rows) == 100
+    list(active_omada.get_site_alerts(archived=True, time_start=0, time_end=999))
+
+    # Same filters as the paginated listing, only the time range differs per shard
+    *shard_requests, listing_request = mock_alerts_api.request_history
+    for request in shard_requests:
+        assert request.qs["filters.archived"] == listing_request.qs["filters.archived"]
+        assert set(request.qs) == set(listing_request.qs)
@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from omada import bulk
+
+SITE_ID = "0bf476c155ea24942722c5a8b516adfe"
+
+
+@pytest.fixture
+def alert_ids(resources_dir):
+    with (resources_dir / "get_site_alerts.json").open() as fin:
+        return [row["id"] for page in json.load(fin) for row in page["result"]["data"]]
+
+
+@pytest.fixture
+def cmd_url(default_api_v2):
+    return default_api_v2 / "sites" / SITE_ID / "cmd" / "alerts"
+
+
+def test_batched():
+    assert list(bulk.batched("abcde", 2)) == [["a", "b"], ["c", "d"], ["e"]]
+    assert list(bulk.batched([], 2)) == []
+
+
+def test_archive_ids(active_omada, requests_mock, cmd_url):
+    matcher = requests_mock.post(str(cmd_url / "archive"), text='{"errorCode": 0}')
+    ids = [f"alert-{idx}" for idx in range(250)]
+    results = active_omada.archive_site_alerts(iter(ids), batch_size=100)
+    assert [len(res.ids) for res in results] == [100, 100, 50]
+    assert all(res.ok for res in results)
+    assert sorted(
+        alert_id
+        for req in matcher.request_history
+        for alert_id in req.json()["alertIds"]
+    ) == sorted(ids)
+
+
+def test_archive_filtered(
+    active_omada,
+    requests_mock,
+    configure_paginated_get,
+    default_api_v2,
+    resources_dir,
+    cmd_url,
+    alert_ids,
+):
+    listing = configure_paginated_get(
+        default_api_v2 / "sites" / SITE_ID / "alerts",
+        resources_dir / "get_site_alerts.json",
+    )
+    matcher = requests_mock.post(str(cmd_url / "archive"), text='{"errorCode": 0}')
+    results = active_omada.archive_site_alerts(
+        where=lambda row: row["id"] != alert_ids[0], batch_size=7, time_start=10
+    )
+    assert listing.last_request.qs["filters.archived"] == ["false"]
+    assert listing.last_request.qs["filters.timestart"] == ["10"]
+    sent = [alert_id for res in results for alert_id in res.ids]
+    assert sent == alert_ids[1:]
+    assert matcher.call_count == len(results)
+
+
+def test_failed_batch_reported(active_omada, requests_mock, cmd_url):
+    def _fail_second(request, context):
+        if "b" in request.json()["alertIds"]:
+            return '{"errorCode": -1, "msg": "nope"}'
+        return '{"errorCode": 0}'
+
+    requests_mock.post(str(cmd_url / "delete"), text=_fail_second)
+    results = active_omada.delete_site_alerts(["a", "b", "c"], batch_size=1)
+    assert [res.ok for res in results] == [True, False, True]
+    assert results[1].error.msg == "nope"
+
+
+def test_mark_all(active_omada, requests_mock, cmd_url):
+    archive = requests_mock.post(str(cmd_url / "archiveAll"), text='{"errorCode": 0}')
+    delete = requests_mock.post(str(cmd_url / "deleteAll"), text='{"errorCode": 0}')
+    assert active_omada.archive_all_site_alerts()
+    assert active_omada.delete_all_site_alerts()
+    assert archive.call_count == delete.call_count == 1
+
+
+def test_unknown_action(active_omada):
+    with pytest.raises(ValueError):
+        bulk.BulkAlertOperation(active_omada, SITE_ID, "explode")
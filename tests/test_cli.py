@@ -0,0 +1,190 @@
+import csv
+import io
+import json
+import os
+
+import pytest
+
+from omada import cli
+
+
+@pytest.fixture
+def cli_args(test_config):
+    return [
+        "--url",
+        str(test_config.base_url),
+        "--controller-id",
+        test_config.omada_controller_id,
+        "--username",
+        "testuser",
+        "--password",
+        "testpass",
+    ]
+
+
+@pytest.fixture
+def mock_clients(configure_paginated_get, default_api_v2, resources_dir):
+    return configure_paginated_get(
+        default_api_v2 / "sites" / "0bf476c155ea24942722c5a8b516adfe" / "clients",
+        resources_dir / "get_site_clients.json",
+    )
+
+
+@pytest.fixture
+def closed_stdout():
+    """Output stream whose reader went away (like `omada ... | head -1`)."""
+    read_fd, write_fd = os.pipe()
+    os.close(read_fd)
+    out = io.TextIOWrapper(io.FileIO(write_fd, "w"), encoding="utf8")
+    yield out
+    # Must not raise BrokenPipeError again
+    out.close()
+
+
+@pytest.fixture(autouse=True)
+def mock_logout(inactive_omada, requests_mock, default_api_v2):
+    return requests_mock.post(
+        str(default_api_v2 / "logout"),
+        text="""{"errorCode":0,"msg":"Success."}""",
+    )
+
+
+def test_clients_ndjson(cli_args, mock_clients, mock_logout):
+    out = io.StringIO()
+    rv = cli.main(cli_args + ["--site", "obf-word misty tyrant", "clients"], out=out)
+    assert rv == 0
+    rows = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert len(rows) == 32
+    assert rows[0]["mac"] == "0B-F4-FE-EB-37-98"
+    assert rows[0]["siteName"] == "obf-word misty tyrant"
+    assert mock_logout.called
+
+
+def test_limit_stops_paging(cli_args, mock_clients):
+    out = io.StringIO()
+    cli.main(
+        cli_args + ["--site", "obf-word misty tyrant", "--limit", "5", "clients"],
+        out=out,
+    )
+    assert len(out.getvalue().splitlines()) == 5
+    # Only the first page has been requested
+    assert mock_clients.call_count == 1
+
+
+def test_fields_csv(cli_args, mock_clients):
+    out = io.StringIO()
+    cli.main(
+        cli_args
+        + [
+            "--site",
+            "obf-word misty tyrant",
+            "--format",
+            "csv",
+            "--fields",
+            "mac,ip,missing",
+            "clients",
+        ],
+        out=out,
+    )
+    rows = list(csv.reader(io.StringIO(out.getvalue())))
+    assert rows[0] == ["mac", "ip", "missing"]
+    assert rows[1] == ["0B-F4-FE-EB-37-98", "192.168.7.141", ""]
+    assert len(rows) == 33
+
+
+def test_output_options_after_command(cli_args):
+    args = cli.parse_args(
+        cli_args
+        + [
+            "--site",
+            "x",
+            "--limit",
+            "3",
+            "clients",
+            "--format",
+            "csv",
+            "--fields",
+            "mac",
+        ]
+    )
+    assert (args.format, args.fields, args.limit) == ("csv", ["mac"], 3)
+    # Defaults survive a command that does not repeat them
+    args = cli.parse_args(cli_args + ["--site", "x", "--format", "csv", "devices"])
+    assert (args.format, args.fields, args.limit) == ("csv", None, None)
+
+
+def test_multiple_sites(
+    cli_args, requests_mock, default_api_v2, resources_dir, configure_paginated_get
+):
+    for site_id in ("0bf476c155ea24942722c5a8b516adfe", "MyTestSiteKey"):
+        requests_mock.get(
+            str(default_api_v2 / "sites" / site_id / "devices"),
+            text=(resources_dir / "get_site_devices.json").open().read(),
+        )
+    out = io.StringIO()
+    cli.main(cli_args + ["--all-sites", "--fields", "siteName,mac", "devices"], out=out)
+    rows = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert len(rows) == 8
+    assert {row["siteName"] for row in rows} == {
+        "obf-word misty tyrant",
+        "obf-word old commenter",
+    }
+    assert set(rows[0]) == {"siteName", "mac"}
+
+
+def test_site_required(cli_args, monkeypatch):
+    monkeypatch.delenv("OMADA_SITE", raising=False)
+    with pytest.raises(SystemExit):
+        cli.parse_args(cli_args + ["clients"])
+
+
+def test_unknown_event_module(cli_args, capsys):
+    with pytest.raises(SystemExit):
+        cli.parse_args(cli_args + ["--site", "x", "events", "--module", "Sytem"])
+    assert "invalid choice: 'Sytem'" in capsys.readouterr().err
+
+
+def test_events_render(
+    cli_args, configure_paginated_get, default_api_v2, resources_dir
+):
+    configure_paginated_get(
+        default_api_v2 / "sites" / "0bf476c155ea24942722c5a8b516adfe" / "events",
+        resources_dir / "get_site_events.json",
+    )
+    out = io.StringIO()
+    cli.main(
+        cli_args
+        + ["--site", "obf-word misty tyrant", "--limit", "1", "--fields", "content"]
+        + ["events", "--render"],
+        out=out,
+    )
+    assert json.loads(out.getvalue())["content"].startswith(
+        "[0B-F4-39-99-1C-54] was disconnected"
+    )
+
+
+def test_diff_command(tmp_path):
+    from omada import snapshot
+
+    old = snapshot.write({"data": {"settings": {"led": True}}}, tmp_path)
+    new = snapshot.write({"data": {"settings": {"led": False}}}, tmp_path)
+    out = io.StringIO()
+    # Offline: no controller options needed
+    assert cli.main(["diff", str(old), str(new)], out) == 0
+    assert [json.loads(line) for line in out.getvalue().splitlines()] == [
+        {"path": "data.settings.led", "change": "changed", "old": True, "new": False}
+    ]
+
+
+def test_diff_closed_stdout(tmp_path, closed_stdout):
+    from omada import snapshot
+
+    old = snapshot.write({"data": {"led": True}}, tmp_path)
+    new = snapshot.write({"data": {"led": False}}, tmp_path)
+    assert cli.main(["diff", str(old), str(new)], closed_stdout) == 0
+
+
+def test_clients_closed_stdout(cli_args, mock_clients, mock_logout, closed_stdout):
+    argv = cli_args + ["--site", "obf-word misty tyrant", "clients"]
+    assert cli.main(argv, closed_stdout) == 0
+    assert mock_logout.called
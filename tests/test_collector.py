@@ -0,0 +1,139 @@
+import json
+import multiprocessing
+import os
+
+import pytest
+
+from omada import collector
+
+SITE_KEYS = {
+    "obf-word misty tyrant": "0bf476c155ea24942722c5a8b516adfe",
+    "obf-word old commenter": "MyTestSiteKey",
+}
+
+# requests_mock patches are inherited by forked workers
+pytestmark = pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="Requires the fork start method",
+)
+
+
+@pytest.fixture
+def make_collector(inactive_omada):
+    def _make_collector_impl(**kwargs):
+        return collector.ProcessCollector(
+            inactive_omada.config,
+            "testuser",
+            "testpass",
+            processes=2,
+            mp_context=multiprocessing.get_context("fork"),
+            **kwargs,
+        )
+
+    return _make_collector_impl
+
+
+@pytest.fixture
+def mock_sites(configure_paginated_get, requests_mock, default_api_v2, resources_dir):
+    requests_mock.post(str(default_api_v2 / "logout"), text='{"errorCode": 0}')
+    for key in SITE_KEYS.values():
+        configure_paginated_get(
+            default_api_v2 / "sites" / key / "clients",
+            resources_dir / "get_site_clients.json",
+        )
+    with (resources_dir / "get_sites.json").open() as fin:
+        configure_paginated_get(default_api_v2 / "sites", [json.load(fin)])
+
+
+@pytest.fixture
+def devices_fail_once(requests_mock, default_api_v2, resources_dir, tmp_path):
+    """The first devices request (of any worker) fails, later ones return the devices."""
+    marker = tmp_path / "failed"
+    devices_text = (resources_dir / "get_site_devices.json").read_text()
+
+    def _fail_once(request, context):
+        # Worker processes share the file system, not the mock state
+        if not marker.exists():
+            marker.write_text(str(os.getpid()))
+            context.status_code = 503
+            return ""
+        return devices_text
+
+    requests_mock.get(
+        str(default_api_v2 / "sites" / "MyTestSiteKey" / "devices"), text=_fail_once
+    )
+    return json.loads(devices_text)["result"]
+
+
+def test_collect_all_sites(make_collector, mock_sites):
+    (result,) = make_collector().collect("clients")
+    assert result.site == "obf-word misty tyrant"
+    assert result.ok
+    assert len(result.rows) == 32
+    assert result.worker != os.getpid()
+
+
+def test_collect_sites(make_collector, mock_sites):
+    results = list(make_collector().collect("clients", sites=SITE_KEYS))
+    assert sorted(res.site for res in results) == sorted(SITE_KEYS)
+    assert all(res.ok and len(res.rows) == 32 for res in results)
+
+
+def test_failed_site_is_retried(make_collector, mock_sites, devices_fail_once):
+    (result,) = make_collector().collect("devices", sites=["obf-word old commenter"])
+    assert result.ok
+    assert result.attempts == 2
+    assert result.rows == devices_fail_once
+
+
+def test_gives_up(make_collector, mock_sites, requests_mock, default_api_v2):
+    requests_mock.get(
+        str(default_api_v2 / "sites" / "MyTestSiteKey" / "devices"), status_code=503
+    )
+    (result,) = make_collector(max_attempts=2).collect(
+        "devices", sites=["obf-word old commenter"]
+    )
+    assert not result.ok
+    assert "503" in result.error
+    assert result.attempts == 2
+
+
+def test_worker_sessions_logged_out(
+    make_collector,
+    mock_sites,
+    requests_mock,
+    default_api_v2,
+    login_result_dict,
+    devices_fail_once,
+    tmp_path,
+):
+    log = tmp_path / "sessions"
+
+    def _record(action, response):
+        def _record_impl(request, context):
+            # Worker processes share the file system, not the mock state
+            with log.open("a") as fout:
+                fout.write(f"{action}\n")
+            return json.dumps(response)
+
+        return _record_impl
+
+    requests_mock.post(
+        str(default_api_v2 / "login"), text=_record("login", login_result_dict)
+    )
+    requests_mock.post(
+        str(default_api_v2 / "logout"), text=_record("logout", {"errorCode": 0})
+    )
+    (result,) = make_collector().collect("devices", sites=["obf-word old commenter"])
+    assert result.ok
+    assert result.rows == devices_fail_once
+    actions = log.read_text().split()
+    # One session per worker: the one that failed logged out right away,
+    # the other one when the pool was shut down
+    assert actions.count("login") == 2
+    assert actions.count("logout") == 2
+
+
+def test_unknown_resource(make_collector):
+    with pytest.raises(ValueError):
+        list(make_collector().collect("printers", sites=[]))
@@ -0,0 +1,105 @@
+import concurrent.futures
+import dataclasses
+import json
+import threading
+
+import pytest
+import yarl
+
+import omada
+from omada import discovery
+
+BASE_URL = "https://local-controller:8043"
+INFO_RESPONSE = {
+    "errorCode": 0,
+    "msg": "Success.",
+    "result": {"controllerVer": "5.9.31", "apiVer": "3", "omadacId": "abcdef0123"},
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    discovery.clear_cache()
+    yield
+    discovery.clear_cache()
+
+
+@pytest.fixture
+def local_config(test_config):
+    return dataclasses.replace(
+        test_config, base_url=yarl.URL(BASE_URL), omada_controller_id=None
+    )
+
+
+@pytest.fixture
+def info_matcher(requests_mock):
+    return requests_mock.get(f"{BASE_URL}/api/info", text=json.dumps(INFO_RESPONSE))
+
+
+def test_discovered(local_config, info_matcher):
+    api = omada.Omada(local_config)
+    assert api.omada_controller_id == "abcdef0123"
+    assert api.api_root == yarl.URL(f"{BASE_URL}/abcdef0123/api/v2")
+    # Cached in memory for other clients of the same controller
+    assert omada.Omada(local_config).omada_controller_id == "abcdef0123"
+    assert info_matcher.call_count == 1
+
+
+def test_configured_id_wins(test_config, info_matcher):
+    assert (
+        omada.Omada(test_config).omada_controller_id
+        == "04b2f7c62fb249ca993a113df25aaa27"
+    )
+    assert info_matcher.call_count == 0
+
+
+def test_disk_cache(local_config, info_matcher, tmp_path):
+    cache_file = tmp_path / "cache" / "controllers.json"
+    config = dataclasses.replace(local_config, controller_id_cache=str(cache_file))
+    assert omada.Omada(config).omada_controller_id == "abcdef0123"
+    assert json.loads(cache_file.read_text()) == {BASE_URL: "abcdef0123"}
+
+    # A new process only has the file
+    discovery.clear_cache()
+    assert omada.Omada(config).omada_controller_id == "abcdef0123"
+    assert info_matcher.call_count == 1
+
+
+def test_corrupt_disk_cache(local_config, info_matcher, tmp_path):
+    cache_file = tmp_path / "controllers.json"
+    cache_file.write_text("{not json")
+    config = dataclasses.replace(local_config, controller_id_cache=str(cache_file))
+    assert omada.Omada(config).omada_controller_id == "abcdef0123"
+    assert json.loads(cache_file.read_text()) == {BASE_URL: "abcdef0123"}
+
+
+def test_missing_id(local_config, requests_mock):
+    requests_mock.get(f"{BASE_URL}/api/info", text='{"errorCode": 0, "result": {}}')
+    with pytest.raises(omada.OmadaError) as err:
+        omada.Omada(local_config).omada_controller_id
+    assert err.value.code == 99_999
+
+
+def test_slow_controller_does_not_block_others(local_config, monkeypatch):
+    slow_url = "https://slow-controller:8043"
+    slow_started, release = threading.Event(), threading.Event()
+
+    def _fetch(api):
+        # (requests_mock serialises requests, so the transport is bypassed)
+        if str(api.config.base_url) == slow_url:
+            slow_started.set()
+            release.wait(10)
+        return "abcdef0123"
+
+    monkeypatch.setattr(discovery, "fetch_controller_id", _fetch)
+    slow = omada.Omada(dataclasses.replace(local_config, base_url=yarl.URL(slow_url)))
+    with concurrent.futures.ThreadPoolExecutor(1) as executor:
+        slow_id = executor.submit(lambda: slow.omada_controller_id)
+        assert slow_started.wait(10)
+        try:
+            # Resolved while the slow controller is still answering
+            assert omada.Omada(local_config).omada_controller_id == "abcdef0123"
+            assert not slow_id.done()
+        finally:
+            release.set()
+        assert slow_id.result() == "abcdef0123"
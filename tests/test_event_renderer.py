@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+import omada
+from omada import event_renderer
+
+
+@pytest.fixture
+def events(resources_dir):
+    with (resources_dir / "get_site_events.json").open() as fin:
+        return json.load(fin)[0]["result"]["data"]
+
+
+def test_parse_template():
+    assert event_renderer.parse_template(
+        "[client:AA-BB] joined [ap:CC-DD] on [client:AA-BB]."
+    ) == (
+        ("clientNames", "AA-BB"),
+        " joined ",
+        ("deviceNames", "CC-DD"),
+        " on ",
+        ("clientNames", "AA-BB"),
+        ".",
+    )
+
+
+def test_render_multiple_placeholders():
+    event = {
+        "content": "[client:AA-BB] roamed from [ap:CC-DD] to [ap:EE-FF].",
+        "clientNames": {"AA-BB": "laptop"},
+        "deviceNames": {"CC-DD": "Office AP", "EE-FF": "Hall AP"},
+    }
+    assert (
+        omada.EventRenderer().render(event)
+        == "[laptop] roamed from [Office AP] to [Hall AP]."
+    )
+
+
+@pytest.mark.parametrize(
+    "event, exp_out",
+    [
+        ({"content": "[client:AA-BB] left."}, "[AA-BB] left."),
+        ({"content": "[osg:AA-BB] up.", "deviceNames": {}}, "[AA-BB] up."),
+        ({"content": "No placeholders"}, "No placeholders"),
+        ({}, ""),
+    ],
+)
+def test_render_missing_names(event, exp_out):
+    assert omada.EventRenderer().render(event) == exp_out
+
+
+def test_render_page(events):
+    renderer = omada.EventRenderer()
+    rendered = renderer.render_page(events)
+    assert len(rendered) == len(events)
+    assert rendered[0] == (
+        '[0B-F4-39-99-1C-54] was disconnected from network "LAN" on '
+        "[0B-F4-A0-6A-64-FC](connected time:1m connected, traffic: 1.00KB)."
+    )
+    assert not any(event_renderer.PLACEHOLDER_RE.search(text) for text in rendered)
+
+    # Second pass is served from the template cache
+    renderer.render_page(events)
+    assert renderer.cache_info().hits >= len(events)
+
+
+def test_render_events_in_place(events):
+    out = list(omada.EventRenderer().render_events(events[:3]))
+    assert out[0]["content"].startswith("[0B-F4-39-99-1C-54] was disconnected")
+
+
+def test_render_content():
+    assert (
+        event_renderer.render_content(
+            {"content": "[client:AA]", "clientNames": {"AA": "me"}}
+        )
+        == "[me]"
+    )
@@ -27,6 +27,14 @@ def test_get_site_events(mock_events_resp, active_omada):
             {"time_start": 42, "module": "System"},
             {"filters.timestart": "42", "filters.module": "system"},
         ),
+        (
+            {"level": 0, "search_key": "disconnected"},
+            {"filters.level": "0", "searchkey": "disconnected"},
+        ),
+        (
+            {"module": "Client", "sort_by": "time", "sort_order": "desc"},
+            {"filters.module": "client", "sorts.time": "desc"},
+        ),
     ],
 )
 def test_get_site_events_query_params(mock_events_resp, active_omada, kwargs, exp_qs):
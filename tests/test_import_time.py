@@ -0,0 +1,32 @@
+import pathlib
+import subprocess
+import sys
+
+import pytest
+
+import omada
+
+IMPORT_TIME_SCRIPT = pathlib.Path(__file__).parent.parent / "bin" / "import_time.py"
+
+
+def test_lazy_attributes():
+    assert omada.Omada.__name__ == "Omada"
+    assert omada.OmadaConfig.__name__ == "OmadaConfig"
+    assert omada.api_bindings.LoginResult
+    assert "Omada" in dir(omada)
+
+
+def test_unknown_attribute():
+    with pytest.raises(AttributeError):
+        omada.DoesNotExist
+
+
+def test_import_time_budget():
+    # Fails if `import omada` pulls in requests/yarl/pydantic eagerly
+    # or takes longer than the budget
+    result = subprocess.run(
+        [sys.executable, str(IMPORT_TIME_SCRIPT), "--runs", "3"],
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    assert result.returncode == 0, result.stdout
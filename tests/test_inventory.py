@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+from omada import inventory
+
+
+@pytest.fixture
+def clients(resources_dir):
+    with (resources_dir / "get_site_clients.json").open() as fin:
+        return [row for page in json.load(fin) for row in page["result"]["data"]]
+
+
+@pytest.fixture
+def devices(resources_dir):
+    with (resources_dir / "get_site_devices.json").open() as fin:
+        return json.load(fin)["result"]
+
+
+@pytest.fixture
+def site_url(default_api_v2):
+    return default_api_v2 / "sites" / "0bf476c155ea24942722c5a8b516adfe"
+
+
+def test_refresh(
+    active_omada, configure_paginated_get, requests_mock, site_url, resources_dir
+):
+    configure_paginated_get(
+        site_url / "clients", resources_dir / "get_site_clients.json"
+    )
+    requests_mock.get(
+        str(site_url / "devices"),
+        text=(resources_dir / "get_site_devices.json").read_text(),
+    )
+    inv = inventory.Inventory()
+    client_changes, device_changes = inv.refresh(active_omada)
+    assert len(client_changes.added) == len(inv.clients) == 32
+    assert len(device_changes.added) == len(inv.devices) == 4
+    assert len(inv.find_clients(site="obf-word misty tyrant")) == 32
+    assert len(inv.find_devices(type="ap")) == 3
+
+
+def test_lookups(clients, devices):
+    inv = inventory.Inventory()
+    inv.update_clients("site", clients)
+    inv.update_devices("site", devices)
+
+    wireless = clients[0]
+    assert inv.client(wireless["mac"].lower().replace("-", ":")) is wireless
+    assert inv.ap_of(wireless["mac"]) == wireless["apName"]
+    assert inv.find_clients(ip=wireless["ip"]) == [wireless]
+    assert inv.find_clients(hostname=wireless["hostName"].upper()) == [wireless]
+
+    on_ap = inv.find_clients(ap=wireless["apName"], ssid=wireless["ssid"])
+    assert on_ap and all(row["apName"] == wireless["apName"] for row in on_ap)
+    assert len(inv.find_clients(ap_mac=wireless["apMac"])) == len(
+        inv.find_clients(ap=wireless["apName"])
+    )
+    assert inv.find_clients(ssid="no such ssid") == []
+    assert inv.device(devices[0]["mac"]) is devices[0]
+
+    with pytest.raises(ValueError):
+        inv.find_clients(colour="blue")
+
+
+def test_incremental_update(clients):
+    inv = inventory.Inventory()
+    inv.update_clients("site", clients)
+
+    moved = dict(clients[0], apName="new-ap")
+    gone = clients[1]
+    changes = inv.update_clients("site", [moved, *clients[2:]])
+    assert changes.added == set()
+    assert changes.changed == {moved["mac"]}
+    assert changes.removed == {gone["mac"]}
+    assert inv.client(gone["mac"]) is None
+    assert inv.find_clients(ap="new-ap") == [moved]
+    assert moved not in inv.find_clients(ap=clients[0]["apName"])
+
+    assert not inv.update_clients("site", [moved, *clients[2:]])
+
+
+def test_sites_are_independent(clients):
+    inv = inventory.Inventory()
+    inv.update_clients("first", clients[:10])
+    inv.update_clients("second", clients[10:])
+    changes = inv.update_clients("first", [])
+    assert len(changes.removed) == 10
+    assert len(inv.clients) == len(clients) - 10
+    assert len(inv.find_clients(site="second")) == len(clients) - 10
@@ -1,3 +1,6 @@
+import json
+
+import pydantic
 import pytest
 
 import omada
@@ -519,3 +522,100 @@ def test_get_wireless_networks(
 
     rv = list(active_omada.get_wireless_networks(group_id="HELLO_WORLD"))
     assert len(rv) == 4
+
+
+def test_get_all_wireless_networks(
+    requests_mock, default_api_v2, resources_dir, active_omada
+):
+    wlans_url = (
+        default_api_v2
+        / "sites"
+        / "0bf476c155ea24942722c5a8b516adfe"
+        / "setting"
+        / "wlans"
+    )
+    requests_mock.get(
+        str(wlans_url),
+        text=json.dumps(
+            {
+                "errorCode": 0,
+                "result": {
+                    "data": [
+                        {"id": "GROUP_A", "name": "Office"},
+                        {"id": "GROUP_B", "name": "Warehouse"},
+                    ]
+                },
+            }
+        ),
+    )
+    for group_id in ("GROUP_A", "GROUP_B"):
+        requests_mock.get(
+            str(wlans_url / group_id / "ssids"),
+            text=(resources_dir / "get_wireless_networks.json").open().read(),
+        )
+
+    rv = list(active_omada.get_all_wireless_networks())
+    assert len(rv) == 8
+    assert [(row["wlanGroupId"], row["wlanGroupName"]) for row in rv] == [
+        ("GROUP_A", "Office")
+    ] * 4 + [("GROUP_B", "Warehouse")] * 4
+
+
+def test_get_site_clients_pushdown(
+    configure_paginated_get, default_api_v2, resources_dir, active_omada
+):
+    matcher = configure_paginated_get(
+        default_api_v2 / "sites" / "0bf476c155ea24942722c5a8b516adfe" / "clients",
+        resources_dir / "get_site_clients.json",
+    )
+    next(
+        active_omada.get_site_clients(
+            ssid="Guest",
+            ap_mac="0B-F4-5C-7D-D1-E2",
+            radio_id=1,
+            search_key="phone",
+            sort_by="trafficDown",
+            sort_order=omada.function_interface_bindings.SortOrder.Descending,
+        )
+    )
+    query = matcher.last_request.qs
+    # requests_mock lower-cases the query string
+    assert query["filters.ssid"] == ["guest"]
+    assert query["filters.apmac"] == ["0b-f4-5c-7d-d1-e2"]
+    assert query["filters.radioid"] == ["1"]
+    assert query["searchkey"] == ["phone"]
+    assert query["sorts.trafficdown"] == ["desc"]
+    assert query["filters.active"] == ["true"]
+
+
+def test_get_site_alerts_level_filter(
+    configure_paginated_get, default_api_v2, resources_dir, active_omada
+):
+    matcher = configure_paginated_get(
+        default_api_v2 / "sites" / "0bf476c155ea24942722c5a8b516adfe" / "alerts",
+        resources_dir / "get_site_alerts.json",
+    )
+    level = omada.omada.LevelFilter.Warning
+    assert active_omada.count_site_alerts(level=level, archived=True) == int(
+        json.loads((resources_dir / "get_site_alerts.json").read_text())[0]["result"][
+            "totalRows"
+        ]
+    )
+    query = matcher.last_request.qs
+    assert query["filters.level"] == ["1"]
+    assert query["filters.archived"] == ["true"]
+
+
+@pytest.mark.parametrize(
+    "method, kwargs",
+    [
+        ("get_site_clients", {"apMac": "0B-F4-5C-7D-D1-E2"}),
+        ("get_site_clients", {"ssidd": "Guest"}),
+        ("count_site_alerts", {"levle": 0}),
+        ("get_site_events", {"modul": "System"}),
+    ],
+)
+def test_unknown_filter_rejected(active_omada, requests_mock, method, kwargs):
+    with pytest.raises(pydantic.ValidationError):
+        getattr(active_omada, method)(**kwargs)
+    assert not requests_mock.called
@@ -0,0 +1,116 @@
+import importlib.util
+import json
+import pathlib
+import shutil
+import sys
+
+import pytest
+
+OBFUSCATE_SCRIPT = pathlib.Path(__file__).parent.parent / "bin" / "obfuscate.py"
+
+
+@pytest.fixture(scope="module")
+def obfuscate():
+    spec = importlib.util.spec_from_file_location("obfuscate", OBFUSCATE_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    # Worker processes unpickle functions by module name
+    sys.modules["obfuscate"] = module
+    spec.loader.exec_module(module)
+    yield module
+    del sys.modules["obfuscate"]
+
+
+RECORDS = [
+    {"name": "Living Room AP", "mac": "AA-BB-CC-DD-EE-FF", "uptime": 10},
+    {"ssid": "home-wifi", "id": "6123456789abcdef01234567", "hostName": "laptop"},
+    [{"email": "someone@example.com"}, None, 1.5],
+]
+
+
+def _write_capture(root: pathlib.Path):
+    (root / "sub").mkdir(parents=True)
+    (root / "response.json").write_text(json.dumps({"result": RECORDS}))
+    lines = [json.dumps(record) for record in RECORDS * 5]
+    lines[3:3] = ["", '"x"', "1"]
+    (root / "sub" / "capture.jsonl").write_text("\n".join(lines) + "\n")
+
+
+def _read_tree(root: pathlib.Path):
+    return {
+        str(file.relative_to(root)): file.read_text()
+        for file in sorted(root.rglob("*"))
+        if file.is_file()
+    }
+
+
+def test_main_directory_jobs_agree(obfuscate, tmp_path):
+    _write_capture(tmp_path / "serial")
+    shutil.copytree(tmp_path / "serial", tmp_path / "parallel")
+
+    obfuscate.main(str(tmp_path / "serial"), jobs=1)
+    obfuscate.main(str(tmp_path / "parallel"), jobs=2)
+
+    serial = _read_tree(tmp_path / "serial")
+    assert serial == _read_tree(tmp_path / "parallel")
+    assert sorted(serial) == ["response.json", "sub/capture.jsonl"]
+    assert "Living Room AP" not in serial["response.json"]
+    assert "AA-BB-CC-DD-EE-FF" not in serial["sub/capture.jsonl"]
+
+
+def test_main_jsonl_file_batches(obfuscate, tmp_path, monkeypatch):
+    # Small batches so the pool.imap path sees several of them
+    monkeypatch.setattr(obfuscate, "LINE_BATCH_SIZE", 2)
+    _write_capture(tmp_path / "serial")
+    shutil.copytree(tmp_path / "serial", tmp_path / "parallel")
+
+    obfuscate.main(str(tmp_path / "serial" / "sub" / "capture.jsonl"), jobs=1)
+    obfuscate.main(str(tmp_path / "parallel" / "sub" / "capture.jsonl"), jobs=2)
+
+    serial = (tmp_path / "serial" / "sub" / "capture.jsonl").read_text()
+    parallel = (tmp_path / "parallel" / "sub" / "capture.jsonl").read_text()
+    assert serial == parallel
+    lines = serial.splitlines()
+    assert len(lines) == len(RECORDS) * 5 + 3
+    assert lines[3:6] == ["", '"x"', "1"]
+    # Already obfuscated output is stable
+    obfuscate.main(str(tmp_path / "parallel" / "sub" / "capture.jsonl"), jobs=2)
+    assert (tmp_path / "parallel" / "sub" / "capture.jsonl").read_text() == serial
+
+
+def test_jsonl_error_removes_temp_file(obfuscate, tmp_path):
+    capture = tmp_path / "broken.jsonl"
+    original = json.dumps(RECORDS[0]) + "\n{not json\n"
+    capture.write_text(original)
+
+    with pytest.raises(json.JSONDecodeError):
+        obfuscate.main(str(capture), jobs=1)
+
+    assert capture.read_text() == original
+    assert [file.name for file in tmp_path.iterdir()] == ["broken.jsonl"]
+
+
+def test_obfuscate_line_passthrough(obfuscate):
+    assert obfuscate.obfuscate_line("\n") == "\n"
+    assert obfuscate.obfuscate_line('"x"\n') == '"x"\n'
+    assert obfuscate.obfuscate_line("1\n") == "1\n"
+    assert obfuscate.obfuscate_line('{"ssid": "home"}\n') != '{"ssid": "home"}\n'
+
+
+def test_obfuscate_str_memoized(obfuscate):
+    obfuscate.obfuscate_str.cache_clear()
+    first = obfuscate.obfuscate_str("ssid", "home-wifi")
+    assert obfuscate.obfuscate_str("ssid", "home-wifi") == first
+    info = obfuscate.obfuscate_str.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+
+
+def test_obfuscate_str_without_name(obfuscate):
+    assert obfuscate.obfuscate_str(None, "plain value") == "plain value"
+    assert obfuscate.obfuscate_str(None, "AA-BB-CC-DD-EE-FF").startswith(
+        obfuscate.FAKE_MAC_PREFIX
+    )
+
+
+def test_jobs_default(obfuscate):
+    assert obfuscate.parse_args(["captures"]).jobs == 1
+    assert obfuscate.parse_args(["captures", "-j", "4"]).jobs == 4
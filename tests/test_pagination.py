@@ -0,0 +1,121 @@
+import itertools
+
+import pytest
+
+import omada
+
+
+@pytest.fixture
+def mock_clients(configure_paginated_get, default_api_v2, resources_dir):
+    return configure_paginated_get(
+        default_api_v2 / "sites" / "0bf476c155ea24942722c5a8b516adfe" / "clients",
+        resources_dir / "get_site_clients.json",
+    )
+
+
+def test_listing_is_an_iterator(mock_clients, active_omada):
+    listing = active_omada.get_site_clients()
+    assert iter(listing) is listing
+    assert next(listing)["mac"] == "0B-F4-FE-EB-37-98"
+    assert len(list(listing)) == 31
+    assert listing.cursor.exhausted
+    assert listing.cursor.last_completed_page == 4
+    assert listing.cursor.total_rows == 32
+
+
+def test_cursor_json_roundtrip():
+    cursor = omada.ScanCursor(
+        path="sites/x/clients",
+        params={"filters.active": "true"},
+        last_completed_page=3,
+        total_rows=1000,
+        yielded_rows=300,
+    )
+    assert omada.ScanCursor.from_json(cursor.to_json()) == cursor
+
+
+def test_cursor_never_stores_token(mock_clients, active_omada):
+    listing = active_omada.get_site_clients()
+    next(listing)
+    assert "token" not in listing.cursor.to_json()
+
+
+def test_resume_interrupted_scan(mock_clients, active_omada, inactive_omada, tmp_path):
+    listing = active_omada.get_site_clients(active=True)
+    # Die in the middle of the second page
+    first_rows = list(itertools.islice(listing, 15))
+    assert listing.cursor.last_completed_page == 1
+    listing.cursor.save(tmp_path / "cursor.json")
+
+    # A new process/instance picks up after the last completed page
+    new_omada = omada.Omada(inactive_omada.config)
+    new_omada.login("testuser", "testpass")
+    seen_requests = mock_clients.call_count
+    cursor = omada.ScanCursor.load(tmp_path / "cursor.json")
+    resumed_rows = list(new_omada.resume(cursor))
+
+    assert len(resumed_rows) == 22
+    assert [row["mac"] for row in first_rows[10:]] == [
+        row["mac"] for row in resumed_rows[:5]
+    ]
+    resumed_requests = mock_clients.request_history[seen_requests:]
+    assert [req.qs["currentpage"][0] for req in resumed_requests] == [
+        "2",
+        "3",
+        "4",
+    ]
+    assert all(req.qs["filters.active"] == ["true"] for req in resumed_requests)
+    assert cursor.exhausted
+
+
+def test_pages(mock_clients, active_omada):
+    pages = list(active_omada.get_site_clients().pages())
+    assert [len(page) for page in pages] == [10, 10, 10, 2]
+    assert [page.page for page in pages] == [1, 2, 3, 4]
+    assert all(page.total_rows == 32 for page in pages)
+    assert all(page.page_size == 100 for page in pages)
+    assert all(page.elapsed >= 0 for page in pages)
+    assert list(pages[0])[0]["mac"] == "0B-F4-FE-EB-37-98"
+
+
+def test_pages_advance_cursor(mock_clients, active_omada):
+    listing = active_omada.get_site_clients()
+    pages = listing.pages()
+    next(pages)
+    # The page has been handed out but is not completed yet
+    assert listing.cursor.last_completed_page == 0
+    next(pages)
+    assert listing.cursor.last_completed_page == 1
+
+
+def test_count_fetches_one_row(mock_clients, active_omada):
+    assert active_omada.count_site_clients() == 32
+    assert mock_clients.call_count == 1
+    query = mock_clients.last_request.qs
+    assert query["currentpagesize"] == ["1"]
+    assert query["filters.active"] == ["true"]
+
+
+def test_count_cache(mock_clients, active_omada):
+    assert active_omada.count_site_clients(max_age=60) == 32
+    assert active_omada.count_site_clients(max_age=60) == 32
+    assert mock_clients.call_count == 1
+    # Other filters are counted separately, no `max_age` always asks
+    active_omada.count_site_clients(active=False, max_age=60)
+    active_omada.count_site_clients()
+    assert mock_clients.call_count == 3
+
+
+def test_count_cache_bounded(mock_clients, active_omada, clock):
+    active_omada.clock = clock
+    active_omada.count_site_clients()
+    assert active_omada._counts == {}
+
+    active_omada.count_site_clients(active=True, max_age=60)
+    active_omada.count_site_clients(active=False, max_age=60)
+    assert len(active_omada._counts) == 2
+    clock.now += 61
+    # Expired entries are dropped as new ones are stored
+    active_omada.count_site_clients(active=None, max_age=60)
+    assert len(active_omada._counts) == 1
+    assert mock_clients.call_count == 4
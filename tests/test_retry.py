@@ -0,0 +1,190 @@
+import dataclasses
+import json
+
+import pytest
+import requests
+
+import omada
+from omada import retry
+
+OK_RESPONSE = {"text": """{"errorCode":0,"result":"TEST PASSED."}"""}
+
+
+@pytest.fixture
+def make_omada(inactive_omada):
+    def _make_omada_impl(**config_kwargs):
+        out = omada.Omada(dataclasses.replace(inactive_omada.config, **config_kwargs))
+        out.login("testuser", "testpass")
+        return out
+
+    return _make_omada_impl
+
+
+@pytest.fixture
+def fast_retry():
+    return retry.RetryPolicy(max_attempts=3, backoff=0)
+
+
+def test_policy_delay():
+    policy = retry.RetryPolicy(backoff=1, backoff_max=5, jitter=0.5)
+    assert [policy.delay(attempt, rng=lambda: 0) for attempt in range(1, 5)] == [
+        1,
+        2,
+        4,
+        5,
+    ]
+    assert policy.delay(2, rng=lambda: 1) == 1
+
+
+@pytest.mark.parametrize(
+    "failure",
+    [
+        {"status_code": 503},
+        {"status_code": 502},
+        {"exc": requests.exceptions.ConnectionError},
+        {"exc": requests.exceptions.ReadTimeout},
+    ],
+)
+def test_get_retried(make_omada, fast_retry, requests_mock, default_api_v2, failure):
+    api = make_omada(read_retry=fast_retry)
+    matcher = requests_mock.get(
+        str(default_api_v2 / "hello"), [failure, failure, OK_RESPONSE]
+    )
+    assert api._get("hello") == "TEST PASSED."
+    assert matcher.call_count == 3
+
+
+def test_get_gives_up(make_omada, fast_retry, requests_mock, default_api_v2):
+    api = make_omada(read_retry=fast_retry)
+    matcher = requests_mock.get(str(default_api_v2 / "hello"), status_code=503)
+    with pytest.raises(requests.exceptions.HTTPError):
+        api._get("hello")
+    assert matcher.call_count == 3
+
+
+def test_no_retry_by_default(make_omada, requests_mock, default_api_v2):
+    api = make_omada()
+    matcher = requests_mock.get(
+        str(default_api_v2 / "hello"), [{"status_code": 503}, OK_RESPONSE]
+    )
+    with pytest.raises(requests.exceptions.HTTPError):
+        api._get("hello")
+    assert matcher.call_count == 1
+
+
+@pytest.mark.parametrize(
+    "failure, exp_calls",
+    [
+        # Possibly processed by the controller - never retried
+        ({"status_code": 502}, 1),
+        ({"exc": requests.exceptions.ConnectionError}, 1),
+        # Refused by the controller - safe to retry
+        ({"status_code": 503}, 2),
+        ({"exc": requests.exceptions.ConnectTimeout}, 2),
+    ],
+)
+def test_write_retry(make_omada, requests_mock, default_api_v2, failure, exp_calls):
+    policy = dataclasses.replace(retry.NON_IDEMPOTENT, backoff=0)
+    api = make_omada(write_retry=policy)
+    matcher = requests_mock.patch(str(default_api_v2 / "hello"), [failure, OK_RESPONSE])
+    try:
+        api._patch("hello")
+    except Exception:
+        pass
+    assert matcher.call_count == exp_calls
+
+
+def test_page_retried_in_place(
+    make_omada, fast_retry, requests_mock, default_api_v2, resources_dir
+):
+    api = make_omada(read_retry=fast_retry)
+    with (resources_dir / "get_site_clients.json").open() as fin:
+        pages = [{"text": json.dumps(page)} for page in json.load(fin)]
+    # The second page fails once
+    matcher = requests_mock.get(
+        str(default_api_v2 / "sites" / "0bf476c155ea24942722c5a8b516adfe" / "clients"),
+        [pages[0], {"status_code": 502}, pages[1], pages[2], pages[3]],
+    )
+    assert len(list(api.get_site_clients())) == 32
+    assert [req.qs["currentpage"][0] for req in matcher.request_history] == [
+        "1",
+        "2",
+        "2",
+        "3",
+        "4",
+    ]
+
+
+def test_circuit_breaker(make_omada, requests_mock, default_api_v2, clock):
+    breaker = retry.CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+    api = make_omada(circuit_breaker=breaker)
+    matcher = requests_mock.get(str(default_api_v2 / "hello"), status_code=503)
+
+    for _ in range(2):
+        with pytest.raises(requests.exceptions.HTTPError):
+            api._get("hello")
+    assert breaker.state is retry.CircuitState.Open
+
+    # Fails fast without touching the controller
+    with pytest.raises(omada.OmadaError) as err:
+        api._get("hello")
+    assert err.value.code == 99_002
+    assert matcher.call_count == 2
+
+    # A single trial call after the reset timeout
+    clock.now += 10
+    requests_mock.get(str(default_api_v2 / "hello"), **OK_RESPONSE)
+    assert api._get("hello") == "TEST PASSED."
+    assert breaker.state is retry.CircuitState.Closed
+
+
+def test_half_open_failure_reopens(clock):
+    breaker = retry.CircuitBreaker(failure_threshold=1, reset_timeout=5, clock=clock)
+    breaker.record_failure()
+    clock.now += 5
+    breaker.before_call()
+    assert breaker.state is retry.CircuitState.HalfOpen
+    breaker.record_failure()
+    assert breaker.state is retry.CircuitState.Open
+
+
+def test_api_errors_do_not_trip_breaker():
+    breaker = retry.CircuitBreaker(failure_threshold=1)
+
+    def _fail():
+        raise omada.OmadaError({"errorCode": -1, "msg": "nope"})
+
+    with pytest.raises(omada.OmadaError):
+        retry.call(_fail, breaker=breaker)
+    assert breaker.state is retry.CircuitState.Closed
+
+
+@pytest.mark.parametrize(
+    "error, exp_state",
+    [
+        # The controller answered: it is up
+        (omada.OmadaError({"errorCode": -1200, "msg": "expired"}), "closed"),
+        # No verdict: the next call is the trial
+        (omada.OmadaError({"errorCode": 99_003, "msg": "deadline"}), "open"),
+        (ValueError("local bug"), "open"),
+    ],
+)
+def test_half_open_trial_other_error(error, exp_state, clock):
+    breaker = retry.CircuitBreaker(failure_threshold=1, reset_timeout=5, clock=clock)
+    breaker.record_failure()
+    clock.now += 5
+
+    def _fail():
+        raise error
+
+    with pytest.raises(type(error)):
+        retry.call(_fail, breaker=breaker)
+    assert breaker.state == exp_state
+    assert retry.call(lambda: "ok", breaker=breaker) == "ok"
+    assert breaker.state is retry.CircuitState.Closed
+
+
+def test_circuit_breaker_for():
+    breaker = retry.circuit_breaker_for("https://test-controller")
+    assert retry.circuit_breaker_for("https://test-controller") is breaker
+    assert retry.circuit_breaker_for("https://other-controller") is not breaker
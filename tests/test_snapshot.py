@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from omada import snapshot
+
+GROUP_ID = "0bf411d007bfcb720159226fc8e047a9"
+
+
+@pytest.fixture
+def mock_site_config(
+    requests_mock, configure_paginated_get, default_api_v2, resources_dir
+):
+    site_url = default_api_v2 / "sites" / "0bf476c155ea24942722c5a8b516adfe"
+    for path, resource in [
+        ("setting", "get_site_settings.json"),
+        ("setting/profiles/groups", "get_site_groups.json"),
+        ("setting/wlans", "get_settings_wlans.json"),
+        ("setting/portal/candidates", "get_portal_candidates.json"),
+        ("notification", "get_site_notifications.json"),
+    ]:
+        requests_mock.get(
+            str(site_url / path), text=(resources_dir / resource).read_text()
+        )
+    requests_mock.get(
+        str(site_url / "setting/profiles/timeranges"),
+        text='{"errorCode": 0, "result": {"data": []}}',
+    )
+    with (resources_dir / "get_wireless_networks.json").open() as fin:
+        configure_paginated_get(
+            site_url / "setting/wlans" / GROUP_ID / "ssids", [json.load(fin)]
+        )
+
+
+def test_take(active_omada, mock_site_config):
+    out = snapshot.take(active_omada)
+    assert out["site"] == "obf-word misty tyrant"
+    assert set(out["data"]) == {*snapshot.SECTIONS, "wireless_networks"}
+    assert list(out["data"]["wireless_networks"]) == [GROUP_ID]
+    assert out["data"]["wireless_networks"][GROUP_ID]
+    assert out["data"]["time_ranges"] == []
+
+
+def test_write_is_content_addressed(tmp_path):
+    first = snapshot.write({"site": "a", "data": {"x": 1}}, tmp_path)
+    mtime = first.stat().st_mtime_ns
+    same = snapshot.write({"data": {"x": 1}, "site": "a"}, tmp_path)
+    other = snapshot.write({"site": "a", "data": {"x": 2}}, tmp_path)
+    assert same == first
+    assert first.stat().st_mtime_ns == mtime
+    assert other != first
+    assert first.name == f"{snapshot.digest({'site': 'a', 'data': {'x': 1}})}.json.gz"
+    assert snapshot.load(first) == {"site": "a", "data": {"x": 1}}
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(
+        [first.name, other.name]
+    )
+
+
+def test_diff():
+    old = {
+        "settings": {"led": True, "mesh": {"enable": False}},
+        "ssids": [{"id": "a", "name": "Office"}, {"id": "b", "name": "Guests"}],
+        "tags": ["x", "y"],
+    }
+    new = {
+        "settings": {"led": False, "mesh": {"enable": False}, "lldp": True},
+        # Reordered, one renamed, one removed, one added
+        "ssids": [{"id": "c", "name": "IoT"}, {"id": "a", "name": "Staff"}],
+        "tags": ["x"],
+    }
+    changes = sorted(snapshot.diff(old, new))
+    assert changes == [
+        ("settings.led", "changed", True, False),
+        ("settings.lldp", "added", None, True),
+        ("ssids[id=a].name", "changed", "Office", "Staff"),
+        ("ssids[id=b]", "removed", {"id": "b", "name": "Guests"}, None),
+        ("ssids[id=c]", "added", None, {"id": "c", "name": "IoT"}),
+        ("tags[1]", "removed", "y", None),
+    ]
+    assert list(snapshot.diff(old, old)) == []
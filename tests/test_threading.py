@@ -0,0 +1,83 @@
+import concurrent.futures
+import dataclasses
+import json
+import threading
+import time
+
+import omada
+
+THREADS = 8
+
+
+def _run_in_threads(fn):
+    barrier = threading.Barrier(THREADS)
+
+    def _worker():
+        barrier.wait()
+        return fn()
+
+    with concurrent.futures.ThreadPoolExecutor(THREADS) as executor:
+        return [
+            future.result()
+            for future in [executor.submit(_worker) for _ in range(THREADS)]
+        ]
+
+
+def test_concurrent_login(
+    inactive_omada, requests_mock, default_api_v2, login_result_dict
+):
+    def _slow_login(request, context):
+        time.sleep(0.05)
+        return json.dumps(login_result_dict)
+
+    matcher = requests_mock.post(str(default_api_v2 / "login"), text=_slow_login)
+    results = _run_in_threads(lambda: inactive_omada.login("testuser", "testpass"))
+    assert matcher.call_count == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_current_user_computed_once(
+    active_omada, requests_mock, default_api_v2, resources_dir
+):
+    user_json = (resources_dir / "current_user.json").read_text()
+
+    def _slow_user(request, context):
+        time.sleep(0.05)
+        return user_json
+
+    matcher = requests_mock.get(
+        str(default_api_v2 / "users" / "current"), text=_slow_user
+    )
+    users = _run_in_threads(lambda: active_omada.current_user)
+    assert matcher.call_count == 1
+    assert all(user is users[0] for user in users)
+
+
+def test_session_per_thread(inactive_omada, requests_mock, default_api_v2):
+    # The default
+    api = omada.Omada(inactive_omada.config)
+    main_session = api.session
+    api.login("testuser", "testpass")
+    matcher = requests_mock.get(
+        str(default_api_v2 / "hello"), text='{"errorCode":0,"result":"TEST PASSED."}'
+    )
+
+    def _get():
+        assert api._get("hello") == "TEST PASSED."
+        return api.session
+
+    sessions = _run_in_threads(_get)
+    assert len({id(session) for session in sessions}) == THREADS
+    assert main_session not in sessions
+    # One login shared by all sessions
+    token = api.login_result.token
+    assert all(req.headers["Csrf-Token"] == token for req in matcher.request_history)
+    assert all(session.cookies is main_session.cookies for session in sessions)
+
+
+def test_shared_session(inactive_omada):
+    api = omada.Omada(
+        dataclasses.replace(inactive_omada.config, session_per_thread=False)
+    )
+    sessions = _run_in_threads(lambda: api.session)
+    assert all(session is api.session for session in sessions)
@@ -0,0 +1,81 @@
+import dataclasses
+
+import pytest
+import requests
+
+import omada
+from omada import retry, timeouts
+
+OK_RESPONSE = {"text": """{"errorCode":0,"result":"TEST PASSED."}"""}
+
+
+@pytest.fixture
+def clients_url(default_api_v2):
+    return default_api_v2 / "sites" / "0bf476c155ea24942722c5a8b516adfe" / "clients"
+
+
+def test_default_timeouts(active_omada, requests_mock, default_api_v2):
+    matcher = requests_mock.get(str(default_api_v2 / "hello"), **OK_RESPONSE)
+    active_omada._get("hello")
+    assert matcher.last_request.timeout == (10.0, 60.0)
+
+
+def test_deadline_clips_timeouts(active_omada, requests_mock, default_api_v2):
+    matcher = requests_mock.get(str(default_api_v2 / "hello"), **OK_RESPONSE)
+    with active_omada.deadline(5):
+        active_omada._get("hello")
+    connect_timeout, read_timeout = matcher.last_request.timeout
+    assert 4 < connect_timeout <= 5
+    assert 4 < read_timeout <= 5
+
+
+def test_deadline_shared_by_pages(
+    active_omada, configure_paginated_get, clients_url, resources_dir, clock
+):
+    deadline = timeouts.Deadline(10, clock=clock)
+    matcher = configure_paginated_get(
+        clients_url, resources_dir / "get_site_clients.json"
+    )
+
+    with timeouts.activate(deadline):
+        listing = active_omada.get_site_clients()
+    rows = []
+    with pytest.raises(omada.OmadaError) as err:
+        for page in listing.pages():
+            rows.extend(page.rows)
+            # Every page takes 4 seconds of the shared budget
+            clock.now += 4
+    assert err.value.code == 99_003
+    assert len(rows) == 30
+    assert matcher.call_count == 3
+    # Later pages got only the remainder of the budget
+    assert [req.timeout[1] for req in matcher.request_history] == [10.0, 6.0, 2.0]
+
+
+def test_retries_stay_within_deadline(inactive_omada, requests_mock, default_api_v2):
+    api = omada.Omada(
+        dataclasses.replace(
+            inactive_omada.config,
+            read_retry=retry.RetryPolicy(max_attempts=10, backoff=1, jitter=0),
+        )
+    )
+    api.login("testuser", "testpass")
+    matcher = requests_mock.get(str(default_api_v2 / "hello"), status_code=503)
+    with pytest.raises(requests.exceptions.HTTPError):
+        with api.deadline(0.5):
+            api._get("hello")
+    # The first backoff (1s) does not fit into the 0.5s budget
+    assert matcher.call_count == 1
+
+
+def test_config_call_deadline(inactive_omada):
+    api = omada.Omada(dataclasses.replace(inactive_omada.config, call_deadline=3))
+    assert api._call_deadline().seconds == 3
+    with api.deadline(1):
+        assert api._call_deadline().seconds == 1
+    assert omada.Omada(inactive_omada.config)._call_deadline() is None
+
+
+def test_activate_none_is_noop():
+    with timeouts.activate(None):
+        assert timeouts.current() is None
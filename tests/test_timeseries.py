@@ -0,0 +1,135 @@
+import json
+
+import pytest
+
+from omada import timeseries
+
+
+@pytest.fixture
+def clients(resources_dir):
+    with (resources_dir / "get_site_clients.json").open() as fin:
+        return [row for page in json.load(fin) for row in page["result"]["data"]]
+
+
+@pytest.fixture
+def devices(resources_dir):
+    with (resources_dir / "get_site_devices.json").open() as fin:
+        return json.load(fin)["result"]
+
+
+def test_ring_buffer():
+    buffer = timeseries.RingBuffer(3)
+    assert buffer.last() is None
+    assert list(buffer) == []
+    # Storage grows with the samples
+    buffer.append(0, 0)
+    buffer.append(1, 10)
+    assert len(buffer.values) == 2
+    assert list(buffer) == [(0, 0), (1, 10)]
+    assert buffer.last() == (1, 10)
+    for idx in range(2, 5):
+        buffer.append(idx, idx * 10)
+    assert len(buffer) == 3
+    assert list(buffer) == [(2, 20), (3, 30), (4, 40)]
+    assert buffer.last() == (4, 40)
+    assert buffer.since(3) == [(3, 30), (4, 40)]
+    # ... up to the capacity
+    assert len(buffer.values) == 3
+    with pytest.raises(ValueError):
+        timeseries.RingBuffer(0)
+
+
+def test_counter_rates_with_reset():
+    samples = [(0, 100), (10, 200), (20, 50), (30, 150), (30, 160)]
+    assert timeseries.counter_rates(samples) == [(10, 10), (20, 5), (30, 10)]
+
+
+def test_downsample():
+    samples = [(0, 1), (30, 3), (60, 10), (150, 4), (170, 6)]
+    assert timeseries.downsample(samples, 60) == [(0, 2), (60, 10), (120, 5)]
+    assert timeseries.downsample(samples, 120, reduce=max) == [(0, 10), (120, 6)]
+
+
+def test_sampler_record(clients, devices, clock):
+    sampler = timeseries.Sampler(None, capacity=10, clock=clock)
+    wireless = next(row for row in clients if row.get("apMac"))
+    for step in range(3):
+        clock.now += 60
+        moved = [
+            dict(row, trafficDown=row["trafficDown"] + 6000 * step) for row in clients
+        ]
+        sampler.record(moved, devices)
+
+    assert [
+        rate for _, rate in sampler.rates("client", wireless["mac"], "trafficDown")
+    ] == [
+        100,
+        100,
+    ]
+    ap_counts = sampler.series("ap", wireless["apMac"], timeseries.AP_CLIENTS)
+    assert len(ap_counts) == 3
+    assert ap_counts[0][1] == sum(
+        1 for row in clients if row.get("apMac") == wireless["apMac"]
+    )
+    assert len(sampler.series("device", devices[0]["mac"], "download")) == 3
+    with pytest.raises(ValueError):
+        sampler.rates("client", wireless["mac"], "activity")
+
+
+def test_sampler_expires_entities(clients, devices, clock):
+    sampler = timeseries.Sampler(None, expire_after=100, clock=clock)
+    sampler.record(clients, devices)
+    clock.now += 200
+    sampler.record(clients[:1], [])
+    alive = {("client", clients[0]["mac"])}
+    if clients[0].get("apMac"):
+        alive.add(("ap", clients[0]["apMac"]))
+    assert set(sampler.last_seen) == alive
+    assert {key[:2] for key in sampler.buffers} == alive
+    # Default (week long) capacity, storage only for the samples taken
+    assert all(len(buffer.values) <= 2 for buffer in sampler.buffers.values())
+
+
+def test_sampler_polls(
+    active_omada, configure_paginated_get, requests_mock, default_api_v2, resources_dir
+):
+    site_url = default_api_v2 / "sites" / "0bf476c155ea24942722c5a8b516adfe"
+    configure_paginated_get(
+        site_url / "clients", resources_dir / "get_site_clients.json"
+    )
+    requests_mock.get(
+        str(site_url / "devices"),
+        text=(resources_dir / "get_site_devices.json").read_text(),
+    )
+    sampler = timeseries.Sampler(active_omada)
+    sampler.sample()
+    assert len({key[:2] for key in sampler.buffers if key[0] == "client"}) == 32
+
+
+def test_sampler_downsampled_series(clients, devices, clock):
+    sampler = timeseries.Sampler(None, clock=clock)
+    wireless = next(row for row in clients if row.get("apMac"))
+    for step in range(3):
+        clock.now += 60
+        sampler.record(
+            [dict(wireless, trafficDown=wireless["trafficDown"] + 6000 * step)],
+            [dict(devices[0], uptimeLong=devices[0]["uptimeLong"] + 60 * step)],
+        )
+    # Samples at 1060, 1120 and 1180
+    assert len(sampler.series("client", wireless["mac"], "trafficDown")) == 3
+    assert sampler.series("client", wireless["mac"], "trafficDown", bucket=120) == [
+        (960, wireless["trafficDown"]),
+        (1080, wireless["trafficDown"] + 9000),
+    ]
+    assert sampler.rates("client", wireless["mac"], "trafficDown", bucket=120) == [
+        (1080, 100)
+    ]
+    assert sampler.series("client", wireless["mac"], "trafficDown", since=1100) == [
+        (1120, wireless["trafficDown"] + 6000),
+        (1180, wireless["trafficDown"] + 12000),
+    ]
+    # Device uptime is sampled from the numeric `uptimeLong`
+    assert sampler.rates("device", devices[0]["mac"], "uptimeLong") == [
+        (1120, 1),
+        (1180, 1),
+    ]
@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+from omada import topology
+
+GATEWAY_MAC = "0B-F4-A0-6A-64-FC"
+AP_MAC = "0B-F4-A7-A0-DE-3C"
+AP_NAME = "obf-word greek extinction"
+
+
+@pytest.fixture
+def clients(resources_dir):
+    with (resources_dir / "get_site_clients.json").open() as fin:
+        return [row for page in json.load(fin) for row in page["result"]["data"]]
+
+
+@pytest.fixture
+def devices(resources_dir):
+    with (resources_dir / "get_site_devices.json").open() as fin:
+        return json.load(fin)["result"]
+
+
+@pytest.fixture
+def switched(devices, clients):
+    # Put a switch between the gateway and the first AP, with two wired clients
+    switch = {"type": "switch", "mac": "0B-F4-00-00-00-01", "name": "core"}
+    devices = [
+        switch,
+        *(
+            dict(dev, uplinkDeviceMac=switch["mac"]) if dev["mac"] == AP_MAC else dev
+            for dev in devices
+        ),
+    ]
+    wired = [
+        {
+            "mac": f"AA-00-00-00-00-0{idx}",
+            "connectDevType": "switch",
+            "switchMac": switch["mac"],
+            "port": 3,
+        }
+        for idx in range(2)
+    ]
+    return topology.Topology.build(devices, [*clients, *wired])
+
+
+def test_build(devices, clients):
+    topo = topology.Topology.build(devices, clients)
+    assert topo.gateway == GATEWAY_MAC
+    assert len(topo.clients_behind(GATEWAY_MAC)) == len(clients)
+    assert len(topo.clients_behind(AP_NAME)) == 15
+    assert sum(load.clients for load in topo.ap_load.values()) == 26
+    assert topo.ap_load[AP_MAC].traffic_down == sum(
+        row["trafficDown"] for row in clients if row.get("apName") == AP_NAME
+    )
+
+
+def test_uplink_path(switched, clients):
+    # Obfuscated `apMac` does not match the device: joined by `apName` instead
+    wireless = next(row for row in clients if row.get("apName") == AP_NAME)
+    assert [row["mac"] for row in switched.uplink_path(wireless["mac"])] == [
+        AP_MAC,
+        "0B-F4-00-00-00-01",
+        GATEWAY_MAC,
+    ]
+    assert switched.uplink_path(GATEWAY_MAC) == []
+
+
+def test_switch_queries(switched):
+    assert len(switched.clients_on_port("core", 3)) == 2
+    assert switched.clients_on_port("core", 4) == []
+    # Wired clients plus the clients of the AP behind the switch
+    assert len(switched.clients_behind("core")) == 2 + 15
+    with pytest.raises(KeyError):
+        switched.clients_behind("no such switch")
+
+
+def test_from_omada(
+    active_omada, configure_paginated_get, requests_mock, default_api_v2, resources_dir
+):
+    site_url = default_api_v2 / "sites" / "0bf476c155ea24942722c5a8b516adfe"
+    configure_paginated_get(
+        site_url / "clients", resources_dir / "get_site_clients.json"
+    )
+    requests_mock.get(
+        str(site_url / "devices"),
+        text=(resources_dir / "get_site_devices.json").read_text(),
+    )
+    topo = topology.Topology.from_omada(active_omada)
+    assert len(topo.clients_behind(GATEWAY_MAC)) == 32
@@ -0,0 +1,105 @@
+import json
+
+import pytest
+
+import omada
+from omada import transport
+
+SITE_ID = "0bf476c155ea24942722c5a8b516adfe"
+
+
+@pytest.fixture
+def memory_transport(resources_dir, default_api_v2, login_result_dict):
+    out = transport.MemoryTransport()
+    out.add("POST", default_api_v2 / "login", login_result_dict)
+    out.add(
+        "GET",
+        default_api_v2 / "users" / "current",
+        json.loads((resources_dir / "current_user.json").read_text()),
+    )
+    return out
+
+
+@pytest.fixture
+def memory_omada(test_config, memory_transport):
+    out = omada.Omada(test_config, transport=memory_transport)
+    out.login("testuser", "testpass")
+    return out
+
+
+def test_default_transport(inactive_omada):
+    assert isinstance(inactive_omada.transport, transport.RequestsTransport)
+    assert inactive_omada.session is inactive_omada.transport.session
+
+
+def test_incomplete_transport():
+    class _NoHeaders(transport.Transport):
+        def request(self, method, url, **kwargs):
+            pass
+
+    with pytest.raises(TypeError):
+        _NoHeaders()
+
+
+def test_memory_transport_login(memory_omada, memory_transport):
+    assert memory_omada.login_result.token == "0bf44cdfeb4609a7f0556872775c0e02"
+    assert memory_transport.headers == {
+        "Csrf-Token": "0bf44cdfeb4609a7f0556872775c0e02"
+    }
+    assert memory_transport.requests[0].json == {
+        "username": "testuser",
+        "password": "testpass",
+    }
+
+
+def test_memory_transport_pagination(
+    memory_omada, memory_transport, default_api_v2, resources_dir
+):
+    pages = json.loads((resources_dir / "get_site_clients.json").read_text())
+    memory_transport.add(
+        "GET",
+        default_api_v2 / "sites" / SITE_ID / "clients",
+        lambda request: pages[request.params["currentPage"] - 1],
+    )
+    assert len(list(memory_omada.get_site_clients())) == 32
+    last_request = memory_transport.requests[-1]
+    assert last_request.params["currentPage"] == 4
+    assert last_request.headers["Csrf-Token"] == "0bf44cdfeb4609a7f0556872775c0e02"
+    assert last_request.timeout == (10.0, 60.0)
+
+
+def test_memory_transport_errors(memory_omada, memory_transport, default_api_v2):
+    memory_transport.add(
+        "GET", default_api_v2 / "broken", transport.MemoryResponse(status_code=503)
+    )
+    with pytest.raises(transport.HTTPStatusError) as err:
+        memory_omada._get("broken")
+    assert err.value.response.status_code == 503
+
+    with pytest.raises(transport.ConnectError):
+        memory_omada._get("not-routed")
+
+
+def test_http2_transport(default_api_v2):
+    httpx = pytest.importorskip("httpx")
+    pytest.importorskip("h2")
+
+    seen_requests = []
+
+    def _handler(request):
+        seen_requests.append(request)
+        return httpx.Response(200, json={"errorCode": 0, "result": {"ok": True}})
+
+    http2 = transport.Http2Transport()
+    http2.client = httpx.Client(transport=httpx.MockTransport(_handler))
+    http2.set_header("Csrf-Token", "abc")
+
+    response = http2.request(
+        "GET", default_api_v2 / "hello", params={"a": 1}, timeout=(1, 2)
+    )
+    response.raise_for_status()
+    assert response.json() == {"errorCode": 0, "result": {"ok": True}}
+    assert seen_requests[0].headers["Csrf-Token"] == "abc"
+    assert seen_requests[0].url.params["a"] == "1"
+    assert seen_requests[0].extensions["timeout"]["connect"] == 1
+    assert seen_requests[0].extensions["timeout"]["read"] == 2
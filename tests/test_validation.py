@@ -0,0 +1,81 @@
+import dataclasses
+
+import pydantic
+import pytest
+
+import omada
+from omada import api_bindings, validation
+
+CURRENT_USER = {
+    "name": "user",
+    "email": "user@example.com",
+    "privilege": {"all": False, "sites": [{"name": "a", "category": "c", "key": "k"}]},
+    "extraField": 42,
+}
+
+
+@pytest.mark.parametrize(
+    "mode", [validation.ValidationMode.Full, validation.ValidationMode.Off]
+)
+def test_nested_models(mode):
+    user = validation.ModelValidator(mode)(api_bindings.CurrentUser, CURRENT_USER)
+    assert isinstance(user.privilege, api_bindings.UserPrivilege)
+    assert isinstance(user.privilege.sites[0], api_bindings.Site)
+    assert user.privilege.sites[0].key == "k"
+    assert user.extraField == 42
+
+
+def test_off_skips_validation():
+    validator = validation.ModelValidator(validation.ValidationMode.Off)
+    site = validator(api_bindings.Site, {"name": 42})
+    assert site.name == 42
+
+
+def test_full_validates():
+    validator = validation.ModelValidator(validation.ValidationMode.Full)
+    with pytest.raises(pydantic.ValidationError):
+        validator(api_bindings.Site, {"name": "a"})
+
+
+def test_sampled():
+    validator = validation.ModelValidator(
+        validation.ValidationMode.Sampled, sample_every=3
+    )
+    bad_row = {"name": "a"}
+    outcomes = []
+    for _ in range(7):
+        try:
+            validator(api_bindings.Site, bad_row)
+        except pydantic.ValidationError:
+            outcomes.append("validated")
+        else:
+            outcomes.append("constructed")
+    assert outcomes == [
+        "validated",
+        "constructed",
+        "constructed",
+        "validated",
+        "constructed",
+        "constructed",
+        "validated",
+    ]
+
+
+def test_parse_rows():
+    validator = validation.ModelValidator("off")
+    rows = list(validator.parse_rows(api_bindings.Site, [{"name": "a"}] * 3))
+    assert [row.name for row in rows] == ["a", "a", "a"]
+
+
+def test_bad_sample_rate():
+    with pytest.raises(ValueError):
+        validation.ModelValidator(validation.ValidationMode.Sampled, sample_every=0)
+
+
+def test_omada_uses_config(test_config, active_omada):
+    assert active_omada.validator.mode is validation.ValidationMode.Full
+    config = dataclasses.replace(
+        test_config, validation_mode=validation.ValidationMode.Off
+    )
+    assert omada.Omada(config).validator.mode is validation.ValidationMode.Off
+    assert active_omada.current_user.privilege.sites[0].name == "obf-word misty tyrant"
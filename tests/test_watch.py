@@ -0,0 +1,166 @@
+import json
+import threading
+
+import pytest
+
+from omada import watch
+
+SITE = "obf-word misty tyrant"
+
+
+@pytest.fixture
+def scheduler(active_omada, clock):
+    return watch.WatchScheduler(
+        active_omada, initial_interval=10, min_interval=5, max_interval=40, clock=clock
+    )
+
+
+@pytest.fixture
+def settings_url(default_api_v2):
+    return str(
+        default_api_v2 / "sites" / "0bf476c155ea24942722c5a8b516adfe" / "setting"
+    )
+
+
+def _settings(value):
+    return {"text": json.dumps({"errorCode": 0, "result": {"value": value}})}
+
+
+def test_shared_poll(scheduler, requests_mock, settings_url):
+    matcher = requests_mock.get(settings_url, **_settings(1))
+    first, second = [], []
+    scheduler.subscribe("settings", lambda *args: first.append(args))
+    scheduler.subscribe("settings", lambda *args: second.append(args), site=SITE)
+    assert len(scheduler.polls) == 1
+
+    assert scheduler.run_pending() == 1
+    assert matcher.call_count == 1
+    assert first == second == [("settings", SITE, {"value": 1})]
+
+    # A late subscriber gets the last data immediately
+    late = []
+    scheduler.subscribe("settings", lambda *args: late.append(args))
+    assert late == first
+    assert scheduler.run_pending() == 0
+
+
+def test_adaptive_interval(scheduler, requests_mock, settings_url, clock):
+    requests_mock.get(
+        settings_url, [_settings(1), _settings(1), _settings(1), _settings(2)]
+    )
+    calls = []
+    scheduler.subscribe("settings", lambda *args: calls.append(args[2]))
+    poll = scheduler.polls[("settings", SITE)]
+
+    intervals = []
+    for _ in range(4):
+        clock.now = scheduler.next_due()
+        scheduler.run_pending()
+        intervals.append(poll.interval)
+    # Changed, same, same (slows down), changed (speeds up)
+    assert intervals == [5, 7.5, 11.25, 5.625]
+    assert calls == [{"value": 1}, {"value": 2}]
+
+
+def test_unsubscribe_stops_poll(scheduler, requests_mock, settings_url, clock):
+    matcher = requests_mock.get(settings_url, **_settings(1))
+    sub = scheduler.subscribe("settings", lambda *args: None)
+    scheduler.run_pending()
+    sub.cancel()
+    assert scheduler.polls == {}
+    assert scheduler.next_due() is None
+    clock.now += 1000
+    assert scheduler.run_pending() == 0
+    assert matcher.call_count == 1
+
+
+def test_failed_poll_backs_off(scheduler, requests_mock, settings_url):
+    requests_mock.get(settings_url, status_code=503)
+    scheduler.subscribe("settings", lambda *args: pytest.fail("Called back"))
+    scheduler.run_pending()
+    assert scheduler.polls[("settings", SITE)].interval == 15
+
+
+def test_run_until_stopped(active_omada, requests_mock, settings_url):
+    requests_mock.get(settings_url, **_settings(1))
+    scheduler = watch.WatchScheduler(active_omada)
+    stop = threading.Event()
+    scheduler.subscribe("settings", lambda *args: stop.set())
+    scheduler.run(stop)
+    assert stop.is_set()
+
+
+def test_unknown_resource(scheduler):
+    with pytest.raises(ValueError):
+        scheduler.subscribe("printers", print)
+
+
+@pytest.fixture
+def clients_url(default_api_v2):
+    return str(
+        default_api_v2 / "sites" / "0bf476c155ea24942722c5a8b516adfe" / "clients"
+    )
+
+
+def _clients(rows):
+    return {
+        "text": json.dumps(
+            {"errorCode": 0, "result": {"totalRows": len(rows), "data": rows}}
+        )
+    }
+
+
+def test_volatile_fields_ignored(scheduler, requests_mock, clients_url, clock):
+    client = {"mac": "AA", "apName": "Lobby", "trafficDown": 1, "uptime": 10}
+    requests_mock.get(
+        clients_url,
+        [
+            _clients([client]),
+            _clients([dict(client, trafficDown=500, uptime=70)]),
+            _clients([dict(client, apName="Office", uptime=130)]),
+        ],
+    )
+    calls = []
+    scheduler.subscribe("clients", lambda *args: calls.append(args[2]))
+    for _ in range(3):
+        clock.now = scheduler.next_due()
+        scheduler.run_pending()
+    # Traffic and uptime counters alone are no change, roaming is
+    assert [rows[0]["apName"] for rows in calls] == ["Lobby", "Office"]
+
+
+def test_events_polled_incrementally(scheduler, requests_mock, default_api_v2, clock):
+    events = [
+        {"id": "e3", "time": 300},
+        {"id": "e2", "time": 200},
+        {"id": "e1", "time": 200},
+    ]
+
+    def _events(request, context):
+        time_start = int(request.qs.get("filters.timestart", [0])[0])
+        rows = [row for row in events if row["time"] >= time_start]
+        return json.dumps(
+            {"errorCode": 0, "result": {"totalRows": len(rows), "data": rows}}
+        )
+
+    matcher = requests_mock.get(
+        str(default_api_v2 / "sites" / "0bf476c155ea24942722c5a8b516adfe" / "events"),
+        text=_events,
+    )
+    calls = []
+    scheduler.subscribe("events", lambda *args: calls.append(args[2]))
+    scheduler.run_pending()
+    assert matcher.last_request.qs["sorts.time"] == ["desc"]
+    assert "filters.timestart" not in matcher.last_request.qs
+
+    # Nothing new: no call back, the interval grows
+    clock.now = scheduler.next_due()
+    scheduler.run_pending()
+    assert matcher.last_request.qs["filters.timestart"] == ["300"]
+    assert scheduler.polls[("events", SITE)].interval == 7.5
+
+    events.insert(0, {"id": "e4", "time": 300})
+    events.insert(0, {"id": "e5", "time": 400})
+    clock.now = scheduler.next_due()
+    scheduler.run_pending()
+    assert calls == [events[2:], [{"id": "e5", "time": 400}, {"id": "e4", "time": 300}]]
@@ -0,0 +1,85 @@
+import dataclasses
+import logging
+
+import pytest
+
+import omada
+from omada import wire_log
+
+LONG_BODY = '{"errorCode":0,"result":{"token":"secret-token","data":"%s"}}' % (
+    "x" * 5000
+)
+
+
+@pytest.fixture
+def wire_debug(caplog):
+    caplog.set_level(logging.DEBUG, logger="omada.wire")
+    return caplog
+
+
+def _wire_records(caplog):
+    return [rec for rec in caplog.records if rec.name == "omada.wire"]
+
+
+def test_redact():
+    logger = wire_log.WireLogger()
+    assert (
+        logger.redact('https://ctrl/api?_=1&token=abc123&x=1 {"password": "hunter2"}')
+        == 'https://ctrl/api?_=1&token=***&x=1 {"password": "***"}'
+    )
+
+
+@pytest.mark.parametrize("sample_every", [0, -1])
+def test_invalid_sampling(sample_every):
+    with pytest.raises(ValueError):
+        wire_log.WireLogConfig(sample_every=sample_every)
+
+
+def test_truncated_and_redacted(
+    active_omada, requests_mock, default_api_v2, wire_debug
+):
+    requests_mock.get(str(default_api_v2 / "hello"), text=LONG_BODY)
+    active_omada._get("hello")
+    (record,) = _wire_records(wire_debug)
+    message = record.getMessage()
+    assert message.startswith("GET https://")
+    assert "secret-token" not in message
+    assert '"token":"***"' in message
+    assert message.endswith(f"... [{len(LONG_BODY)} bytes]")
+    assert len(message) < 2048 + 500
+
+
+def test_sampling(inactive_omada, requests_mock, default_api_v2, wire_debug):
+    api = omada.Omada(
+        dataclasses.replace(
+            inactive_omada.config,
+            wire_logging=wire_log.WireLogConfig(sample_every=3),
+        )
+    )
+    api.login("testuser", "testpass")
+    requests_mock.get(
+        str(default_api_v2 / "hello"), text='{"errorCode":0,"result":"TEST PASSED."}'
+    )
+    wire_debug.clear()
+    for _ in range(9):
+        api._get("hello")
+    assert len(_wire_records(wire_debug)) == 3
+
+
+def test_disabled_is_lazy(active_omada, caplog):
+    caplog.set_level(logging.INFO, logger="omada.wire")
+
+    class _Response:
+        status_code = 200
+
+        @property
+        def text(self):
+            raise AssertionError("Body evaluated")
+
+        def json(self):
+            return {"errorCode": 0, "result": "ok"}
+
+        def raise_for_status(self):
+            pass
+
+    assert active_omada.get_json_response(_Response()) == "ok"